@@ -1,50 +1,15 @@
 import os
+import sys
 import argparse
 from pathlib import Path
-import pandas as pd
 
-
-REQUIRED_COLS = ['channelID', 'Views', 'Published', 'likes', 'comments']
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from multi_report import run_reports  # noqa: E402
 
 
 def summarize_csv(csv_path: Path):
-    df = pd.read_csv(csv_path, low_memory=False)
-
-    present = [c for c in REQUIRED_COLS if c in df.columns]
-    if not present:
-        return {
-            'file': csv_path.name,
-            'total': 0,
-            'complete': 0,
-            'missing': 0,
-            'pct': 0.0,
-        }
-
-    if 'videoID' not in df.columns:
-        return {
-            'file': csv_path.name,
-            'total': 0,
-            'complete': 0,
-            'missing': 0,
-            'pct': 0.0,
-        }
-
-    def is_complete(group):
-        return all(group[c].notna().any() for c in present)
-
-    complete_series = df.groupby('videoID', dropna=False).apply(is_complete)
-    total_ids = int(complete_series.shape[0])
-    complete_ids = int(complete_series.sum())
-    missing_ids = total_ids - complete_ids
-    pct_complete = (complete_ids / total_ids * 100.0) if total_ids else 0.0
-
-    return {
-        'file': csv_path.name,
-        'total': total_ids,
-        'complete': complete_ids,
-        'missing': missing_ids,
-        'pct': pct_complete,
-    }
+    """Progress of one CSV (see multi_report.ProgressReport)."""
+    return run_reports(['progress'], [csv_path])['progress'].results[0]
 
 
 def main():
@@ -76,22 +41,9 @@ def main():
             return
         targets = [csv_path]
 
-    total_sum = {'total': 0, 'complete': 0, 'missing': 0}
-    results = []
-    for csv_path in targets:
-        res = summarize_csv(csv_path)
-        results.append(res)
-        total_sum['total'] += res['total']
-        total_sum['complete'] += res['complete']
-        total_sum['missing'] += res['missing']
-
-    for r in results:
-        print(f"{r['file']}: total_unique={r['total']}, complete={r['complete']}, missing={r['missing']} ({r['pct']:.2f}%)")
-
-    eta_hours = (total_sum['missing'] * sleep_s) / 3600.0
-    print(f"\nTOTAL: total_unique={total_sum['total']}, complete={total_sum['complete']}, missing={total_sum['missing']}")
-    print(f"Approx. remaining time (@{sleep_s:.2f}s/ID): {eta_hours:.2f} hours")
-
+    # One pass per file; the report prints per-file lines, the total and the ETA
+    report = run_reports(['progress'], targets, progress={'sleep_s': sleep_s})['progress']
+    print(report.render())
 
 if __name__ == '__main__':
     main()
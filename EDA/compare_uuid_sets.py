@@ -1,6 +1,8 @@
 import sys
 from pathlib import Path
-import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import table_schema  # noqa: E402
 
 
 def find_uuid_col(df):
@@ -29,9 +31,9 @@ def main():
         sys.exit(1)
 
     print(f"Reading: {titles_csv}")
-    titles_df = pd.read_csv(titles_csv, low_memory=False)
+    titles_df = table_schema.read_csv(titles_csv)
     print(f"Reading: {votes_csv}")
-    votes_df = pd.read_csv(votes_csv, low_memory=False)
+    votes_df = table_schema.read_csv(votes_csv)
 
     titles_col = find_uuid_col(titles_df)
     votes_col = find_uuid_col(votes_df)
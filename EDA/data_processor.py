@@ -2,38 +2,293 @@
 Data Processing and Feature Engineering for Clickbait Detection/Neutralization
 """
 
+import os
+import sys
+import multiprocessing
+import tempfile
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from collections import Counter
+from functools import lru_cache
 import re
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import arrow_cache  # noqa: E402
+import parquet_store  # noqa: E402
+import table_schema  # noqa: E402
+from feature_cache import FeatureCache, definition_version  # noqa: E402
+
+FEATURE_BLOCK = 1 << 16  # titles per block in extract_text_features_batch
+FEATURE_BLOCK_CELLS = 1 << 22  # titles x padded length per block: bounds the int64 temporaries (~32 MB each)
+FEATURE_WORKERS = int(os.getenv("CLICKBAIT_FEATURE_WORKERS", "1"))  # >1 extracts in a process pool
+PARALLEL_CHUNK = 1 << 17  # titles per pool task
+PARALLEL_MIN_TITLES = 2 * PARALLEL_CHUNK  # smaller columns are not worth starting a pool
+TABLE_FILES = {
+    'titles': 'titles.csv',
+    'casual_titles': 'casualVoteTitles.csv',
+    'title_votes': 'titleVotes.csv',
+    'video_info': 'videoInfo.csv',
+}
+LANGUAGES = ('en', 'ru', 'es', 'it', 'other_romance', 'unknown')  # detect_language labels, passed as codes
+EMOJI_FIRST, EMOJI_LAST = 0x1F300, 0x1F9FF  # the has_emoji character range
+
+# Character classes, one bit each, as the str methods used per title define them
+SPACE, UPPER, LOWER_OR_TITLE, DIGIT, DECIMAL = 1, 2, 4, 8, 16
+
+
+@lru_cache(maxsize=1)
+def _char_classes() -> np.ndarray:
+    """Class bits of every code point: isspace, isupper, islower/titlecase, isdigit, \\d (isdecimal)."""
+    chars = np.arange(sys.maxunicode + 1, dtype=np.uint32).view('U1')
+    upper = np.char.isupper(chars)
+    classes = (np.char.isspace(chars) * SPACE
+               | upper * UPPER
+               | (np.char.islower(chars) | (np.char.istitle(chars) & ~upper)) * LOWER_OR_TITLE
+               | np.char.isdigit(chars) * DIGIT
+               | np.char.isdecimal(chars) * DECIMAL)
+    return classes.astype(np.uint8)
+
+
+def _block_features(titles: list, lengths: np.ndarray) -> dict:
+    """Features of stripped titles, computed over their (titles x chars) code point matrix."""
+    text = np.array(titles, dtype=f'U{max(1, int(lengths.max(initial=0)))}')
+    points = text.view(np.uint32).reshape(len(titles), text.dtype.itemsize // 4)
+    in_text = np.arange(points.shape[1]) < lengths[:, None]
+    classes = _char_classes()[points]
+
+    # Words as str.split() sees them: runs of non-space characters
+    word_char = in_text & ((classes & SPACE) == 0)
+    starts = word_char.copy()
+    starts[:, 1:] &= ~word_char[:, :-1]
+    word_count = starts.sum(axis=1)
+
+    # caps_words: words longer than one character that are str.isupper()
+    word_ids = (np.cumsum(starts, axis=1) - 1 + (np.cumsum(word_count) - word_count)[:, None])[word_char]
+    chars = classes[word_char]
+    total_words = int(word_count.sum())
+    word_len = np.bincount(word_ids, minlength=total_words)
+    word_upper = np.bincount(word_ids[(chars & UPPER) != 0], minlength=total_words)
+    word_lower = np.bincount(word_ids[(chars & LOWER_OR_TITLE) != 0], minlength=total_words)
+    caps = (word_len > 1) & (word_upper > 0) & (word_lower == 0)
+    caps_words = np.bincount(np.repeat(np.arange(len(titles)), word_count)[caps], minlength=len(titles))
+
+    capital = (points >= ord('A')) & (points <= ord('Z'))
+    return {
+        'length': lengths,
+        'word_count': word_count,
+        'char_per_word': lengths / np.maximum(1, word_count),
+        'uppercase_ratio': ((classes & UPPER) != 0).sum(axis=1) / np.maximum(1, lengths),
+        'digit_count': ((classes & DIGIT) != 0).sum(axis=1),
+        'exclamation_count': (points == ord('!')).sum(axis=1),
+        'question_count': (points == ord('?')).sum(axis=1),
+        'ellipsis_count': np.char.count(text, '...'),
+        'caps_words': caps_words,
+        'has_emoji': ((points >= EMOJI_FIRST) & (points <= EMOJI_LAST)).any(axis=1),
+        'has_number': ((classes & DECIMAL) != 0).any(axis=1),
+        'has_caps_sequence': (capital[:, :-2] & capital[:, 1:-1] & capital[:, 2:]).any(axis=1),
+    }
+
+
+def _title_features(titles: list) -> dict:
+    """Feature arrays of stripped titles, in their order (computed in blocks of similar length)."""
+    lengths = np.fromiter(map(len, titles), dtype=np.int64, count=len(titles))
+    order = np.argsort(lengths, kind='stable')  # similar lengths per block: little padding
+    sorted_lengths = lengths[order]
+    blocks = []
+    start = 0
+    while start < len(titles):
+        # Up to FEATURE_BLOCK titles, fewer once titles x longest length passes
+        # FEATURE_BLOCK_CELLS, so one huge title cannot blow up a whole block
+        window = sorted_lengths[start:start + FEATURE_BLOCK]
+        fits = np.arange(1, len(window) + 1) * np.maximum(window, 1) <= FEATURE_BLOCK_CELLS
+        end = start + max(1, int(fits.argmin()) if not fits.all() else len(window))
+        rows = order[start:end]
+        blocks.append(_block_features([titles[i] for i in rows], lengths[rows]))
+        start = end
+    if not blocks:
+        return _block_features([], lengths)
+    columns = {}
+    for name in blocks[0]:
+        values = np.concatenate([b[name] for b in blocks])
+        columns[name] = np.empty_like(values)
+        columns[name][order] = values
+    return columns
+
+
+# Process pool mode. Titles reach the workers and results come back through
+# memory-mapped .npy files in a temporary directory, so a task pickles only
+# the directory and its row range (works with fork and spawn alike).
+
+_worker_processor = None
+
+
+def _share_titles(workdir: Path, values: np.ndarray, present: np.ndarray):
+    """Write titles as one UTF-8 buffer plus row offsets for the workers to memory-map."""
+    encoded = [str(t).encode('utf-8', 'surrogatepass') if p else b'' for t, p in zip(values, present)]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+    np.save(workdir / 'offsets.npy', offsets)
+    np.save(workdir / 'present.npy', present)
+    # one spare byte: an empty array cannot be memory-mapped
+    np.save(workdir / 'utf8.npy', np.frombuffer(b''.join(encoded) + b'\0', dtype=np.uint8))
+
+
+def _shared_titles(workdir: Path, start: int, end: int) -> list:
+    """Titles start:end written by _share_titles, None where missing."""
+    offsets = np.load(workdir / 'offsets.npy', mmap_mode='r')[start:end + 1]
+    present = np.load(workdir / 'present.npy', mmap_mode='r')[start:end]
+    blob = np.load(workdir / 'utf8.npy', mmap_mode='r')[offsets[0]:offsets[-1]].tobytes()
+    bounds = (offsets - offsets[0]).tolist()
+    return [blob[a:b].decode('utf-8', 'surrogatepass') if p else None
+            for a, b, p in zip(bounds[:-1], bounds[1:], present.tolist())]
+
+
+def _init_feature_worker():
+    global _worker_processor
+    _worker_processor = ClickbaitDataProcessor(workers=1, feature_cache=None)
+
+
+def _feature_task(task) -> int:
+    """Compute one chunk of titles and write it into the shared result arrays."""
+    kind, workdir, start, end = task
+    workdir = Path(workdir)
+    titles = _shared_titles(workdir, start, end)
+    if kind == 'language':
+        out = np.load(workdir / 'language.npy', mmap_mode='r+')
+        out[start:end] = [LANGUAGES.index(_worker_processor.detect_language(t)) for t in titles]
+        out.flush()
+    else:
+        rows = np.array([i for i, t in enumerate(titles) if t is not None], dtype=np.int64)
+        features = _title_features([titles[i].strip() for i in rows])
+        for name, values in features.items():
+            out = np.load(workdir / f'{name}.npy', mmap_mode='r+')
+            out[start + rows] = values
+            out.flush()
+    return end - start
+
+
+def _run_pool(kind: str, values: np.ndarray, present: np.ndarray, workers: int, outputs: dict) -> dict:
+    """
+    Run 'features' or 'language' over a column of titles in a process pool.
+
+    Args:
+        kind: 'features' (_title_features) or 'language' (detect_language)
+        values: Titles (object array)
+        present: Non-missing mask of `values`
+        workers: Pool size
+        outputs: Result name -> dtype; one array of len(values) each
+
+    Returns:
+        Result name -> array, in row order
+    """
+    with tempfile.TemporaryDirectory(prefix='clickbait-features-') as workdir:
+        workdir = Path(workdir)
+        _share_titles(workdir, values, present)
+        for name, dtype in outputs.items():
+            np.lib.format.open_memmap(workdir / f'{name}.npy', mode='w+', dtype=dtype,
+                                      shape=(len(values),)).flush()
+        tasks = [(kind, str(workdir), start, min(start + PARALLEL_CHUNK, len(values)))
+                 for start in range(0, len(values), PARALLEL_CHUNK)]
+        with multiprocessing.Pool(workers, initializer=_init_feature_worker) as pool:
+            for _ in pool.imap_unordered(_feature_task, tasks):
+                pass
+        return {name: np.load(workdir / f'{name}.npy') for name in outputs}
+
+
+@lru_cache(maxsize=1)
+def _feature_dtypes() -> dict:
+    return {name: column.dtype for name, column in _title_features([]).items()}
+
+
+def _table_property(name):
+    """`<name>_df` attribute: the whole table, read on first access; assignable."""
+    def get(self):
+        return self.table(name)
+
+    def set(self, df):
+        self._frames[name] = df
+        self._complete.add(name)
+
+    return property(get, set, doc=f"{TABLE_FILES[name]} (all columns), read on first access")
+
+
 class ClickbaitDataProcessor:
     """Process deArrow data for clickbait detection/neutralization"""
     
-    def __init__(self, data_dir='deArrow_data'):
+    titles_df = _table_property('titles')
+    casual_titles_df = _table_property('casual_titles')
+    title_votes_df = _table_property('title_votes')
+    video_info_df = _table_property('video_info')
+    
+    def __init__(self, data_dir='deArrow_data', workers=FEATURE_WORKERS, feature_cache=True, source='auto'):
+        """
+        Args:
+            data_dir: Directory of the deArrow CSVs; nothing is read until a table is used
+            workers: >1 extracts features/languages of large columns in a process pool
+            feature_cache: FeatureCache for per-title features and languages; True opens
+                           the default one on first use, None computes everything every time
+            source: Where tables are read from: 'auto' (the fresh Parquet copy from
+                    parquet_store.py if there is one, else the CSV), 'arrow' (arrow_cache's
+                    memory-mapped copy, built on first use) or 'csv'
+        """
         self.data_dir = Path(data_dir)
-        self.titles_df = None
-        self.casual_titles_df = None
-        self.title_votes_df = None
-        self.video_info_df = None
+        self.workers = workers
+        self.feature_cache = feature_cache
+        self.source = source
+        self._frames = {}  # table name -> columns read so far (None: file missing)
+        self._complete = set()  # tables holding all their columns
+    
+    def table(self, name, columns=None, dtype=None):
+        """
+        A deArrow table, read lazily and column by column: only columns not
+        read by an earlier call are read, and they are kept for later ones.
         
-    def load_data(self, verbose=True):
-        """Load all relevant CSV files"""
-        files_to_load = {
-            'titles': 'titles.csv',
-            'casual_titles': 'casualVoteTitles.csv',
-            'title_votes': 'titleVotes.csv',
-            'video_info': 'videoInfo.csv'
-        }
+        Args:
+            name: 'titles', 'casual_titles', 'title_votes' or 'video_info'
+            columns: Only these columns (None = all)
+            dtype: {column: dtype} conversions of loaded columns (kept for later calls)
         
-        for key, filename in files_to_load.items():
-            filepath = self.data_dir / filename
-            if filepath.exists():
-                setattr(self, f'{key}_df', pd.read_csv(filepath))
+        Returns:
+            DataFrame with the columns asked for, or None when the file does not exist
+        """
+        if name in self._frames and self._frames[name] is None:
+            return None
+        path = self.data_dir / TABLE_FILES[name]
+        if name not in self._frames and not path.exists():
+            self._frames[name] = None
+            return None
+        frame = self._frames.get(name)
+        
+        if name not in self._complete:
+            wanted = list(columns) if columns is not None else parquet_store.table_columns(path)
+            missing = [c for c in wanted if frame is None or c not in frame.columns]
+            if missing:
+                loaded = self._read(path, missing)
+                frame = loaded if frame is None else pd.concat([frame, loaded], axis=1)
+            if columns is None:
+                frame = frame[wanted]
+                self._complete.add(name)
+        if dtype:
+            frame = frame.astype({c: t for c, t in dtype.items() if c in frame.columns})
+        self._frames[name] = frame
+        return frame if columns is None else frame[list(columns)]
+    
+    def _read(self, path, columns):
+        if self.source == 'arrow':
+            return arrow_cache.load_cached(path, columns=columns)
+        if self.source == 'csv':
+            return table_schema.read_csv(path, usecols=columns)
+        return parquet_store.load_table(path, columns=columns)
+    
+    def load_data(self, verbose=True):
+        """Load all relevant CSV files now (tables are otherwise read on first use)"""
+        for key, filename in TABLE_FILES.items():
+            df = self.table(key)
+            if df is not None:
                 if verbose:
-                    print(f"✓ Loaded {filename}: {len(getattr(self, f'{key}_df'))} rows")
+                    print(f"✓ Loaded {filename}: {len(df)} rows")
             else:
                 print(f"✗ File not found: {filename}")
     
@@ -61,72 +316,122 @@ class ClickbaitDataProcessor:
         
         return features
     
-    def add_text_features(self, df, text_col='title', prefix=''):
-        """Add text feature columns to dataframe"""
-        feature_cols = {}
+    def _cache(self):
+        if self.feature_cache is True:
+            self.feature_cache = FeatureCache()
+        return self.feature_cache or None
+    
+    def extract_text_features_batch(self, texts, workers=None):
+        """
+        extract_text_features for a whole column of titles at once.
+        Titles are grouped into blocks of similar length and each block is
+        turned into one (titles x characters) code point array; every feature
+        is then a NumPy reduction over it, with character classes looked up
+        from the same str methods (isupper, isspace, ...) the per-title
+        version calls. Values and dtypes are identical to it.
+        
+        With workers > 1 (default: self.workers), columns of at least
+        PARALLEL_MIN_TITLES titles are split into chunks computed by a
+        process pool and reassembled in order; the result is the same.
+        
+        Each distinct title is computed once; with a feature_cache, titles
+        seen before (this run or, from its file, an earlier one) are not
+        computed again.
+        
+        Args:
+            texts: Series, array or list of titles
+            workers: Pool size (None = self.workers, 1 = this process)
         
-        for idx, text in enumerate(df[text_col]):
-            features = self.extract_text_features(text)
-            for feat_name, feat_val in features.items():
-                col_name = f'{prefix}{feat_name}' if prefix else feat_name
-                if col_name not in feature_cols:
-                    feature_cols[col_name] = []
-                feature_cols[col_name].append(feat_val)
+        Returns:
+            DataFrame of the twelve features, one row per title (a Series'
+            index is kept); missing titles get missing features
+        """
+        texts = texts if isinstance(texts, pd.Series) else pd.Series(list(texts), dtype=object)
+        workers = self.workers if workers is None else workers
+        present = texts.notna().to_numpy()
+        codes, uniques = pd.factorize(texts[present])
+        titles = [str(t).strip() for t in uniques.to_numpy(dtype=object)]
         
-        for col_name, values in feature_cols.items():
-            df[col_name] = values
+        cache = self._cache()
+        if cache is None:
+            found = self._compute_features(titles, workers)
+        else:
+            version = definition_version(_char_classes, _block_features, _title_features,
+                                         ClickbaitDataProcessor.extract_text_features)
+            found = cache.lookup('features', version, _feature_dtypes(), titles,
+                                 lambda todo: self._compute_features(todo, workers))
+        columns = {name: values[codes] for name, values in found.items()}
         
+        features = pd.DataFrame(columns)
+        if not present.all():
+            features.index = np.flatnonzero(present)
+            features = features.reindex(np.arange(len(texts)))
+        features.index = texts.index
+        return features
+    
+    def _compute_features(self, titles, workers):
+        """Features of stripped titles, in a process pool when there are enough of them."""
+        if workers > 1 and len(titles) >= PARALLEL_MIN_TITLES:
+            values = np.array(titles, dtype=object)
+            return _run_pool('features', values, np.ones(len(values), dtype=bool), workers, _feature_dtypes())
+        return _title_features(titles)
+    
+    def add_text_features(self, df, text_col='title', prefix='', workers=None):
+        """Add text feature columns to dataframe (workers: see extract_text_features_batch)"""
+        features = self.extract_text_features_batch(df[text_col], workers=workers)
+        for feat_name in features.columns:
+            col_name = f'{prefix}{feat_name}' if prefix else feat_name
+            df[col_name] = features[feat_name].to_numpy()
         return df
     
     def create_training_pairs(self, min_video_info_coverage=True):
         """
         Create clickbait → neutral training pairs
+        Per video: the most voted title from titles.csv (ties go to the
+        first in file order) and the first casual title, in order of first
+        appearance in casualVoteTitles.csv
         Returns: DataFrame with (clickbait_title, neutral_title, videoID)
         """
         
-        if self.titles_df is None or self.casual_titles_df is None:
-            print("Error: Load data first")
+        titles = self.table('titles', ['videoID', 'title', 'UUID'])
+        casual_titles = self.table('casual_titles', ['videoID', 'title'])
+        if titles is None or casual_titles is None:
+            print(f"Error: {TABLE_FILES['titles']} and {TABLE_FILES['casual_titles']} are needed in {self.data_dir}")
             return None
         
         # Merge titles with title votes to get clickbait score
-        titles_with_votes = self.titles_df.merge(
-            self.title_votes_df[['UUID', 'votes']],
+        titles_with_votes = titles.merge(
+            self.table('title_votes', ['UUID', 'votes']),
             left_on='UUID',
             right_on='UUID',
             how='left'
         )
         
-        # Create pairs: original titles with casual alternatives
-        pairs = []
-        
-        for vid in self.casual_titles_df['videoID'].unique():
-            # Get the neutral/casual title(s)
-            casual = self.casual_titles_df[self.casual_titles_df['videoID'] == vid]
-            
-            # Get the clickbaity title(s) from titles.csv
-            clickbaity = titles_with_votes[titles_with_votes['videoID'] == vid]
-            
-            if len(casual) > 0 and len(clickbaity) > 0:
-                # Get the most upvoted casual title
-                neutral_title = casual.iloc[0]['title']
-                
-                # Get the most voted (highest clicks) clickbaity title
-                clickbaity_sorted = clickbaity.sort_values('votes', ascending=False, na_position='last')
-                clickbaity_title = clickbaity_sorted.iloc[0]['title']
-                
-                pairs.append({
-                    'videoID': vid,
-                    'clickbait_title': clickbaity_title,
-                    'neutral_title': neutral_title,
-                    'clickbait_votes': clickbaity_sorted.iloc[0].get('votes', 0),
-                    'pair_source': 'titles_casual'
-                })
-        
-        pairs_df = pd.DataFrame(pairs)
-        
-        if min_video_info_coverage and self.video_info_df is not None:
+        # Most voted clickbaity title per video: stable sort by votes (missing
+        # last, ties in file order) and keep each video's first row
+        clickbaity = (titles_with_votes.loc[titles_with_votes['videoID'].notna(), ['videoID', 'title', 'votes']]
+                      .sort_values('votes', ascending=False, na_position='last', kind='stable')
+                      .drop_duplicates('videoID', keep='first'))
+        
+        # First casual (neutral) title per video, in order of first appearance
+        casual = (casual_titles.loc[casual_titles['videoID'].notna(), ['videoID', 'title']]
+                  .drop_duplicates('videoID', keep='first'))
+        
+        # One join instead of filtering both frames for every video; an inner
+        # merge keeps the casual (left) order, as the per-video loop did
+        pairs_df = casual.merge(clickbaity, on='videoID', how='inner', suffixes=('_neutral', '_clickbait'))
+        pairs_df = pd.DataFrame({
+            'videoID': pairs_df['videoID'],
+            'clickbait_title': pairs_df['title_clickbait'],
+            'neutral_title': pairs_df['title_neutral'],
+            'clickbait_votes': pairs_df['votes'],
+            'pair_source': 'titles_casual',
+        })
+        
+        video_info = self.table('video_info', ['videoID']) if min_video_info_coverage else None
+        if video_info is not None:
             # Filter to only pairs where we have video info
-            video_info_ids = set(self.video_info_df['videoID'].dropna().unique())
+            video_info_ids = set(video_info['videoID'].dropna().unique())
             pairs_df = pairs_df[pairs_df['videoID'].isin(video_info_ids)]
         
         return pairs_df
@@ -155,41 +460,69 @@ class ClickbaitDataProcessor:
         else:
             return 'en'
     
-    def add_language_detection(self, df, text_col='title'):
-        """Add language detection to dataframe"""
-        df['language'] = df[text_col].apply(self.detect_language)
+    def add_language_detection(self, df, text_col='title', workers=None):
+        """Add language detection to dataframe (distinct titles once, cached and pooled as in extract_text_features_batch)"""
+        workers = self.workers if workers is None else workers
+        texts = df[text_col]
+        present = texts.notna().to_numpy()
+        codes, uniques = pd.factorize(texts[present])
+        titles = [str(t) for t in uniques.to_numpy(dtype=object)]
+        
+        cache = self._cache()
+        if cache is None:
+            found = self._compute_languages(titles, workers)
+        else:
+            found = cache.lookup('language', definition_version(type(self).detect_language),
+                                 {'language': np.dtype(object)}, titles,
+                                 lambda todo: self._compute_languages(todo, workers))
+        
+        labels = np.full(len(texts), self.detect_language(None), dtype=object)
+        labels[present] = found['language'][codes]
+        df['language'] = pd.Series(labels, index=df.index)
         return df
     
+    def _compute_languages(self, titles, workers):
+        """detect_language of each title, in a process pool when there are enough of them."""
+        if workers > 1 and len(titles) >= PARALLEL_MIN_TITLES:
+            values = np.array(titles, dtype=object)
+            codes = _run_pool('language', values, np.ones(len(values), dtype=bool), workers,
+                              {'language': np.int8})['language']
+            return {'language': np.array(LANGUAGES, dtype=object)[codes]}
+        return {'language': np.array([self.detect_language(t) for t in titles], dtype=object)}
+    
     def get_summary_stats(self):
         """Print summary statistics about loaded data"""
         print("\n" + "="*80)
         print("DATA SUMMARY STATISTICS")
         print("="*80)
         
-        if self.titles_df is not None:
-            print(f"\ntitles.csv: {len(self.titles_df)} rows")
-            print(f"  - Unique videoIDs: {self.titles_df['videoID'].nunique()}")
-            print(f"  - Original (YouTube) titles: {self.titles_df['original'].sum()}")
+        titles = self.table('titles', ['videoID', 'original'])
+        if titles is not None:
+            print(f"\ntitles.csv: {len(titles)} rows")
+            print(f"  - Unique videoIDs: {titles['videoID'].nunique()}")
+            print(f"  - Original (YouTube) titles: {titles['original'].sum()}")
         
-        if self.casual_titles_df is not None:
-            print(f"\ncasualVoteTitles.csv: {len(self.casual_titles_df)} rows")
-            print(f"  - Unique videoIDs: {self.casual_titles_df['videoID'].nunique()}")
+        casual_titles = self.table('casual_titles', ['videoID'])
+        if casual_titles is not None:
+            print(f"\ncasualVoteTitles.csv: {len(casual_titles)} rows")
+            print(f"  - Unique videoIDs: {casual_titles['videoID'].nunique()}")
         
-        if self.title_votes_df is not None:
-            print(f"\ntitleVotes.csv: {len(self.title_votes_df)} rows")
-            print(f"  - Avg votes: {self.title_votes_df['votes'].mean():.2f}")
-            print(f"  - Positive votes: {(self.title_votes_df['votes'] > 0).sum()}")
-            print(f"  - Negative votes: {(self.title_votes_df['votes'] < 0).sum()}")
+        title_votes = self.table('title_votes', ['votes'])
+        if title_votes is not None:
+            print(f"\ntitleVotes.csv: {len(title_votes)} rows")
+            print(f"  - Avg votes: {title_votes['votes'].mean():.2f}")
+            print(f"  - Positive votes: {(title_votes['votes'] > 0).sum()}")
+            print(f"  - Negative votes: {(title_votes['votes'] < 0).sum()}")
         
-        if self.video_info_df is not None:
-            print(f"\nvideoInfo.csv: {len(self.video_info_df)} rows")
-            print(f"  - Unique videoIDs: {self.video_info_df['videoID'].nunique()}")
+        video_info = self.table('video_info', ['videoID'])
+        if video_info is not None:
+            print(f"\nvideoInfo.csv: {len(video_info)} rows")
+            print(f"  - Unique videoIDs: {video_info['videoID'].nunique()}")
 
 
 # Example usage
 if __name__ == "__main__":
-    processor = ClickbaitDataProcessor()
-    processor.load_data()
+    processor = ClickbaitDataProcessor()  # tables are read on first use, only the columns used
     processor.get_summary_stats()
     
     # Create training pairs
@@ -4,9 +4,11 @@ import seaborn as sns
 from datetime import datetime
 import numpy as np
 
+from arrow_cache import load_cached
+
 # Read the data
 print("Loading data...")
-df = pd.read_csv('All_data/all_in_one.csv')
+df = load_cached('All_data/all_in_one.csv', columns=['timeSubmitted', 'channelID'])
 
 # Convert timeSubmitted from milliseconds to datetime
 df['timeSubmitted'] = pd.to_datetime(df['timeSubmitted'], unit='ms')
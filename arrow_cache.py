@@ -0,0 +1,171 @@
+"""
+Memory-mapped Arrow cache of a CSV (All_data/all_in_one.csv by default).
+The first load parses the CSV once, typed per table_schema, into an
+uncompressed Arrow IPC file next to it (`all_in_one.csv.arrow`). Later loads
+memory-map that file: nothing is parsed, and only the pages of the columns
+asked for are read. The cache records the CSV's size and mtime and is
+rebuilt on the next load whenever either changes (e.g. after an enrichment
+run rewrote the CSV) or the registry's column types no longer match.
+
+Usage:
+    from arrow_cache import load_cached
+    df = load_cached('All_data/all_in_one.csv', columns=['timeSubmitted', 'channelID'])
+
+    python arrow_cache.py [csv ...]      # build/refresh ahead of time
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+import table_schema
+from parquet_store import read_csv_batches
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # optional: loaders fall back to parsing the CSV
+    pa = None
+
+ROOT = Path(__file__).resolve().parent
+DEFAULT_CSV = ROOT / 'All_data' / 'all_in_one.csv'
+SIZE_KEY, MTIME_KEY = b'csv_size', b'csv_mtime_ns'
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for the Arrow cache: pip install pyarrow")
+
+
+def cache_path_for(csv_path: Path) -> Path:
+    csv_path = Path(csv_path)
+    return csv_path.with_name(csv_path.name + '.arrow')
+
+
+class _GrowingDictionary:
+    """
+    Encode one categorical column batch by batch against a dictionary that
+    only ever grows, so every batch after the first is a dictionary delta
+    (IPC files reject a replaced dictionary).
+    """
+
+    def __init__(self, index_type):
+        self.index_type = index_type
+        self.values = pa.array([], pa.string())
+
+    def encode(self, column):
+        strings = column.dictionary_decode() if pa.types.is_dictionary(column.type) else column
+        unseen = pc.invert(pc.is_in(strings, value_set=self.values))
+        new = pc.unique(pc.filter(strings, unseen)).drop_null()
+        if len(new):
+            self.values = pa.concat_arrays([self.values, new])
+        indices = pc.cast(pc.index_in(strings, value_set=self.values), self.index_type)
+        return pa.DictionaryArray.from_arrays(indices, self.values)
+
+
+def build_cache(csv_path: Path) -> Path:
+    """
+    Parse `csv_path` into its Arrow IPC cache (atomically replacing any old one).
+
+    Returns:
+        Path of the cache file
+    """
+    csv_path = Path(csv_path)
+    cache_path = cache_path_for(csv_path)
+    stat = csv_path.stat()  # taken first: a CSV rewritten mid-build leaves the cache stale, not wrong
+    schema, batches = read_csv_batches(csv_path)
+    schema = schema.with_metadata({SIZE_KEY: str(stat.st_size), MTIME_KEY: str(stat.st_mtime_ns)})
+    encoders = {i: _GrowingDictionary(field.type.index_type)
+                for i, field in enumerate(schema) if pa.types.is_dictionary(field.type)}
+
+    tmp = cache_path.with_name(cache_path.name + '.tmp')
+    options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+    with pa.ipc.new_file(tmp, schema, options=options) as writer:
+        for batch in batches:
+            columns = [encoders[i].encode(col) if i in encoders else col
+                       for i, col in enumerate(batch.columns)]
+            writer.write_batch(pa.RecordBatch.from_arrays(columns, schema=schema))
+    os.replace(tmp, cache_path)
+    return cache_path
+
+
+def _is_fresh(cache_path: Path, csv_path: Path) -> bool:
+    if not cache_path.exists():
+        return False
+    stat = csv_path.stat()
+    with pa.memory_map(str(cache_path)) as source:
+        schema = pa.ipc.open_file(source).schema
+    meta = schema.metadata or {}
+    if meta.get(SIZE_KEY) != str(stat.st_size).encode() or meta.get(MTIME_KEY) != str(stat.st_mtime_ns).encode():
+        return False
+    header = pd.read_csv(csv_path, nrows=0).columns
+    expected = pa.schema([(c, table_schema.arrow_storage_type(c)) for c in header])
+    return schema.remove_metadata().equals(expected)
+
+
+def open_cached(csv_path: Path = DEFAULT_CSV, columns: Optional[List[str]] = None):
+    """
+    Memory-mapped Arrow table for a CSV, (re)building the cache first if stale.
+
+    Args:
+        csv_path: Source CSV
+        columns: Only these columns (None = all); unselected columns are never paged in
+
+    Returns:
+        pyarrow.Table backed by the mapped cache file
+    """
+    _require_pyarrow()
+    csv_path = Path(csv_path)
+    cache_path = cache_path_for(csv_path)
+    if not _is_fresh(cache_path, csv_path):
+        start = time.time()
+        print(f"  Building Arrow cache {cache_path.name}...")
+        build_cache(csv_path)
+        print(f"  ✓ Cache built in {time.time() - start:.1f}s")
+    table = pa.ipc.open_file(pa.memory_map(str(cache_path))).read_all()
+    return table.select(columns) if columns is not None else table
+
+
+def load_cached(csv_path: Path = DEFAULT_CSV, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """DataFrame of a CSV via its Arrow cache (table_schema dtypes); parses the CSV without pyarrow."""
+    if pa is None:
+        return table_schema.read_csv(csv_path, usecols=columns)
+    table = open_cached(csv_path, columns)
+    return table.to_pandas(types_mapper=table_schema.pandas_types_mapper)
+
+
+def iter_cached(csv_path: Path = DEFAULT_CSV, columns: Optional[List[str]] = None,
+                batch_size: int = 100_000) -> Iterator[pd.DataFrame]:
+    """Yield a CSV in DataFrame chunks via its Arrow cache, converting one chunk at a time."""
+    if pa is None:
+        yield from table_schema.read_csv(csv_path, usecols=columns, chunksize=batch_size)
+        return
+    for batch in open_cached(csv_path, columns).to_batches(max_chunksize=batch_size):
+        yield batch.to_pandas(types_mapper=table_schema.pandas_types_mapper)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or refresh the memory-mapped Arrow cache of CSVs')
+    parser.add_argument('paths', nargs='*', type=Path, default=[DEFAULT_CSV],
+                        help='CSV files (default: All_data/all_in_one.csv)')
+    parser.add_argument('--force', action='store_true', help='Rebuild even if the cache is fresh')
+    args = parser.parse_args()
+    _require_pyarrow()
+
+    for csv_path in args.paths:
+        cache_path = cache_path_for(csv_path)
+        if not args.force and _is_fresh(cache_path, csv_path):
+            print(f"  ✓ {cache_path.name} is up to date")
+            continue
+        start = time.time()
+        build_cache(csv_path)
+        print(f"  ✓ {csv_path.name} -> {cache_path.name}: {cache_path.stat().st_size/1e6:.1f} MB "
+              f"({time.time() - start:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -9,13 +9,21 @@ Uses stealth techniques to avoid bot detection:
 
 import os
 import sys
+import argparse
 import pandas as pd
 import time
 import random
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 import yt_dlp
 
+from enrichment_metrics import DEFAULT_METRICS_PATH, DEFAULT_METRICS_PORT, METRICS, MetricsExporter
+from rate_controller import BOT, OK, TIMEOUT, UNAVAILABLE, AdaptiveRateController, classify_error
+from stats_apply import apply_stats
+from stats_cache import StatsCache
+import table_schema
+
 # Ensure UTF-8 output handling
 if sys.stdout.encoding != 'utf-8':
     import io
@@ -26,6 +34,8 @@ MIN_SLEEP = 2.0  # Minimum delay between requests (seconds)
 MAX_SLEEP = 5.0  # Maximum delay between requests (seconds)
 SAVE_EVERY = 100  # Save checkpoint every N successful fetches
 MAX_RETRIES = 2  # Retries per video on transient errors
+ADAPTIVE_MIN_SLEEP = 0.5  # Fastest pacing the adaptive mode may reach (seconds)
+ADAPTIVE_MAX_SLEEP = 300.0  # Slowest pacing after repeated bot detection (seconds)
 
 # Browser cookie options (uncomment one if you want to use browser cookies)
 # BROWSER = 'chrome'  # or 'firefox', 'edge', 'safari', 'opera'
@@ -55,6 +65,16 @@ def get_video_stats(video_id: str, retry_count: int = 0) -> Optional[Dict]:
     Returns:
         Dictionary with video statistics or None if fails
     """
+    return fetch_video_stats(video_id, retry_count)[0]
+
+
+def fetch_video_stats(video_id: str, retry_count: int = 0) -> Tuple[Optional[Dict], str]:
+    """
+    Like get_video_stats, but also return the outcome class
+    (ok / unavailable / timeout / bot / error) used for adaptive pacing.
+    Every attempt is recorded in METRICS (latency and outcome).
+    """
+    start = time.perf_counter()
     try:
         ydl_opts = {
             'quiet': True,
@@ -79,7 +99,8 @@ def get_video_stats(video_id: str, retry_count: int = 0) -> Optional[Dict]:
             info = ydl.extract_info(f'https://www.youtube.com/watch?v={video_id}', download=False)
         
         if not info:
-            return None
+            METRICS.observe_request('yt-dlp-stealth', time.perf_counter() - start, UNAVAILABLE)
+            return None, UNAVAILABLE
         
         # Convert upload_date YYYYMMDD to ISO format
         upload_date = info.get('upload_date', '')
@@ -88,28 +109,35 @@ def get_video_stats(video_id: str, retry_count: int = 0) -> Optional[Dict]:
         else:
             published = ''
         
+        METRICS.observe_request('yt-dlp-stealth', time.perf_counter() - start, OK)
         return {
             'channelID': info.get('channel_id', ''),
             'Views': int(info.get('view_count', 0)) if info.get('view_count') else 0,
             'Published': published,
             'likes': int(info.get('like_count', 0)) if info.get('like_count') else 0,
             'comments': int(info.get('comment_count', 0)) if info.get('comment_count') else 0
-        }
+        }, OK
         
     except Exception as e:
         error_msg = str(e)
         
         # Check if it's a bot detection error
-        if 'bot' in error_msg.lower() or 'captcha' in error_msg.lower():
+        outcome = classify_error(error_msg)
+        if outcome == BOT:
+            METRICS.observe_request('yt-dlp-stealth', time.perf_counter() - start, BOT)
             print(f"  [Bot Detected] {video_id} - Increase delays or use browser cookies")
-            return None
+            return None, BOT
         
         # Retry on transient errors
-        if retry_count < MAX_RETRIES and any(keyword in error_msg.lower() for keyword in ['timeout', 'connection', 'network']):
+        transient = any(keyword in error_msg.lower() for keyword in ['timeout', 'connection', 'network'])
+        if transient:
+            outcome = TIMEOUT
+        METRICS.observe_request('yt-dlp-stealth', time.perf_counter() - start, outcome)
+        if retry_count < MAX_RETRIES and transient:
             wait = random.uniform(3, 8)
             print(f"  [Retry {retry_count+1}/{MAX_RETRIES}] {video_id}: waiting {wait:.1f}s...")
             time.sleep(wait)
-            return get_video_stats(video_id, retry_count=retry_count + 1)
+            return fetch_video_stats(video_id, retry_count=retry_count + 1)
         
         # Skip on all other errors
         if len(error_msg) > 100:
@@ -118,20 +146,28 @@ def get_video_stats(video_id: str, retry_count: int = 0) -> Optional[Dict]:
             print(f"  [Skip] {video_id}: {error_msg}")
         except:
             print(f"  [Skip] {video_id}: <encoding error>")
-        return None
+        return None, outcome
 
 
-def update_all_in_one_stealth():
+def update_all_in_one_stealth(adaptive: bool = False):
     """
     Update all_in_one.csv with YouTube statistics using stealth mode.
     Resumes from last checkpoint automatically.
+    
+    Args:
+        adaptive: Replace the fixed MIN_SLEEP-MAX_SLEEP delay with AIMD pacing
+            that speeds up on clean fetches and backs off on errors/bot checks
     """
     csv_path = Path(r"c:\Users\Sahar\Desktop\Clickbait_git\Clickbait-project\All_data\all_in_one.csv")
     
     print("="*70)
     print("Updating all_in_one.csv with yt-dlp (Stealth Mode)")
     print("="*70)
-    print(f"Rate limiting: {MIN_SLEEP}-{MAX_SLEEP} seconds between requests")
+    if adaptive:
+        print(f"Rate limiting: adaptive, starting at {(MIN_SLEEP + MAX_SLEEP) / 2}s "
+              f"(bounds {ADAPTIVE_MIN_SLEEP}-{ADAPTIVE_MAX_SLEEP}s, ±50% jitter)")
+    else:
+        print(f"Rate limiting: {MIN_SLEEP}-{MAX_SLEEP} seconds between requests")
     print(f"Browser cookies: {'Yes (' + BROWSER + ')' if BROWSER else 'No'}")
     print(f"Save frequency: Every {SAVE_EVERY} successful fetches")
     print("="*70)
@@ -140,10 +176,13 @@ def update_all_in_one_stealth():
         print("\n⚠️  TIP: If you get bot detection, set BROWSER='chrome' in the script")
         print("   This will use your browser's cookies for authentication\n")
     
+    pending = {}  # videoID -> stats fetched since the last checkpoint
+    stack = ExitStack()
+    
     try:
         # Read CSV
         print("\nReading CSV file...")
-        df = pd.read_csv(csv_path, dtype={'category': str, 'original_title': str}, low_memory=False)
+        df = table_schema.read_csv(csv_path)
         print(f"Total rows: {len(df):,}")
         
         # Add new columns if they don't exist
@@ -171,6 +210,19 @@ def update_all_in_one_stealth():
         
         print(f"\nFound {total_videos:,} unique videoIDs needing stats")
         
+        # Fill videos already fetched by any updater from the shared cache
+        cache = stack.enter_context(StatsCache())
+        cached = cache.get_many(str(v).strip() for v in unique_videos)
+        if cached:
+            apply_stats(df, cached)
+            df.to_csv(csv_path, index=False)
+            unique_videos = [v for v in unique_videos if str(v).strip() not in cached]
+            total_videos = len(unique_videos)
+            print(f"  {len(cached):,} served from stats cache, {total_videos:,} left to fetch")
+            if total_videos == 0:
+                print("\n✓ All remaining videos were served from the cache!")
+                return
+        
         # Estimate time
         avg_delay = (MIN_SLEEP + MAX_SLEEP) / 2
         estimated_hours = (total_videos * avg_delay) / 3600
@@ -179,6 +231,14 @@ def update_all_in_one_stealth():
         time.sleep(3)
         
         # Process videos one by one
+        controller = None
+        if adaptive:
+            controller = AdaptiveRateController(
+                initial_delay=(MIN_SLEEP + MAX_SLEEP) / 2,
+                min_delay=ADAPTIVE_MIN_SLEEP,
+                max_delay=ADAPTIVE_MAX_SLEEP,
+                step=0.25,
+            )
         successful = 0
         failed = 0
         start_time = time.time()
@@ -191,16 +251,14 @@ def update_all_in_one_stealth():
             video_id = str(video_id).strip()
             
             # Fetch stats
-            stats = get_video_stats(video_id)
+            stats, outcome = fetch_video_stats(video_id)
+            if controller is not None:
+                controller.record(outcome)
             
             if stats:
-                # Update all rows with this videoID
-                mask = df['videoID'] == video_id
-                df.loc[mask, 'channelID'] = stats['channelID']
-                df.loc[mask, 'Views'] = stats['Views']
-                df.loc[mask, 'Published'] = stats['Published']
-                df.loc[mask, 'likes'] = stats['likes']
-                df.loc[mask, 'comments'] = stats['comments']
+                # Rows are filled in one vectorized pass at the next checkpoint
+                pending[video_id] = stats
+                cache.put_many({video_id: stats}, source='yt-dlp-stealth')
                 successful += 1
             else:
                 failed += 1
@@ -214,20 +272,29 @@ def update_all_in_one_stealth():
                 eta_hours = eta_seconds / 3600
                 
                 print(f"[{idx:,}/{total_videos:,}] Success: {successful:,} | Failed: {failed} | "
-                      f"Rate: {rate*3600:.0f}/hr | ETA: {eta_hours:.1f}h")
+                      f"Rate: {rate*3600:.0f}/hr | ETA: {eta_hours:.1f}h"
+                      + (f" | {controller}" if controller else ""))
             
             # Save checkpoint periodically based on successful fetches
             if successful - last_save_count >= SAVE_EVERY or idx == total_videos:
-                df.to_csv(csv_path, index=False)
+                with METRICS.checkpoint('yt-dlp-stealth'):
+                    apply_stats(df, pending)
+                    pending.clear()
+                    df.to_csv(csv_path, index=False)
                 print(f"  ✓ Checkpoint saved ({successful:,} successful fetches)")
                 last_save_count = successful
             
             # Randomized delay to avoid detection (skip on last iteration)
             if idx < total_videos:
-                delay = random.uniform(MIN_SLEEP, MAX_SLEEP)
-                time.sleep(delay)
+                if controller is not None:
+                    controller.wait(jitter=0.5)
+                else:
+                    delay = random.uniform(MIN_SLEEP, MAX_SLEEP)
+                    time.sleep(delay)
         
         # Final save
+        apply_stats(df, pending)
+        pending.clear()
         df.to_csv(csv_path, index=False)
         
         elapsed = time.time() - start_time
@@ -241,6 +308,7 @@ def update_all_in_one_stealth():
         
     except KeyboardInterrupt:
         print("\n\n⚠️  Interrupted by user - saving checkpoint...")
+        apply_stats(df, pending)
         df.to_csv(csv_path, index=False)
         print(f"✓ Progress saved: {successful:,} videos fetched")
         print("You can resume by running this script again")
@@ -248,7 +316,19 @@ def update_all_in_one_stealth():
         print(f"\n❌ Error: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        stack.close()
 
 
 if __name__ == "__main__":
-    update_all_in_one_stealth()
+    parser = argparse.ArgumentParser(description='Update all_in_one.csv with yt-dlp (stealth mode)')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='AIMD pacing: speed up while fetches succeed, back off on errors/bot checks')
+    parser.add_argument('--metrics-file', type=Path, default=DEFAULT_METRICS_PATH or None,
+                        help='Flush a JSON metrics snapshot here periodically (env YOUTUBE_METRICS_FILE)')
+    parser.add_argument('--metrics-port', type=int, default=DEFAULT_METRICS_PORT,
+                        help='Serve Prometheus text metrics on this local port (env YOUTUBE_METRICS_PORT)')
+    args = parser.parse_args()
+    
+    with MetricsExporter(args.metrics_file, args.metrics_port):
+        update_all_in_one_stealth(adaptive=args.adaptive)
@@ -6,39 +6,109 @@ Uses YouTube Data API v3 with proper rate limiting and checkpointing.
 
 import os
 import sys
-import pandas as pd
+import argparse
+import io
+import json
+import threading
 import time
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional, Tuple
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from enrichment_metrics import DEFAULT_METRICS_PATH, DEFAULT_METRICS_PORT, METRICS, MetricsExporter
+from id_codec import IdSet
+from missing_scan import scan_missing_work
+from quota_ledger import DEFAULT_BUDGET, DEFAULT_LEDGER_PATH, QuotaExceededError, QuotaLedger, WorkQueue
+from results_journal import ResultsJournal, journal_dir_for
+from retry_schedule import FailureTable
+from shards import (Shard, in_shard, parse_shard, shard_db_path, shard_db_paths, shard_journal_dir,
+                    shard_ledger_path, shard_name, shard_of, shard_queue_path)
+from stats_cache import DEFAULT_CACHE_PATH, StatsCache
 
 # Ensure UTF-8 output handling
 if sys.stdout.encoding != 'utf-8':
-    import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
 # Configuration
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY", "")
+API_BASE_URL = os.getenv("YOUTUBE_API_BASE_URL", "https://www.googleapis.com/youtube/v3")  # override for a local fake API
 SLEEP_PER_REQUEST = 0.1  # 100ms between requests (well under quota limits)
 SAVE_EVERY = 5000  # Save checkpoint every 5000 videos (reduce memory reloads)
 BATCH_SIZE = 50  # Fetch this many videos per API call (API supports up to 50)
+CONCURRENT_WORKERS = int(os.getenv("YOUTUBE_API_WORKERS", "8"))  # batch requests in flight (concurrent mode)
+MAX_REQUESTS_PER_SEC = float(os.getenv("YOUTUBE_API_MAX_RPS", "10"))  # request ceiling (concurrent mode)
+LEAN_MODE = os.getenv("YOUTUBE_API_LEAN", "") == "1"  # fields selector + gzip (see --lean)
+# Only what the five stat columns need: no description, thumbnails, tags, localizations...
+LEAN_FIELDS = 'items(id,snippet(channelId,publishedAt),statistics(viewCount,likeCount,commentCount))'
+# Google only gzips responses for clients that also put "gzip" in their User-Agent
+LEAN_HEADERS = {'Accept-Encoding': 'gzip', 'User-Agent': 'Clickbait-project stats updater (gzip)'}
+ALL_IN_ONE_CSV = Path(r"c:\Users\Sahar\Desktop\Clickbait_git\Clickbait-project\All_data\all_in_one.csv")
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces request starts to at most `rate` per second."""
 
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until the caller may start its next request."""
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
 
-def get_videos_stats_batch(video_ids: list, api_key: str) -> Dict[str, Dict]:
+
+def make_session(pool_size: int = CONCURRENT_WORKERS) -> requests.Session:
+    """Create a keep-alive session whose connection pool fits `pool_size` concurrent requests."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_videos_stats_batch(video_ids: list, api_key: str,
+                           session: Optional[requests.Session] = None,
+                           lean: bool = LEAN_MODE) -> Dict[str, Dict]:
     """
     Fetch statistics for multiple YouTube videos in one API call.
     
     Args:
         video_ids: List of YouTube video IDs (max 50)
         api_key: YouTube Data API v3 key
+        session: Optional pooled session to reuse connections across calls
+        lean: Ask only for the fields we keep, gzip-compressed
     
     Returns:
         Dictionary mapping video_id to stats dict
     """
+    return fetch_videos_stats_batch(video_ids, api_key, session, lean)[0]
+
+
+def fetch_videos_stats_batch(video_ids: list, api_key: str,
+                             session: Optional[requests.Session] = None,
+                             lean: bool = LEAN_MODE) -> Tuple[Dict[str, Dict], Optional[str]]:
+    """
+    Like get_videos_stats_batch, but also return why the request failed
+    ('timeout', 'request_error', 'error') or None if the API answered.
+    IDs absent from a successful answer are not found (deleted/private).
+    """
     if not api_key:
         raise ValueError("YouTube API key not provided. Set YOUTUBE_API_KEY environment variable.")
     
-    base_url = "https://www.googleapis.com/youtube/v3/videos"
+    base_url = f"{API_BASE_URL}/videos"
     
     # Join video IDs with commas (API accepts up to 50)
     video_ids_str = ','.join(video_ids[:BATCH_SIZE])
@@ -48,11 +118,21 @@ def get_videos_stats_batch(video_ids: list, api_key: str) -> Dict[str, Dict]:
         'id': video_ids_str,
         'key': api_key
     }
+    headers = None
+    if lean:
+        params['fields'] = LEAN_FIELDS
+        headers = LEAN_HEADERS
     
+    start = time.perf_counter()
+    nbytes = 0
     try:
-        response = requests.get(base_url, params=params, timeout=10)
+        http = session if session is not None else requests
+        with http.get(base_url, params=params, headers=headers, timeout=10, stream=True) as response:
+            body, nbytes = _read_body(response)
+        if response.status_code == 403 and _is_quota_error(body):
+            raise QuotaExceededError(body[:200].decode('utf-8', 'replace'))
         response.raise_for_status()
-        data = response.json()
+        data = json.loads(body)
         
         results = {}
         for item in data.get('items', []):
@@ -74,23 +154,149 @@ def get_videos_stats_batch(video_ids: list, api_key: str) -> Dict[str, Dict]:
                 'comments': int(stats.get('commentCount', 0))
             }
         
-        return results
+        METRICS.observe_request('api', time.perf_counter() - start, 'ok', nbytes)
+        return results, None
         
+    except QuotaExceededError:
+        METRICS.observe_request('api', time.perf_counter() - start, 'quota', nbytes)
+        raise
+    except requests.exceptions.Timeout as e:
+        print(f"  [API Timeout] {e}")
+        error = 'timeout'
     except requests.exceptions.RequestException as e:
         print(f"  [API Error] {e}")
-        return {}
+        error = 'request_error'
     except Exception as e:
         print(f"  [Error] {e}")
-        return {}
+        error = 'error'
+    METRICS.observe_request('api', time.perf_counter() - start, error, nbytes)
+    return {}, error
 
 
-def update_all_in_one_with_api():
+def _read_body(response: requests.Response) -> Tuple[bytes, int]:
+    """
+    Read a streamed response. Returns the decoded body and the bytes on the
+    wire (compressed size when gzipped). Chunked replies carry no
+    Content-Length and len(response.content) is the decompressed size, so
+    the raw body is read undecoded and decoded afterwards.
+    """
+    wire = response.raw.read(decode_content=False)
+    decoder = urllib3.HTTPResponse(body=io.BytesIO(wire), headers=response.raw.headers, preload_content=False)
+    return decoder.read(decode_content=True), len(wire)
+
+
+def _is_quota_error(body: bytes) -> bool:
+    """True if a 403 response body is the daily quota running out (not e.g. a bad key)."""
+    try:
+        errors = json.loads(body).get('error', {}).get('errors', [])
+    except (ValueError, AttributeError):
+        return False
+    return any(e.get('reason') in ('quotaExceeded', 'dailyLimitExceeded') for e in errors)
+
+
+def _iter_batches_serial(video_ids: list, api_key: str,
+                         lean: bool = LEAN_MODE) -> Iterator[Tuple[list, Dict, Optional[str]]]:
+    """Fetch batches one at a time, sleeping SLEEP_PER_REQUEST between calls."""
+    for i in range(0, len(video_ids), BATCH_SIZE):
+        batch = video_ids[i:i+BATCH_SIZE]
+        yield (batch, *fetch_videos_stats_batch(batch, api_key, lean=lean))
+        
+        # Rate limiting
+        time.sleep(SLEEP_PER_REQUEST)
+
+
+def _iter_batches_concurrent(video_ids: list, api_key: str, workers: int, max_rps: float,
+                             lean: bool = LEAN_MODE) -> Iterator[Tuple[list, Dict, Optional[str]]]:
+    """
+    Fetch batches on a thread pool sharing one keep-alive session.
+    Keeps up to `workers` requests in flight, never starting more than
+    `max_rps` requests per second. Yields (batch, results, error) in completion order.
+    On quotaExceeded no new request is started, the requests already in
+    flight are drained (their batches still yielded), and QuotaExceededError
+    is raised last with `rejected` set to the number of rejected calls.
+    """
+    limiter = RateLimiter(max_rps)
+    session = make_session(workers)
+    stop = threading.Event()
+    
+    def fetch(batch):
+        limiter.acquire()
+        if stop.is_set():
+            return None  # never sent: the batch stays queued
+        return fetch_videos_stats_batch(batch, api_key, session=session, lean=lean)
+    
+    quota_error = None
+    
+    def completed(done):
+        nonlocal quota_error
+        for future in done:
+            batch = in_flight.pop(future)
+            try:
+                outcome = future.result()
+            except QuotaExceededError as e:
+                stop.set()
+                if quota_error is None:
+                    quota_error = e
+                    quota_error.rejected = 0
+                quota_error.rejected += 1
+                continue
+            if outcome is not None:
+                yield (batch, *outcome)
+    
+    in_flight = {}
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            try:
+                for i in range(0, len(video_ids), BATCH_SIZE):
+                    if len(in_flight) >= workers:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        yield from completed(done)
+                    if stop.is_set():
+                        break
+                    batch = video_ids[i:i+BATCH_SIZE]
+                    in_flight[pool.submit(fetch, batch)] = batch
+                
+                while in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    yield from completed(done)
+            finally:
+                stop.set()  # an abandoned generator must not keep sending requests
+    finally:
+        session.close()
+    if quota_error is not None:
+        raise quota_error
+
+
+def update_all_in_one_with_api(concurrent: bool = False, workers: int = CONCURRENT_WORKERS,
+                               max_rps: float = MAX_REQUESTS_PER_SEC, use_cache: bool = True,
+                               budget: int = DEFAULT_BUDGET, csv_path: Optional[Path] = None,
+                               shard: Optional[Shard] = None, lean: bool = LEAN_MODE) -> Optional[Dict]:
     """
     Update all_in_one.csv with YouTube statistics using the official API.
     Processes in chunks to avoid memory issues with large files.
     Resumes from last checkpoint automatically.
+    
+    Args:
+        concurrent: Keep several batch requests in flight instead of the serial loop
+        workers: Number of concurrent batch requests (concurrent mode only)
+        max_rps: Ceiling on API requests started per second (concurrent mode only)
+        use_cache: Serve known videoIDs from the shared stats cache and store new results
+        budget: API units this run may spend per quota day (shared ledger across runs).
+                The quota belongs to the API key, so with `shard` this is the
+                budget of all N shards together: each one spends budget // N
+        csv_path: CSV to update (default: ALL_IN_ONE_CSV)
+        shard: (K, N) to fetch only the videoIDs hashed to shard K of N. The
+               shard journals its results without touching the CSV; run
+               merge_journal (--merge-journal) once all shards are done
+        lean: Request only the kept fields (fields selector) with gzip
+    
+    Returns:
+        Run summary (counts and timings) when a fetch pass ran, else None
+    
+    Unfetched videoIDs are kept in all_in_one.csv.queue, so a cron job can
+    call this daily and continue where the previous day's budget ran out.
     """
-    csv_path = Path(r"c:\Users\Sahar\Desktop\Clickbait_git\Clickbait-project\All_data\all_in_one.csv")
+    csv_path = Path(csv_path) if csv_path is not None else ALL_IN_ONE_CSV
     
     if not YOUTUBE_API_KEY:
         print("="*70)
@@ -110,127 +316,323 @@ def update_all_in_one_with_api():
         return
     
     print("="*70)
-    print("Updating all_in_one.csv with YouTube Data API v3 (Chunked Mode)")
+    print("Updating all_in_one.csv with YouTube Data API v3 (Chunked Mode)"
+          + (f" - {shard_name(shard)}" if shard else ""))
     print("="*70)
     
+    if shard:
+        # Everything this worker writes is private to its shard: no shared write locks
+        journal = ResultsJournal(shard_journal_dir(csv_path, shard))
+        queue = WorkQueue(shard_queue_path(csv_path, shard))
+        # All shards draw on the key's one daily quota: each gets an equal share
+        ledger = QuotaLedger(shard_ledger_path(DEFAULT_LEDGER_PATH, shard), budget=budget // shard[1])
+    else:
+        journal = ResultsJournal(journal_dir_for(csv_path))
+        queue = WorkQueue(csv_path.with_name(csv_path.name + '.queue'))
+        ledger = QuotaLedger(budget=budget)
+    print(f"Quota ledger: {ledger}")
+    
+    if ledger.remaining() == 0:
+        print("\nToday's API budget is spent. Run again after midnight Pacific Time;")
+        print("pending work stays in the queue.")
+        return
+    
+    stack = ExitStack()
+    if shard:
+        # New cache entries and failure records go to the shard's own file;
+        # it starts from the shared failure history of the shard's videoIDs
+        shard_db = shard_db_path(csv_path, shard)
+        failures = stack.enter_context(FailureTable(shard_db))
+        failures.copy_from(DEFAULT_CACHE_PATH, replace=False, keep=lambda v: shard_of(v, shard[1]) == shard[0])
+    else:
+        failures = stack.enter_context(FailureTable())
+    
     try:
-        # First pass: identify all videos needing stats
-        print("\nScanning file for videos needing stats...")
-        all_missing = set()
-        
-        chunk_size = 50000  # Process 50k rows at a time to avoid memory issues
-        for chunk_num, chunk in enumerate(pd.read_csv(csv_path, chunksize=chunk_size, dtype={'category': str, 'original_title': str})):
-            # Find videos in this chunk that need fetching
-            missing_mask = (
-                chunk['videoID'].notna() & 
-                (chunk['Views'] != -1) &  # Skip previously failed videos
-                (
-                    chunk['channelID'].isna() |
-                    chunk['Views'].isna() |
-                    chunk['Published'].isna() |
-                    chunk['likes'].isna() |
-                    chunk['comments'].isna()
-                )
-            )
-            chunk_missing = chunk.loc[missing_mask, 'videoID'].dropna().unique().tolist()
-            all_missing.update(chunk_missing)
+        unique_videos = None
+        
+        # Resume yesterday's queue instead of rescanning; drop IDs already journaled
+        if queue.exists():
+            unique_videos = IdSet(journal.load()).drop_from(queue.load())
+            print(f"\nResuming {len(unique_videos):,} queued videoIDs (skipping CSV scan)")
+        
+        # Fold in results journaled by an interrupted run before rescanning
+        # (a shard leaves its journal for the merge step and skips those IDs instead)
+        if journal.segments() and not shard:
+            merge_journal(csv_path, journal)
+        
+        if unique_videos is None:
+            # First pass: identify all videos needing stats (videoID + stat columns only)
+            print("\nScanning file for videos needing stats...")
+            scan_start = time.time()
+            work = scan_missing_work(csv_path)
+            unique_videos = work.missing.tolist()
+            failed_ids = work.failed.tolist()
+            print(f"  Scanned {work.total_rows:,} rows in {time.time() - scan_start:.1f}s ({work.engine})")
             
-            if (chunk_num + 1) % 2 == 0:
-                print(f"  Scanned chunk {chunk_num + 1}... Found {len(all_missing)} unique videos so far")
+            if shard:
+                unique_videos = IdSet(journal.load()).drop_from(in_shard(unique_videos, shard))
+                failed_ids = in_shard(failed_ids, shard)
+                print(f"  {len(unique_videos):,} of them belong to {shard_name(shard)}")
+            
+            # -1 rows with no failure record predate the retry table: retry them once now
+            failures.seed_legacy(failed_ids, source='api')
+            
+            # Empty cells of a video that failed recently (e.g. in another copy of the CSV) wait too
+            waiting = IdSet(failures.waiting(source='api'))
+            if waiting:
+                kept = waiting.drop_from(unique_videos)
+                if len(kept) < len(unique_videos):
+                    print(f"  {len(unique_videos) - len(kept):,} missing videoIDs skipped until their retry is due")
+                unique_videos = kept
+        
+        # Previously failed videos come back only once their backoff has elapsed
+        due = IdSet(unique_videos).drop_from(failures.due(source='api'))
+        if shard:
+            due = in_shard(due, shard)
+        if due:
+            print(f"  {len(due):,} previously failed videoIDs are due for a retry")
+            unique_videos.extend(due)
         
-        unique_videos = list(all_missing)
         total_videos = len(unique_videos)
         
         if total_videos == 0:
+            queue.clear()
             print("\n✓ All videos already have statistics!")
             return
         
         print(f"\nFound {total_videos:,} unique videoIDs needing stats")
+        
+        # Serve already-fetched videos from the shared cache without spending quota
+        # (a shard only reads it and stores new entries in its own file)
+        cache = cache_out = None
+        if use_cache and shard:
+            cache = stack.enter_context(StatsCache(read_only=True))
+            cache_out = stack.enter_context(StatsCache(shard_db))
+        elif use_cache:
+            cache = cache_out = stack.enter_context(StatsCache())
+        if cache is not None:
+            cached = cache.get_many(unique_videos)
+            if cached:
+                print(f"  {len(cached):,} found in stats cache, applying without API calls...")
+                journal.append(list(cached), cached)
+                failures.record_successes(cached)
+                unique_videos = IdSet(cached).drop_from(unique_videos)
+                total_videos = len(unique_videos)
+                if total_videos == 0:
+                    if not shard:
+                        merge_journal(csv_path, journal)
+                    queue.clear()
+                    print("\n✓ All remaining videos were served from the cache!")
+                    return
+        
+        # Spend at most today's remaining budget (1 unit per batch); defer the rest
+        allowed = ledger.remaining() * BATCH_SIZE
+        deferred = unique_videos[allowed:]
+        unique_videos = unique_videos[:allowed]
+        total_videos = len(unique_videos)
+        queue.save(unique_videos + deferred)  # lets a crashed run resume without a scan
+        if deferred:
+            print(f"  Budget allows {ledger.remaining():,} API calls today: "
+                  f"fetching {total_videos:,}, queueing {len(deferred):,} for later runs")
+        
         print(f"Fetching in batches of {BATCH_SIZE}...")
         print(f"Estimated API calls: {(total_videos + BATCH_SIZE - 1) // BATCH_SIZE:,}")
         print(f"Saving checkpoint every {SAVE_EVERY} videos\n")
         
-        # Process in chunks and update
+        if concurrent:
+            print(f"Mode: concurrent ({workers} requests in flight, max {max_rps:g} requests/sec)")
+            batch_iter = _iter_batches_concurrent(unique_videos, YOUTUBE_API_KEY, workers, max_rps, lean)
+        else:
+            print(f"Mode: serial ({SLEEP_PER_REQUEST}s between requests)")
+            batch_iter = _iter_batches_serial(unique_videos, YOUTUBE_API_KEY, lean)
+        print(f"Response format: {'lean (fields selector + gzip)' if lean else 'full snippet,statistics'}")
+        
+        # Accumulate results between checkpoints so every fetched batch is written
         successful = 0
         failed = 0
+        processed = 0
+        next_progress = 500
+        pending_batch = []
+        pending_results = {}
+        fetched_ids = []
+        checkpoint_time = 0.0
+        bytes_before = METRICS.value('response_bytes_total', source='api')
         start_time = time.time()
         
-        for i in range(0, total_videos, BATCH_SIZE):
-            batch = unique_videos[i:i+BATCH_SIZE]
-            current_idx = i + len(batch)
-            
-            # Fetch batch
-            batch_results = get_videos_stats_batch(batch, YOUTUBE_API_KEY)
-            
-            successful += len(batch_results)
-            failed += len(batch) - len(batch_results)
-            
-            # Progress update
-            if current_idx % 500 == 0 or current_idx >= total_videos:
-                elapsed = time.time() - start_time
-                rate = successful / elapsed if elapsed > 0 else 0
-                eta_seconds = (total_videos - current_idx) / rate if rate > 0 else 0
-                eta_minutes = eta_seconds / 60
+        try:
+            for batch, batch_results, error in batch_iter:
+                ledger.spend(1)
+                fetched_ids.extend(batch)
+                processed += len(batch)
+                successful += len(batch_results)
+                failed += len(batch) - len(batch_results)
+                pending_batch.extend(batch)
+                pending_results.update(batch_results)
+                if cache_out is not None:
+                    cache_out.put_many(batch_results, source='api')
                 
-                print(f"Progress: {current_idx:,}/{total_videos:,} ({current_idx/total_videos*100:.1f}%) | "
-                      f"Success: {successful:,} | Failed: {failed} | "
-                      f"Rate: {rate:.1f} vid/s | ETA: {eta_minutes:.1f}min")
-            
-            # Save checkpoint: only update relevant rows for this batch
-            if current_idx % SAVE_EVERY == 0 or current_idx >= total_videos:
-                print(f"  ✓ Saving checkpoint at {current_idx:,}/{total_videos:,}...")
-                _update_csv_chunk(csv_path, batch, batch_results)
-                print(f"    Checkpoint saved")
-            
-            # Rate limiting
-            time.sleep(SLEEP_PER_REQUEST)
+                # Schedule retries instead of tombstoning failed videos forever
+                failures.record_successes(batch_results)
+                missing = [v for v in batch if v not in batch_results]
+                if missing:
+                    failures.record_failures(missing, reason=error or 'not_found', source='api')
+                
+                # Progress update
+                if processed >= next_progress or processed >= total_videos:
+                    next_progress = (processed // 500 + 1) * 500
+                    elapsed = time.time() - start_time
+                    rate = successful / elapsed if elapsed > 0 else 0
+                    eta_seconds = (total_videos - processed) / rate if rate > 0 else 0
+                    eta_minutes = eta_seconds / 60
+                    
+                    print(f"Progress: {processed:,}/{total_videos:,} ({processed/total_videos*100:.1f}%) | "
+                          f"Success: {successful:,} | Failed: {failed} | "
+                          f"Rate: {rate:.1f} vid/s | ETA: {eta_minutes:.1f}min")
+                
+                # Save checkpoint: append results fetched since the last checkpoint to the journal
+                if len(pending_batch) >= SAVE_EVERY or processed >= total_videos:
+                    checkpoint_start = time.time()
+                    with METRICS.checkpoint('api'):
+                        journal.append(pending_batch, pending_results)
+                    checkpoint_time += time.time() - checkpoint_start
+                    print(f"  ✓ Checkpoint journaled at {processed:,}/{total_videos:,} "
+                          f"({len(pending_batch):,} videos, {time.time() - checkpoint_start:.2f}s)")
+                    pending_batch = []
+                    pending_results = {}
+        except QuotaExceededError as e:
+            # Stop cleanly: nothing from the rejected batches is marked as failed,
+            # but the rejected calls were issued, so they count against the day
+            ledger.spend(e.rejected)
+            ledger.mark_exhausted()
+            print("\n⚠️  API reported quotaExceeded - stopping for today")
+            if pending_batch:
+                journal.append(pending_batch, pending_results)
+        
+        # Everything not fetched this run waits in the queue for the next one
+        remaining = IdSet(fetched_ids).drop_from(unique_videos) + deferred
+        queue.save(remaining)
+        
+        # One streaming pass writes everything journaled during the run into the CSV
+        merge_start = time.time()
+        if shard:
+            print(f"\n{shard_name(shard)} journaled to {journal.dir}; "
+                  f"run --merge-journal once every shard has finished")
+        else:
+            merge_journal(csv_path, journal)
+        merge_time = time.time() - merge_start
         
         elapsed = time.time() - start_time
+        fetch_elapsed = elapsed - checkpoint_time - merge_time
         print("\n" + "="*70)
         print(f"✓ Update complete!")
         print(f"  Successfully fetched: {successful:,}/{total_videos:,}")
         print(f"  Failed: {failed}")
         print(f"  Time elapsed: {elapsed/60:.1f} minutes")
         print(f"  Average rate: {successful/elapsed:.1f} videos/second")
+        print(f"  Sustained fetch throughput ({'concurrent' if concurrent else 'serial'}): "
+              f"{processed/fetch_elapsed if fetch_elapsed > 0 else 0:.1f} videos/second "
+              f"(excluding {checkpoint_time:.1f}s of checkpoint writes, {merge_time:.1f}s merge)")
+        response_bytes = METRICS.value('response_bytes_total', source='api') - bytes_before
+        print(f"  Response data: {response_bytes/1e6:.1f} MB, "
+              f"{response_bytes/processed if processed else 0:,.0f} bytes/video ({'lean' if lean else 'full'})")
+        print(f"  Quota: {ledger}")
+        print(f"  Queued for the next run: {len(remaining):,} videos")
+        retry = failures.summary()
+        print(f"  Failure table: {retry['by_reason']} ({retry['due']:,} due now)")
         print("="*70)
         
+        return {
+            'videos': processed,
+            'successful': successful,
+            'failed': failed,
+            'elapsed': elapsed,
+            'fetch_elapsed': fetch_elapsed,
+            'checkpoint_time': checkpoint_time,
+            'merge_time': merge_time,
+            'queued': len(remaining),
+            'response_bytes': response_bytes,
+        }
+        
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Interrupted - journaled results are kept and merged on the next run")
+        print("   (or merge now with --merge-journal)")
     except Exception as e:
         print(f"\nError: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        journal.close()
+        stack.close()
 
 
-def _update_csv_chunk(csv_path: Path, batch: list, batch_results: Dict):
-    """Update only the rows for this batch to save memory."""
-    # Read with error handling for corrupted lines
-    try:
-        df = pd.read_csv(csv_path, on_bad_lines='skip', engine='python')
-    except:
-        # Fallback: try with different options
-        df = pd.read_csv(csv_path, error_bad_lines=False, warn_bad_lines=True, engine='python')
-    
-    # Update successful fetches
-    for video_id, stats in batch_results.items():
-        mask = df['videoID'] == video_id
-        df.loc[mask, 'channelID'] = stats['channelID']
-        df.loc[mask, 'Views'] = stats['Views']
-        df.loc[mask, 'Published'] = stats['Published']
-        df.loc[mask, 'likes'] = stats['likes']
-        df.loc[mask, 'comments'] = stats['comments']
-    
-    # Mark failed videos
-    failed_videos = set(batch) - set(batch_results.keys())
-    for video_id in failed_videos:
-        mask = df['videoID'] == video_id
-        df.loc[mask, 'Views'] = -1  # Mark as failed
-        df.loc[mask, 'channelID'] = ''
-        df.loc[mask, 'Published'] = ''
-        df.loc[mask, 'likes'] = -1
-        df.loc[mask, 'comments'] = -1
-    
-    # Write safely with quoting to prevent corruption
-    df.to_csv(csv_path, index=False, quoting=1)  # QUOTE_ALL to protect data
+def merge_journal(csv_path: Path, journal: Optional[ResultsJournal] = None):
+    """Merge journaled results (including every shard's) into the CSV in one streaming pass."""
+    if journal is None:
+        journal = ResultsJournal(journal_dir_for(csv_path), include_shards=True)
+        fold_shard_dbs(csv_path, journal)
+    pending = len(journal)
+    if not pending:
+        print("Journal is empty, nothing to merge")
+        return
+    print(f"Merging {pending:,} journaled videos into {csv_path.name}...")
+    start = time.time()
+    with METRICS.checkpoint('api-merge'):
+        rows = journal.merge_into_csv(csv_path)
+    print(f"  ✓ Updated {rows:,} rows in {time.time() - start:.1f}s")
+
+
+def fold_shard_dbs(csv_path: Path, journal: ResultsJournal):
+    """Fold every shard's stats cache entries and failure records into the shared SQLite file, then delete them."""
+    dbs = shard_db_paths(csv_path)
+    if not dbs:
+        return
+    with StatsCache() as cache, FailureTable(cache.path) as failures:
+        for db in dbs:
+            cached = cache.copy_from(db)
+            failed = failures.copy_from(db)
+            print(f"  {db.name}: {cached:,} cached videos, {failed:,} failure records folded into {cache.path.name}")
+        # Videos the shards have fetched since they failed: drop their old failure rows
+        failures.record_successes(v for v, stats in journal.load().items() if stats.get('Views') != -1)
+    for db in dbs:
+        for path in (db, db.with_name(db.name + '-wal'), db.with_name(db.name + '-shm')):
+            if path.exists():
+                path.unlink()
 
 
 if __name__ == "__main__":
-    update_all_in_one_with_api()
+    parser = argparse.ArgumentParser(description='Update all_in_one.csv with YouTube Data API v3 statistics')
+    parser.add_argument('--concurrent', action='store_true',
+                        help='Keep several batch requests in flight over a pooled session')
+    parser.add_argument('--workers', type=int, default=CONCURRENT_WORKERS,
+                        help=f'Concurrent batch requests (default: {CONCURRENT_WORKERS})')
+    parser.add_argument('--max-rps', type=float, default=MAX_REQUESTS_PER_SEC,
+                        help=f'Max API requests per second in concurrent mode (default: {MAX_REQUESTS_PER_SEC:g})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Bypass the shared videoID stats cache')
+    parser.add_argument('--budget', type=int, default=DEFAULT_BUDGET,
+                        help=f'API units to spend per quota day for the API key (default: {DEFAULT_BUDGET}); '
+                             f'with --shard K/N each shard spends budget // N')
+    parser.add_argument('--csv', type=Path, default=ALL_IN_ONE_CSV,
+                        help='CSV to update (default: All_data/all_in_one.csv)')
+    parser.add_argument('--merge-journal', action='store_true',
+                        help='Only merge pending journaled results (all shards) into the CSV, then exit')
+    parser.add_argument('--shard', type=parse_shard, default=None, metavar='K/N',
+                        help='Fetch only the videoIDs of shard K (0-based) of N; journal without '
+                             'writing the CSV. --budget is split evenly across the N shards')
+    parser.add_argument('--metrics-file', type=Path, default=DEFAULT_METRICS_PATH or None,
+                        help='Flush a JSON metrics snapshot here periodically (env YOUTUBE_METRICS_FILE)')
+    parser.add_argument('--metrics-port', type=int, default=DEFAULT_METRICS_PORT,
+                        help='Serve Prometheus text metrics on this local port (env YOUTUBE_METRICS_PORT)')
+    parser.add_argument('--lean', action='store_true', default=LEAN_MODE,
+                        help='Request only channelId/publishedAt/counts via the fields selector, gzipped '
+                             '(env YOUTUBE_API_LEAN=1)')
+    args = parser.parse_args()
+    
+    if args.merge_journal:
+        merge_journal(args.csv)
+        sys.exit(0)
+    
+    with MetricsExporter(args.metrics_file, args.metrics_port):
+        update_all_in_one_with_api(concurrent=args.concurrent, workers=args.workers, max_rps=args.max_rps,
+                                   use_cache=not args.no_cache, budget=args.budget, csv_path=args.csv,
+                                   shard=args.shard, lean=args.lean)
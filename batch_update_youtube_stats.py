@@ -6,15 +6,28 @@ Uses yt-dlp with exponential backoff and resilient error handling.
 
 import os
 import sys
+import argparse
+import multiprocessing
+import queue
 import pandas as pd
 import time
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional, Tuple
 import json
 import yt_dlp
 from socket import timeout as socket_timeout
 from urllib.error import URLError
 
+from enrichment_metrics import DEFAULT_METRICS_PATH, DEFAULT_METRICS_PORT, METRICS, MetricsExporter
+from id_codec import IdSet
+from missing_scan import scan_missing_work
+from rate_controller import BOT, ERROR, OK, TIMEOUT, UNAVAILABLE, AdaptiveRateController, classify_error
+from retry_schedule import FailureTable
+from stats_apply import STAT_COLS, apply_stats
+from stats_cache import StatsCache
+import table_schema
+from video_index import VideoIndex
+
 # Ensure UTF-8 output handling for emojis and special characters
 if sys.stdout.encoding != 'utf-8':
     import io
@@ -26,6 +39,29 @@ BASE_SLEEP = float(os.getenv("YOUTUBE_SLEEP", "0.2"))  # base delay between requ
 SAVE_EVERY = int(os.getenv("YOUTUBE_SAVE_EVERY", "500"))  # flush to CSV every N fetches
 MAX_RETRIES = 3  # retries per video on timeout/connection error
 BACKOFF_FACTOR = 1.5  # exponential backoff multiplier
+WORKERS = int(os.getenv("YOUTUBE_WORKERS", "1"))  # >1 enables the process-pool mode
+WORKER_SLEEP = float(os.getenv("YOUTUBE_WORKER_SLEEP", str(BASE_SLEEP)))  # delay after each fetch, per worker
+MIN_SLEEP = float(os.getenv("YOUTUBE_MIN_SLEEP", "0.0"))  # fastest pacing the adaptive mode may reach
+MAX_SLEEP = float(os.getenv("YOUTUBE_MAX_SLEEP", "60"))  # slowest pacing the adaptive mode backs off to
+
+YDL_OPTS = {
+    'quiet': True,
+    'no_warnings': True,
+    'skip_download': True,
+    'socket_timeout': 10,  # 10 second timeout
+    'http_chunk_size': 1024 * 1024,  # 1MB chunks for slow connections
+}
+
+# Long-lived extractor, created on first use (one per process in pool mode)
+_ydl = None
+
+
+def _get_ydl() -> yt_dlp.YoutubeDL:
+    """Return this process's YoutubeDL instance, creating it once."""
+    global _ydl
+    if _ydl is None:
+        _ydl = yt_dlp.YoutubeDL(YDL_OPTS)
+    return _ydl
 
 
 def get_video_stats(video_id: str, retry_count: int = 0) -> Optional[Dict]:
@@ -39,20 +75,23 @@ def get_video_stats(video_id: str, retry_count: int = 0) -> Optional[Dict]:
     Returns:
         Dictionary with video statistics or None if all retries fail
     """
+    return fetch_video_stats(video_id, retry_count)[0]
+
+
+def fetch_video_stats(video_id: str, retry_count: int = 0) -> Tuple[Optional[Dict], str]:
+    """
+    Like get_video_stats, but also return the outcome class
+    (ok / unavailable / timeout / bot / error) used for adaptive pacing.
+    Every attempt is recorded in METRICS (latency and outcome).
+    """
+    start = time.perf_counter()
     try:
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-            'skip_download': True,
-            'socket_timeout': 10,  # 10 second timeout
-            'http_chunk_size': 1024 * 1024,  # 1MB chunks for slow connections
-        }
-        
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(f'https://www.youtube.com/watch?v={video_id}', download=False)
+        # Reuse one YoutubeDL per process instead of paying extractor setup per video
+        info = _get_ydl().extract_info(f'https://www.youtube.com/watch?v={video_id}', download=False)
         
         if not info:
-            return None
+            METRICS.observe_request('yt-dlp', time.perf_counter() - start, UNAVAILABLE)
+            return None, UNAVAILABLE
         
         # Convert upload_date YYYYMMDD to ISO format
         upload_date = info.get('upload_date', '')
@@ -61,62 +100,161 @@ def get_video_stats(video_id: str, retry_count: int = 0) -> Optional[Dict]:
         else:
             published = ''
         
+        METRICS.observe_request('yt-dlp', time.perf_counter() - start, OK)
         return {
             'channelID': info.get('channel_id', ''),
             'Views': int(info.get('view_count', 0)) if info.get('view_count') else 0,
             'Published': published,
             'likes': int(info.get('like_count', 0)) if info.get('like_count') else 0,
             'comments': int(info.get('comment_count', 0)) if info.get('comment_count') else 0
-        }
+        }, OK
         
     except (socket_timeout, URLError, ConnectionError, TimeoutError) as e:
+        METRICS.observe_request('yt-dlp', time.perf_counter() - start, TIMEOUT)
         # Transient network errors: retry with exponential backoff
         if retry_count < MAX_RETRIES:
             wait = BASE_SLEEP * (BACKOFF_FACTOR ** retry_count)
             print(f"  [Retry {retry_count+1}/{MAX_RETRIES}] {video_id}: {type(e).__name__}, waiting {wait:.1f}s...")
             time.sleep(wait)
-            return get_video_stats(video_id, retry_count=retry_count + 1)
+            return fetch_video_stats(video_id, retry_count=retry_count + 1)
         else:
             print(f"  [Max retries exhausted] {video_id}: {type(e).__name__}")
-            # After max retries, mark as -1 (assume unreachable)
-            return {
-                'channelID': '-1',
-                'Views': -1,
-                'Published': '-1',
-                'likes': -1,
-                'comments': -1
-            }
+            # A network failure says nothing about the video: leave it unfetched
+            # and let the failure table schedule the next attempt
+            return None, TIMEOUT
     
     except Exception as e:
-        # All other errors (video unavailable, private, etc.): mark as -1
         error_msg = str(e)
+        outcome = classify_error(error_msg)
+        METRICS.observe_request('yt-dlp', time.perf_counter() - start, outcome)
+        
+        # Bot detection says nothing about the video: leave it unfetched, not -1
+        if outcome == BOT:
+            print(f"  [Bot Detected] {video_id} - backing off")
+            return None, BOT
+        
         if len(error_msg) > 100:
             error_msg = error_msg[:100] + "..."
+        label = 'Unavailable' if outcome == UNAVAILABLE else 'Error'
         try:
-            print(f"  [Unavailable] {video_id}: {error_msg}")
+            print(f"  [{label}] {video_id}: {error_msg}")
         except (UnicodeEncodeError, UnicodeDecodeError):
             # Handle emoji or special character encoding issues in error messages
-            print(f"  [Unavailable] {video_id}: <encoding issue in error message>")
+            print(f"  [{label}] {video_id}: <encoding issue in error message>")
         
-        # Return -1 values for unavailable videos
+        # Throttling (429), server errors and unrecognized failures say nothing
+        # about the video either: leave it unfetched for a later retry
+        if outcome == ERROR:
+            return None, ERROR
+        
+        # Private/deleted/unavailable videos: mark as -1
         return {
             'channelID': '-1',
             'Views': -1,
             'Published': '-1',
             'likes': -1,
             'comments': -1
-        }
+        }, UNAVAILABLE
+
+
+def _init_worker(worker_sleep: float):
+    """Pool initializer: build this worker's long-lived YoutubeDL and store its pacing."""
+    global WORKER_SLEEP
+    METRICS.reset()  # start from zero, not from the parent's counters inherited on fork
+    WORKER_SLEEP = worker_sleep
+    _get_ydl()
 
 
-def update_csv_with_youtube_stats(csv_path: Path):
+def _worker_fetch(video_id: str) -> Tuple[str, Optional[Dict], str, dict]:
+    """Fetch one video inside a pool worker, then pause WORKER_SLEEP; ship the worker's metrics back."""
+    stats, outcome = fetch_video_stats(video_id)
+    time.sleep(WORKER_SLEEP)
+    return video_id, stats, outcome, METRICS.pop_state()
+
+
+def make_controller(workers: int = 1) -> AdaptiveRateController:
+    """Adaptive pacing starting at BASE_SLEEP, bounded by MIN_SLEEP/MAX_SLEEP."""
+    return AdaptiveRateController(initial_delay=BASE_SLEEP, min_delay=MIN_SLEEP,
+                                  max_delay=MAX_SLEEP, max_concurrency=workers,
+                                  step=max(0.05, BASE_SLEEP / 4))
+
+
+def iter_video_stats(video_ids: list, workers: int = WORKERS, worker_sleep: float = WORKER_SLEEP,
+                     controller: Optional[AdaptiveRateController] = None
+                     ) -> Iterator[Tuple[str, Optional[Dict], str]]:
+    """
+    Yield (video_id, stats, outcome) for each ID.
+    With one worker, fetches serially in this process with BASE_SLEEP between
+    requests. With more, a process pool pulls IDs from a shared task queue and
+    streams results back in completion order.
+    With a controller, its delay replaces the fixed sleeps and, in pool mode,
+    its concurrency caps how many videos are in flight.
+    """
+    if workers <= 1:
+        for video_id in video_ids:
+            stats, outcome = fetch_video_stats(video_id)
+            yield video_id, stats, outcome
+            
+            # Rate limiting (base sleep per request, or adaptive delay)
+            if controller is not None:
+                controller.record(outcome)
+                controller.wait()
+            else:
+                time.sleep(BASE_SLEEP)
+        return
+    
+    if controller is None:
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(worker_sleep,)) as pool:
+            for video_id, stats, outcome, worker_metrics in pool.imap_unordered(_worker_fetch, video_ids, chunksize=1):
+                METRICS.merge_state(worker_metrics)
+                yield video_id, stats, outcome
+        return
+    
+    # Adaptive pool: the parent dispatches one ID per controller delay and keeps
+    # at most controller.concurrency in flight; workers do not sleep themselves
+    done = queue.Queue()
+    ids = iter(video_ids)
+    in_flight = 0
+    exhausted = False
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(0.0,)) as pool:
+        while True:
+            while not exhausted and in_flight < controller.concurrency:
+                video_id = next(ids, None)
+                if video_id is None:
+                    exhausted = True
+                    break
+                pool.apply_async(_worker_fetch, (video_id,), callback=done.put,
+                                 error_callback=lambda e, vid=video_id: done.put((vid, None, 'error', None)))
+                in_flight += 1
+                controller.wait()
+            if in_flight == 0:
+                break
+            video_id, stats, outcome, worker_metrics = done.get()
+            in_flight -= 1
+            if worker_metrics:
+                METRICS.merge_state(worker_metrics)
+            controller.record(outcome)
+            yield video_id, stats, outcome
+
+
+def update_csv_with_youtube_stats(csv_path: Path, cache: Optional[StatsCache] = None,
+                                  workers: int = WORKERS, worker_sleep: float = WORKER_SLEEP,
+                                  adaptive: bool = False):
     """
     Update a CSV file with YouTube statistics for all videoIDs.
+    
+    Args:
+        csv_path: CSV file to update in place
+        cache: Shared stats cache consulted before fetching and updated after
+        workers: Worker processes fetching in parallel (1 = serial loop)
+        worker_sleep: Delay after each fetch within a worker (pool mode)
+        adaptive: Pace requests with the AIMD controller instead of fixed sleeps
     """
     print(f"\nProcessing: {csv_path.name}")
     
     try:
         # Read CSV
-        df = pd.read_csv(csv_path, dtype={'category': str, 'original_title': str})
+        df = table_schema.read_csv(csv_path)
         
         # Check if videoID column exists
         if 'videoID' not in df.columns:
@@ -147,55 +285,56 @@ def update_csv_with_youtube_stats(csv_path: Path):
             return
         
         print(f"  Found {total_videos} unique videoIDs")
-        print(f"  Fetching stats using yt-dlp with exponential backoff...")
         
-        # Fetch stats for each unique videoID
+        # Fill videos already fetched by any updater from the shared cache
+        if cache is not None:
+            cached = cache.get_many(str(v).strip() for v in unique_videos)
+            if cached:
+                apply_stats(df, cached)
+                df.to_csv(csv_path, index=False)
+                unique_videos = [v for v in unique_videos if str(v).strip() not in cached]
+                total_videos = len(unique_videos)
+                print(f"  {len(cached)} served from stats cache, {total_videos} left to fetch")
+                if total_videos == 0:
+                    return
+        
+        video_ids = [str(v).strip() for v in unique_videos if not pd.isna(v) and str(v).strip() != '']
+        total_videos = len(video_ids)
+        if workers > 1:
+            print(f"  Fetching stats using {workers} yt-dlp worker processes ({worker_sleep}s pacing each)...")
+        else:
+            print(f"  Fetching stats using yt-dlp with exponential backoff...")
+        
+        # Fetch stats for each unique videoID; results stream back for checkpointing
         stats_cache = {}
         successful = 0
-        for idx, video_id in enumerate(unique_videos, 1):
-            if pd.isna(video_id) or str(video_id).strip() == '':
-                continue
-            
-            video_id = str(video_id).strip()
-            
+        controller = make_controller(workers) if adaptive else None
+        for idx, (video_id, stats, _) in enumerate(iter_video_stats(video_ids, workers, worker_sleep, controller), 1):
             # Progress indicator
             if idx % 50 == 0 or idx == total_videos:
-                print(f"    Progress: {idx}/{total_videos} ({idx/total_videos*100:.1f}%) - Successful: {successful}")
+                print(f"    Progress: {idx}/{total_videos} ({idx/total_videos*100:.1f}%) - Successful: {successful}"
+                      + (f" - {controller}" if controller else ""))
             
-            # Fetch stats (with built-in retry logic)
-            stats = get_video_stats(video_id)
             if stats:
                 stats_cache[video_id] = stats
                 successful += 1
+                if cache is not None:
+                    cache.put_many({video_id: stats}, source='yt-dlp')
             
             # Flush periodically to avoid losing progress
             if idx % SAVE_EVERY == 0 or idx == total_videos:
                 if stats_cache:
-                    for vid, s in stats_cache.items():
-                        mask = df['videoID'] == vid
-                        df.loc[mask, 'channelID'] = s['channelID']
-                        df.loc[mask, 'Views'] = s['Views']
-                        df.loc[mask, 'Published'] = s['Published']
-                        df.loc[mask, 'likes'] = s['likes']
-                        df.loc[mask, 'comments'] = s['comments']
-                    df.to_csv(csv_path, index=False)
+                    with METRICS.checkpoint('yt-dlp'):
+                        apply_stats(df, stats_cache)
+                        df.to_csv(csv_path, index=False)
                     print(f"    ✓ Saved checkpoint at {idx}/{total_videos} (batch: {len(stats_cache)} videos)")
                     stats_cache.clear()
-            
-            # Rate limiting (base sleep per request)
-            time.sleep(BASE_SLEEP)
         
         print(f"\n  Successfully fetched: {successful}/{total_videos}")
         
         # Final save if anything pending (should be empty)
         if stats_cache:
-            for vid, s in stats_cache.items():
-                mask = df['videoID'] == vid
-                df.loc[mask, 'channelID'] = s['channelID']
-                df.loc[mask, 'Views'] = s['Views']
-                df.loc[mask, 'Published'] = s['Published']
-                df.loc[mask, 'likes'] = s['likes']
-                df.loc[mask, 'comments'] = s['comments']
+            apply_stats(df, stats_cache)
             df.to_csv(csv_path, index=False)
             print(f"  ✓ Saved final checkpoint")
         
@@ -205,9 +344,83 @@ def update_csv_with_youtube_stats(csv_path: Path):
         print(f"  Error processing file: {e}")
 
 
-def main():
+def plan_missing_ids(csv_files: list, failures: Optional[FailureTable] = None) -> Dict[Path, IdSet]:
+    """
+    Scan each CSV (videoID and stat columns only, see missing_scan) and
+    return, per file, the set of videoIDs that still miss at least one stat.
+    With a failure table, -1 rows whose retry is due are planned as well,
+    and IDs still backing off are left out even when their cells are empty
+    (bot checks and timeouts write nothing to the CSV).
+    The sets are IdSets (8 bytes per ID) rather than sets of str.
+    """
+    plan = {}
+    failed = {}
+    for csv_path in csv_files:
+        try:
+            header = pd.read_csv(csv_path, nrows=0).columns
+            if 'videoID' not in header:
+                print(f"  {csv_path.name}: skipping (no videoID column)")
+                continue
+            work = scan_missing_work(csv_path)
+        except Exception as e:
+            print(f"  {csv_path.name}: Error processing file: {e}")
+            continue
+        missing_ids = IdSet(work.missing)
+        plan[csv_path] = missing_ids
+        failed[csv_path] = IdSet(work.failed)
+        print(f"  {csv_path.name}: {len(missing_ids):,} videoIDs missing stats")
+    
+    if failures is not None and plan:
+        # -1 rows with no failure record predate the retry table: retry them once now
+        failures.seed_legacy(IdSet.union_all(failed.values()), source='yt-dlp')
+        due = IdSet(failures.due(source='yt-dlp'))
+        waiting = IdSet(failures.waiting(source='yt-dlp'))
+        for csv_path, missing_ids in plan.items():
+            retry = failed[csv_path] & due
+            backing_off = missing_ids & waiting
+            if retry or backing_off:
+                plan[csv_path] = (missing_ids - backing_off) | retry
+            if retry:
+                print(f"  {csv_path.name}: {len(retry):,} previously failed videoIDs due for a retry")
+            if backing_off:
+                print(f"  {csv_path.name}: {len(backing_off):,} missing videoIDs skipped until their retry is due")
+    return plan
+
+
+def fan_out_results(plan: Dict[Path, IdSet], results: Dict[str, Dict]):
+    """
+    Write results into every planned file that needs them. Files that already
+    have the stat columns are patched through their videoID index (only the
+    affected rows are rewritten); others get one read/write pass.
+    """
+    fetched = IdSet(results)
+    for csv_path, missing_ids in plan.items():
+        file_results = {vid: results[vid] for vid in missing_ids & fetched}
+        if not file_results:
+            print(f"  {csv_path.name}: nothing to write")
+            continue
+        try:
+            with METRICS.checkpoint('yt-dlp'):
+                if set(STAT_COLS) <= set(pd.read_csv(csv_path, nrows=0).columns):
+                    updates = {vid: {c: stats.get(c) for c in STAT_COLS} for vid, stats in file_results.items()}
+                    rows = VideoIndex.open(csv_path).patch_rows(updates)
+                    METRICS.observe_rows(rows)
+                else:
+                    df = table_schema.read_csv(csv_path)
+                    rows = apply_stats(df, file_results)
+                    df.to_csv(csv_path, index=False)
+        except Exception as e:
+            # The results are in the stats cache, so the next run still applies them
+            print(f"  {csv_path.name}: Error processing file: {e}")
+            continue
+        print(f"  ✓ {csv_path.name}: {len(file_results):,} videos, {rows:,} rows updated")
+
+
+def main(workers: int = WORKERS, worker_sleep: float = WORKER_SLEEP, adaptive: bool = False):
     """
     Process all CSV files in All_data folder.
+    The derived files share most of their videoIDs, so the union of missing
+    IDs is fetched once and the results are fanned out to every file.
     """
     all_data_folder = Path(r"c:\Users\Sahar\Desktop\Clickbait_git\Clickbait-project\All_data")
     
@@ -227,8 +440,52 @@ def main():
     
     start_time = time.time()
     
-    for csv_file in csv_files:
-        update_csv_with_youtube_stats(csv_file)
+    with StatsCache() as cache, FailureTable(cache.path) as failures:
+        print(f"Stats cache: {cache.path} ({len(cache):,} videos)")
+        
+        # Plan: union of missing videoIDs (plus failed ones due for a retry) across all files
+        print("\nPlanning: scanning files for missing stats...")
+        plan = plan_missing_ids(csv_files, failures)
+        all_missing = IdSet.union_all(plan.values())
+        per_file_total = sum(len(ids) for ids in plan.values())
+        print(f"  {len(all_missing):,} unique videoIDs across files "
+              f"({per_file_total:,} per-file fetches without deduplication)")
+        
+        results = cache.get_many(all_missing)
+        failures.record_successes(results)
+        to_fetch = (all_missing - IdSet(results)).tolist()  # sorted
+        print(f"  {len(results):,} served from stats cache, {len(to_fetch):,} to fetch")
+        
+        # Fetch each videoID once; every result is persisted to the cache as it arrives
+        if to_fetch:
+            if workers > 1:
+                print(f"\nFetching with {workers} yt-dlp worker processes ({worker_sleep}s pacing each)...")
+            else:
+                print(f"\nFetching stats using yt-dlp with exponential backoff...")
+            controller = make_controller(workers) if adaptive else None
+            successful = 0
+            try:
+                for idx, (video_id, stats, outcome) in enumerate(iter_video_stats(to_fetch, workers, worker_sleep, controller), 1):
+                    if stats:
+                        results[video_id] = stats
+                        cache.put_many({video_id: stats}, source='yt-dlp')
+                    if outcome == OK:
+                        failures.record_successes([video_id])
+                        successful += 1
+                    else:
+                        failures.record_failures([video_id], reason=outcome, source='yt-dlp')
+                    if idx % 50 == 0 or idx == len(to_fetch):
+                        print(f"    Progress: {idx}/{len(to_fetch)} ({idx/len(to_fetch)*100:.1f}%) - Successful: {successful}"
+                              + (f" - {controller}" if controller else ""))
+            except KeyboardInterrupt:
+                print("\n⚠️  Interrupted - writing results fetched so far")
+        
+        # Fan out: one write pass per file
+        print("\nWriting results to files...")
+        fan_out_results(plan, results)
+        
+        retry = failures.summary()
+        print(f"  Failure table: {retry['by_reason'] or 'empty'} ({retry['due']:,} due now)")
     
     elapsed = time.time() - start_time
     print("\n" + "="*70)
@@ -237,4 +494,19 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description='Update All_data CSVs with YouTube stats via yt-dlp')
+    parser.add_argument('--workers', type=int, default=WORKERS,
+                        help=f'Worker processes, each with its own YoutubeDL (default: {WORKERS}, 1 = serial)')
+    parser.add_argument('--worker-sleep', type=float, default=WORKER_SLEEP,
+                        help=f'Seconds each worker waits after a fetch (default: {WORKER_SLEEP})')
+    parser.add_argument('--adaptive', action='store_true',
+                        help=f'AIMD pacing: speed up while fetches succeed, back off on errors/bot checks '
+                             f'(delay bounds {MIN_SLEEP}-{MAX_SLEEP}s, concurrency up to --workers)')
+    parser.add_argument('--metrics-file', type=Path, default=DEFAULT_METRICS_PATH or None,
+                        help='Flush a JSON metrics snapshot here periodically (env YOUTUBE_METRICS_FILE)')
+    parser.add_argument('--metrics-port', type=int, default=DEFAULT_METRICS_PORT,
+                        help='Serve Prometheus text metrics on this local port (env YOUTUBE_METRICS_PORT)')
+    args = parser.parse_args()
+    
+    with MetricsExporter(args.metrics_file, args.metrics_port):
+        main(workers=args.workers, worker_sleep=args.worker_sleep, adaptive=args.adaptive)
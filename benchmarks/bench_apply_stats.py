@@ -0,0 +1,102 @@
+"""
+Benchmark: vectorized apply_stats vs the per-video df.loc[mask] loop.
+Builds a synthetic all_in_one-shaped frame (default 1M rows) and applies
+stats for N updated videos (default 5k). The loop is timed on a sample of
+videos and extrapolated unless --full is given (the full loop takes minutes).
+
+Usage:
+    python benchmarks/bench_apply_stats.py [--rows 1000000] [--videos 5000] [--full]
+"""
+
+import argparse
+import string
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from stats_apply import STAT_COLS, apply_stats  # noqa: E402
+
+ID_ALPHABET = np.array(list(string.ascii_letters + string.digits + '-_'))
+
+
+def random_video_ids(n: int, rng: np.random.Generator) -> np.ndarray:
+    chars = ID_ALPHABET[rng.integers(0, len(ID_ALPHABET), size=(n, 11))]
+    return chars.view('<U11').ravel()
+
+
+def make_frame(rows: int, unique_videos: int, rng: np.random.Generator) -> pd.DataFrame:
+    ids = random_video_ids(unique_videos, rng)
+    df = pd.DataFrame({
+        'videoID': ids[rng.integers(0, unique_videos, size=rows)],
+        'title': 'some submitted title text',
+    })
+    for col in STAT_COLS:
+        df[col] = pd.Series([pd.NA] * rows, dtype=object)
+    return df
+
+
+def make_results(video_ids: np.ndarray) -> dict:
+    return {
+        vid: {'channelID': f'UC{i:022d}', 'Views': i * 10, 'Published': '2024-01-01',
+              'likes': i, 'comments': i % 100}
+        for i, vid in enumerate(video_ids)
+    }
+
+
+def loop_apply(df: pd.DataFrame, results: dict):
+    """The original per-video loop used by the updaters."""
+    for vid, s in results.items():
+        mask = df['videoID'] == vid
+        df.loc[mask, 'channelID'] = s['channelID']
+        df.loc[mask, 'Views'] = s['Views']
+        df.loc[mask, 'Published'] = s['Published']
+        df.loc[mask, 'likes'] = s['likes']
+        df.loc[mask, 'comments'] = s['comments']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark vectorized stats application')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--videos', type=int, default=5_000, help='Updated videos per checkpoint')
+    parser.add_argument('--unique', type=int, default=200_000, help='Distinct videoIDs in the frame')
+    parser.add_argument('--loop-sample', type=int, default=100, help='Videos timed for the loop estimate')
+    parser.add_argument('--full', action='store_true', help='Run the loop over all updated videos')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"Building frame: {args.rows:,} rows, {args.unique:,} unique videoIDs...")
+    df = make_frame(args.rows, args.unique, rng)
+    updated = rng.choice(df['videoID'].unique(), size=args.videos, replace=False)
+    results = make_results(updated)
+
+    vec_df = df.copy()
+    start = time.perf_counter()
+    rows = apply_stats(vec_df, results)
+    vec_time = time.perf_counter() - start
+    print(f"apply_stats: {vec_time:.3f}s ({rows:,} rows updated)")
+
+    loop_df = df.copy()
+    if args.full:
+        start = time.perf_counter()
+        loop_apply(loop_df, results)
+        loop_time = time.perf_counter() - start
+        print(f"loop:        {loop_time:.3f}s")
+        same = loop_df[STAT_COLS].astype(str).equals(vec_df[STAT_COLS].astype(str))
+        print(f"Outputs identical: {same}")
+    else:
+        sample = dict(list(results.items())[:args.loop_sample])
+        start = time.perf_counter()
+        loop_apply(loop_df, sample)
+        sample_time = time.perf_counter() - start
+        loop_time = sample_time / len(sample) * len(results)
+        print(f"loop:        {loop_time:.3f}s (extrapolated from {len(sample)} videos in {sample_time:.3f}s)")
+
+    print(f"Speedup: {loop_time / vec_time:.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark: Data API enrichment throughput against the local fake API.
+Generates a synthetic all_in_one.csv (stats columns empty), starts
+fake_youtube_api on a local port and runs batch_update_with_api's
+update_all_in_one_with_api in serial and concurrent mode, each with full or
+lean (`fields` selector + gzip) responses. Each run happens in a fresh
+process with its own cache/ledger/journal, so peak RSS is per run.
+
+Reports videos/sec, response bytes per video, checkpoint (journal) cost,
+final merge time, total wall time and peak memory. The yt-dlp updaters scrape watch pages rather than
+this endpoint, so they are not covered here.
+
+Usage:
+    python benchmarks/bench_enrichment.py --rows 100000 1000000 --modes serial concurrent concurrent-lean
+"""
+
+import argparse
+import multiprocessing
+import os
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from fake_youtube_api import start_server  # noqa: E402
+
+ID_ALPHABET = np.array(list(string.ascii_letters + string.digits + '-_'))
+
+
+def make_synthetic_csv(path: Path, rows: int, seed: int = 0):
+    """all_in_one-shaped CSV with ~2 rows per videoID and empty stat columns."""
+    rng = np.random.default_rng(seed)
+    unique = max(1, rows // 2)
+    ids = ID_ALPHABET[rng.integers(0, len(ID_ALPHABET), size=(unique, 11))].view('<U11').ravel()
+    df = pd.DataFrame({
+        'videoID': ids[rng.integers(0, unique, size=rows)],
+        'title': np.where(rng.random(rows) < 0.5, 'A synthetic submitted title, with a comma', ''),
+        'title/thumbnail': np.where(rng.random(rows) < 0.7, 'title', 'thumbnail'),
+        'original_title': 'The ORIGINAL title!!! You will not believe this',
+        'category': rng.choice(['', 'clickbait', 'informative'], size=rows),
+        'timeSubmitted': rng.integers(1_600_000_000_000, 1_730_000_000_000, size=rows),
+        'nb_submissions': rng.integers(1, 10, size=rows),
+    })
+    for col in ['channelID', 'Views', 'Published', 'likes', 'comments']:
+        df[col] = ''
+    df.to_csv(path, index=False)
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss survives exec on Linux (it would report the parent's peak), VmHWM does not
+    try:
+        with open('/proc/self/status') as fh:
+            for line in fh:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return float('nan')
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def _run_child(csv_path: str, base_url: str, mode: str, workers: int, max_rps: float,
+               sleep, workdir: str, out: multiprocessing.Queue):
+    os.environ['YOUTUBE_STATS_CACHE'] = str(Path(workdir) / 'cache.sqlite')
+    os.environ['YOUTUBE_QUOTA_LEDGER'] = str(Path(workdir) / 'ledger.json')
+    import io
+    import contextlib
+    import batch_update_with_api as api
+
+    api.YOUTUBE_API_KEY = 'benchmark'
+    api.API_BASE_URL = base_url
+    if sleep is not None:
+        api.SLEEP_PER_REQUEST = sleep
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        summary = api.update_all_in_one_with_api(
+            concurrent=mode.startswith('concurrent'), workers=workers, max_rps=max_rps,
+            use_cache=False, budget=10**9, csv_path=Path(csv_path), lean=mode.endswith('-lean'))
+    wall = time.perf_counter() - start
+    out.put({**(summary or {}), 'wall': wall, 'peak_rss_mb': _peak_rss_mb()})
+
+
+def run_scenario(rows: int, mode: str, base_url: str, args) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = Path(workdir) / 'all_in_one.csv'
+        make_synthetic_csv(csv_path, rows)
+        ctx = multiprocessing.get_context('spawn')
+        out = ctx.Queue()
+        proc = ctx.Process(target=_run_child, args=(
+            str(csv_path), base_url, mode, args.workers, args.max_rps, args.sleep, workdir, out))
+        proc.start()
+        result = out.get()
+        proc.join()
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Data API enrichment against a local fake API')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--modes', nargs='+', default=['serial', 'concurrent', 'concurrent-lean'],
+                        choices=['serial', 'concurrent', 'serial-lean', 'concurrent-lean'])
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--max-rps', type=float, default=100.0)
+    parser.add_argument('--sleep', type=float, default=None,
+                        help='Override SLEEP_PER_REQUEST for the serial loop')
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--missing-rate', type=float, default=0.02)
+    args = parser.parse_args()
+
+    server, config, base_url = start_server(latency=args.latency, error_rate=args.error_rate,
+                                            missing_rate=args.missing_rate)
+    print(f"Fake API at {base_url} (latency {args.latency}s, errors {args.error_rate:.0%}, "
+          f"missing {args.missing_rate:.0%})\n")
+    print(f"{'rows':>10} {'mode':>15} {'videos':>9} {'vid/s':>8} {'B/video':>8} {'checkpoint s':>13} "
+          f"{'merge s':>8} {'wall s':>8} {'peak MB':>8}")
+    try:
+        for rows in args.rows:
+            for mode in args.modes:
+                r = run_scenario(rows, mode, base_url, args)
+                rate = r['videos'] / r['fetch_elapsed'] if r.get('fetch_elapsed') else 0.0
+                per_video = r['response_bytes'] / r['videos'] if r.get('videos') else 0.0
+                print(f"{rows:>10,} {mode:>15} {r.get('videos', 0):>9,} {rate:>8.1f} {per_video:>8.0f} "
+                      f"{r.get('checkpoint_time', 0):>13.3f} {r.get('merge_time', 0):>8.2f} "
+                      f"{r['wall']:>8.1f} {r['peak_rss_mb']:>8.0f}")
+    finally:
+        server.shutdown()
+    print(f"\nFake API served {config.requests:,} requests, {config.bytes_sent/1e6:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
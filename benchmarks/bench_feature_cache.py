@@ -0,0 +1,69 @@
+"""
+Benchmark: ClickbaitDataProcessor text features + language detection on a
+title column where titles repeat (as in all_in_one, one row per submission
+or vote), without a feature cache, with a cold cache file, rerun by a new
+processor on the warm files, and again in the same processor (tables
+already in memory). Every cached result is compared with the uncached one.
+
+Usage:
+    python benchmarks/bench_feature_cache.py --rows 1000000 --distinct 200000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'EDA'))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+from data_processor import ClickbaitDataProcessor  # noqa: E402
+from feature_cache import FeatureCache  # noqa: E402
+from bench_text_features import make_titles  # noqa: E402
+
+
+def run(processor: ClickbaitDataProcessor, titles: pd.Series):
+    """(features, languages, seconds)."""
+    start = time.perf_counter()
+    features = processor.extract_text_features_batch(titles)
+    languages = processor.add_language_detection(pd.DataFrame({'title': titles}))
+    return features, languages, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the persistent title feature cache')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--distinct', type=int, default=200_000)
+    args = parser.parse_args()
+
+    distinct = make_titles(args.distinct)
+    rng = np.random.default_rng(1)
+    titles = pd.Series(distinct.to_numpy()[rng.integers(0, args.distinct, size=args.rows)], dtype='str')
+    print(f"{args.rows:,} rows, {args.distinct:,} distinct titles\n")
+    print(f"{'run':>28} {'seconds':>8}")
+
+    expected_features, expected_languages, seconds = run(ClickbaitDataProcessor(feature_cache=None), titles)
+    print(f"{'no cache':>28} {seconds:>8.2f}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = Path(workdir) / 'features'
+        first = ClickbaitDataProcessor(feature_cache=FeatureCache(path))
+        runs = [('cold file', first),
+                ('rerun (new processor)', ClickbaitDataProcessor(feature_cache=FeatureCache(path))),
+                ('same processor (memory)', first)]
+        for name, processor in runs:
+            features, languages, seconds = run(processor, titles)
+            pd.testing.assert_frame_equal(features, expected_features, check_exact=True)
+            pd.testing.assert_frame_equal(languages, expected_languages)
+            print(f"{name:>28} {seconds:>8.2f}")
+        size = sum(f.stat().st_size for f in path.glob('*.npz'))
+        print(f"\n✓ Identical output; cache files {size / 1e6:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
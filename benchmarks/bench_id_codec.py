@@ -0,0 +1,106 @@
+"""
+Benchmark: videoID sets and maps as Python str containers vs id_codec's
+uint64-backed IdSet/IdMap. Reports the memory held by each structure
+(tracemalloc, strings included for the str containers) and the time to
+build it, to test membership of as many IDs again, and to take a set
+difference the way the planners do (missing - cached).
+
+Usage:
+    python benchmarks/bench_id_codec.py --ids 2000000
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from id_codec import LAST_ALPHABET, IdMap, IdSet, decode_ids, encode_ids  # noqa: E402
+
+ID_ALPHABET = np.array(list('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_'))
+LAST = np.array(list(LAST_ALPHABET.decode()))
+
+
+def make_ids(count: int, seed: int = 0) -> np.ndarray:
+    """Random well-formed videoIDs (last character from the 16 YouTube uses)."""
+    rng = np.random.default_rng(seed)
+    head = ID_ALPHABET[rng.integers(0, len(ID_ALPHABET), size=(count, 10))].view('<U10').ravel()
+    return np.char.add(head, LAST[rng.integers(0, len(LAST), size=count)])
+
+
+def _measure(build):
+    """(result, seconds, MB allocated and still held by the result)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, held / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark str sets/dicts vs IdSet/IdMap')
+    parser.add_argument('--ids', type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    ids = make_ids(args.ids)
+    queries = np.concatenate([ids[::2], make_ids(args.ids // 2, seed=1)])
+    cached = ids[::3]
+
+    start = time.perf_counter()
+    codes, valid = encode_ids(ids)
+    encode_s = time.perf_counter() - start
+    start = time.perf_counter()
+    assert valid.all() and (decode_ids(codes) == ids).all()
+    decode_s = time.perf_counter() - start
+    print(f"{args.ids:,} IDs: encode {encode_s:.2f}s, decode+check {decode_s:.2f}s\n")
+    print(f"{'structure':>12} {'build s':>8} {'MB':>8} {'B/ID':>6} {'lookup s':>9} {'diff s':>7}")
+
+    as_set, build_s, mb = _measure(lambda: set(ids.tolist()))
+    query_list, cached_set = queries.tolist(), set(cached.tolist())
+    start = time.perf_counter()
+    hits = sum(v in as_set for v in query_list)
+    lookup_s = time.perf_counter() - start
+    start = time.perf_counter()
+    todo = sorted(as_set - cached_set)
+    diff_s = time.perf_counter() - start
+    print(f"{'set[str]':>12} {build_s:>8.2f} {mb:>8.1f} {mb * 1e6 / args.ids:>6.0f} {lookup_s:>9.2f} {diff_s:>7.2f}")
+    del as_set, query_list, cached_set
+
+    id_set, build_s, mb = _measure(lambda: IdSet(ids))
+    start = time.perf_counter()
+    assert int(id_set.contains(queries).sum()) == hits
+    lookup_s = time.perf_counter() - start
+    start = time.perf_counter()
+    assert (id_set - IdSet(cached)).tolist() == todo
+    diff_s = time.perf_counter() - start
+    print(f"{'IdSet':>12} {build_s:>8.2f} {mb:>8.1f} {mb * 1e6 / args.ids:>6.0f} {lookup_s:>9.2f} {diff_s:>7.2f}")
+    del id_set, todo
+
+    as_dict, build_s, mb = _measure(lambda: {v: i for i, v in enumerate(ids.tolist())})
+    start = time.perf_counter()
+    [as_dict.get(v, -1) for v in queries.tolist()]
+    lookup_s = time.perf_counter() - start
+    print(f"{'dict[str]':>12} {build_s:>8.2f} {mb:>8.1f} {mb * 1e6 / args.ids:>6.0f} {lookup_s:>9.2f} {'':>7}")
+    del as_dict
+
+    def build_map():
+        id_map = IdMap()
+        for i in range(0, len(ids), 100_000):  # chunk by chunk, like the scripts
+            id_map.add(ids[i:i + 100_000])
+        return id_map
+
+    id_map, build_s, mb = _measure(build_map)
+    start = time.perf_counter()
+    id_map.get(queries)
+    lookup_s = time.perf_counter() - start
+    print(f"{'IdMap':>12} {build_s:>8.2f} {mb:>8.1f} {mb * 1e6 / args.ids:>6.0f} {lookup_s:>9.2f} {'':>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: ClickbaitDataProcessor.get_summary_stats after the eager
+load_data (every column of the four deArrow tables) vs on a fresh processor
+whose tables are read lazily, only the columns the summary uses, from the
+CSVs and from the Parquet copies (parquet_store.py). Reports time, columns
+read and the memory held by the loaded frames; the summaries must match.
+
+Usage:
+    python benchmarks/bench_lazy_loading.py --videos 1000000
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'EDA'))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+import parquet_store  # noqa: E402
+from data_processor import ClickbaitDataProcessor  # noqa: E402
+from bench_training_pairs import make_dearrow_dir  # noqa: E402
+
+
+def run(processor: ClickbaitDataProcessor, eager: bool):
+    """(summary text, seconds, columns held, MB held)."""
+    out = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        if eager:
+            processor.load_data(verbose=False)
+        processor.get_summary_stats()
+    seconds = time.perf_counter() - start
+    frames = [f for f in processor._frames.values() if f is not None]
+    mb = sum(f.memory_usage(deep=True).sum() for f in frames) / 1e6
+    return out.getvalue(), seconds, sum(f.shape[1] for f in frames), mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark eager vs lazy column-selective loading')
+    parser.add_argument('--videos', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        data_dir = Path(workdir)
+        make_dearrow_dir(data_dir, args.videos)
+        print(f"{args.videos:,} videos\n")
+        print(f"{'load':>22} {'seconds':>8} {'columns':>8} {'MB':>8}")
+
+        expected, seconds, columns, mb = run(ClickbaitDataProcessor(data_dir, source='csv'), eager=True)
+        print(f"{'eager load_data (csv)':>22} {seconds:>8.2f} {columns:>8} {mb:>8.1f}")
+        summary, seconds, columns, mb = run(ClickbaitDataProcessor(data_dir, source='csv'), eager=False)
+        assert summary == expected
+        print(f"{'lazy (csv)':>22} {seconds:>8.2f} {columns:>8} {mb:>8.1f}")
+
+        if parquet_store.pa is not None:
+            for csv_path in data_dir.glob('*.csv'):
+                parquet_store.convert_csv(csv_path)
+            summary, seconds, columns, mb = run(ClickbaitDataProcessor(data_dir), eager=False)
+            assert summary == expected
+            print(f"{'lazy (parquet)':>22} {seconds:>8.2f} {columns:>8} {mb:>8.1f}")
+        print("\n✓ Identical summaries")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark: missing-ID scan of all_in_one.csv, legacy loop vs missing_scan.
+The legacy loop is the first pass update_all_in_one_with_api used to run
+(every column, 50k-row chunks, Python set of IDs). missing_scan reads only
+videoID + stat columns, with the pandas C parser and with pyarrow. Each
+variant runs in a fresh process so peak RSS is per variant, and the ID
+sets are checked to be identical.
+
+Usage:
+    python benchmarks/bench_missing_scan.py --rows 1000000 [--keep path.csv]
+"""
+
+import argparse
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from bench_enrichment import _peak_rss_mb, make_synthetic_csv  # noqa: E402
+
+
+def fill_some_stats(path: Path, filled: float = 0.6, failed: float = 0.05, seed: int = 1):
+    """Mark a share of videos as fetched and a share as -1, like a half-done run."""
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    rng = np.random.default_rng(seed)
+    ids = df['videoID'].unique()
+    roll = pd.Series(rng.random(len(ids)), index=ids).reindex(df['videoID']).to_numpy()
+    done, dead = roll < filled, (roll >= filled) & (roll < filled + failed)
+    df.loc[done, 'channelID'] = 'UCxxxxxxxxxxxxxxxxxxxxxx'
+    df.loc[done, 'Views'] = '12345.0'
+    df.loc[done, 'Published'] = '2024-01-01'
+    df.loc[done, 'likes'] = '10.0'
+    df.loc[done, 'comments'] = '3.0'
+    df.loc[dead, ['channelID', 'Published']] = ''
+    df.loc[dead, ['Views', 'likes', 'comments']] = '-1.0'
+    df.to_csv(path, index=False)
+
+
+def legacy_scan(csv_path: Path):
+    """The original first pass of update_all_in_one_with_api."""
+    all_missing = set()
+    failed_ids = set()
+    for chunk in pd.read_csv(csv_path, chunksize=50000, dtype={'category': str, 'original_title': str}):
+        missing_mask = (
+            chunk['videoID'].notna() &
+            (chunk['Views'] != -1) &
+            (
+                chunk['channelID'].isna() |
+                chunk['Views'].isna() |
+                chunk['Published'].isna() |
+                chunk['likes'].isna() |
+                chunk['comments'].isna()
+            )
+        )
+        all_missing.update(chunk.loc[missing_mask, 'videoID'].dropna().unique().tolist())
+        failed_ids.update(chunk.loc[chunk['Views'] == -1, 'videoID'].dropna().unique())
+    return all_missing, failed_ids
+
+
+def _run_child(csv_path: str, variant: str, out: multiprocessing.Queue):
+    start = time.perf_counter()
+    if variant == 'legacy':
+        missing, failed = legacy_scan(Path(csv_path))
+    else:
+        from missing_scan import scan_missing_work
+        work = scan_missing_work(Path(csv_path), engine=variant)
+        missing, failed = work.missing, work.failed
+    elapsed = time.perf_counter() - start
+    peak = _peak_rss_mb()  # before building the comparison lists below
+    out.put({'elapsed': elapsed, 'peak_rss_mb': peak,
+             'missing': sorted(missing), 'failed': sorted(failed)})
+
+
+def run_variant(csv_path: Path, variant: str) -> dict:
+    ctx = multiprocessing.get_context('spawn')
+    out = ctx.Queue()
+    proc = ctx.Process(target=_run_child, args=(str(csv_path), variant, out))
+    proc.start()
+    result = out.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the missing-ID scan of all_in_one.csv')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--variants', nargs='+', default=['legacy', 'pandas', 'pyarrow'],
+                        choices=['legacy', 'pandas', 'pyarrow'])
+    parser.add_argument('--keep', type=Path, default=None, help='Write the synthetic CSV here and keep it')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = args.keep or Path(workdir) / 'all_in_one.csv'
+        make_synthetic_csv(csv_path, args.rows)
+        fill_some_stats(csv_path)
+        print(f"{args.rows:,} rows, {csv_path.stat().st_size/1e6:.0f} MB\n")
+        print(f"{'variant':>8} {'scan s':>8} {'peak MB':>8} {'missing':>9} {'failed':>8}")
+
+        reference = None
+        for variant in args.variants:
+            r = run_variant(csv_path, variant)
+            print(f"{variant:>8} {r['elapsed']:>8.2f} {r['peak_rss_mb']:>8.0f} "
+                  f"{len(r['missing']):>9,} {len(r['failed']):>8,}")
+            if reference is None:
+                reference = r
+            elif (r['missing'], r['failed']) != (reference['missing'], reference['failed']):
+                print(f"  ⚠️  {variant} ID sets differ from {args.variants[0]}")
+
+
+if __name__ == '__main__':
+    main()
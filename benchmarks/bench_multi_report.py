@@ -0,0 +1,55 @@
+"""
+Benchmark: the five status reports as five separate passes vs one
+multi_report pass over the same file. Runs both from the CSV (no Arrow
+cache, i.e. a parse per pass) and from a warm Arrow cache.
+
+Usage:
+    python benchmarks/bench_multi_report.py --rows 1000000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from bench_enrichment import make_synthetic_csv  # noqa: E402
+from bench_missing_scan import fill_some_stats  # noqa: E402
+
+import arrow_cache  # noqa: E402
+import multi_report  # noqa: E402
+
+
+def _timed(names, csv_path, use_cache) -> float:
+    start = time.perf_counter()
+    multi_report.run_reports(names, [csv_path], use_cache=use_cache)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark separate vs single-pass status reports')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+    names = list(multi_report.REPORTS)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = Path(workdir) / 'all_in_one.csv'
+        make_synthetic_csv(csv_path, args.rows)
+        fill_some_stats(csv_path)
+        print(f"{args.rows:,} rows, {csv_path.stat().st_size/1e6:.0f} MB\n")
+        print(f"{'source':>12} {'5 passes s':>11} {'1 pass s':>9}")
+
+        # CSV: a parse per pass
+        separate = sum(_timed([name], csv_path, False) for name in names)
+        print(f"{'csv':>12} {separate:>11.2f} {_timed(names, csv_path, False):>9.2f}")
+
+        arrow_cache.build_cache(csv_path)
+        separate = sum(_timed([name], csv_path, True) for name in names)
+        print(f"{'arrow cache':>12} {separate:>11.2f} {_timed(names, csv_path, True):>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
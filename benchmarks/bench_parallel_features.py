@@ -0,0 +1,59 @@
+"""
+Benchmark: ClickbaitDataProcessor text features and language detection on
+one core vs a process pool (workers > 1, chunks of PARALLEL_CHUNK titles
+shared through memory-mapped files). Every pool result is compared with the
+single-process one, cell for cell. Speedup is bounded by the cores actually
+available (os.cpu_count() is printed); on one core the pool only adds its
+start-up and transfer overhead.
+
+Usage:
+    python benchmarks/bench_parallel_features.py --rows 1000000 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'EDA'))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+from data_processor import ClickbaitDataProcessor  # noqa: E402
+from bench_text_features import make_titles  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark single-process vs pooled feature extraction')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+
+    processor = ClickbaitDataProcessor(feature_cache=None)
+    titles = make_titles(args.rows)
+    print(f"{args.rows:,} titles, {os.cpu_count()} CPUs\n")
+    print(f"{'workers':>8} {'features s':>11} {'language s':>11}")
+
+    expected = None
+    for workers in sorted(set([1, *args.workers])):
+        start = time.perf_counter()
+        features = processor.extract_text_features_batch(titles, workers=workers)
+        features_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        languages = processor.add_language_detection(pd.DataFrame({'title': titles}), workers=workers)
+        language_s = time.perf_counter() - start
+
+        if expected is None:
+            expected = features, languages
+        else:
+            pd.testing.assert_frame_equal(features, expected[0], check_exact=True)
+            pd.testing.assert_frame_equal(languages, expected[1], check_exact=True)
+        print(f"{workers:>8} {features_s:>11.2f} {language_s:>11.2f}")
+    print("\n✓ Identical output for every worker count")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark: loading all_in_one as CSV vs its Parquet copy (parquet_store)
+vs its memory-mapped Arrow cache (arrow_cache).
+Covers the access patterns the analysis scripts use: the whole table, two
+columns (analyze_channel_evolution), and one slice of rows (title
+submissions, one submission month) with predicate pushdown, both on a
+single file and on a hive-partitioned dataset. Each variant runs in a fresh
+process so peak RSS is per variant; row counts are printed as a sanity check.
+
+Usage:
+    python benchmarks/bench_parquet_load.py --rows 1000000
+"""
+
+import argparse
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from bench_enrichment import _peak_rss_mb, make_synthetic_csv  # noqa: E402
+from bench_missing_scan import fill_some_stats  # noqa: E402
+
+TWO_COLUMNS = ['timeSubmitted', 'channelID']
+MONTH = '2021-03'
+MONTH_START = int(pd.Timestamp(MONTH + '-01').value // 10**6)  # ms, like timeSubmitted
+MONTH_END = int((pd.Timestamp(MONTH + '-01') + pd.offsets.MonthBegin()).value // 10**6)
+
+# variant -> (source: csv | parquet | by-type | by-month | arrow, columns, filters)
+VARIANTS = {
+    'csv full': ('csv', None, None),
+    'csv 2 cols': ('csv', TWO_COLUMNS, None),
+    'parquet full': ('parquet', None, None),
+    'parquet 2 cols': ('parquet', TWO_COLUMNS, None),
+    'parquet titles': ('parquet', None, [('title/thumbnail', '==', 'title')]),
+    'parquet month': ('parquet', None, [('timeSubmitted', '>=', MONTH_START), ('timeSubmitted', '<', MONTH_END)]),
+    'by-type titles': ('by-type', None, [('submission_type', '==', 'title')]),
+    'by-month month': ('by-month', None, [('submission_month', '==', MONTH)]),
+    'arrow full': ('arrow', None, None),
+    'arrow 2 cols': ('arrow', TWO_COLUMNS, None),
+}
+
+
+def _run_child(path: str, source: str, columns, filters, out: multiprocessing.Queue):
+    start = time.perf_counter()
+    if source == 'csv':
+        df = pd.read_csv(path, usecols=columns, low_memory=False)
+    elif source == 'arrow':
+        from arrow_cache import load_cached
+        df = load_cached(Path(path), columns=columns)
+    else:
+        from parquet_store import load_table
+        df = load_table(Path(path), columns=columns, filters=filters)
+    elapsed = time.perf_counter() - start
+    out.put({'elapsed': elapsed, 'peak_rss_mb': _peak_rss_mb(), 'rows': len(df), 'cols': df.shape[1]})
+
+
+def run_variant(path: Path, source: str, columns, filters) -> dict:
+    ctx = multiprocessing.get_context('spawn')
+    out = ctx.Queue()
+    proc = ctx.Process(target=_run_child, args=(str(path), source, columns, filters, out))
+    proc.start()
+    result = out.get()
+    proc.join()
+    return result
+
+
+def _size_mb(path: Path) -> float:
+    files = path.rglob('*.parquet') if path.is_dir() else [path]
+    return sum(f.stat().st_size for f in files) / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CSV vs Parquet vs Arrow-cache loads of all_in_one')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--variants', nargs='+', default=list(VARIANTS), choices=list(VARIANTS))
+    args = parser.parse_args()
+
+    from arrow_cache import build_cache, cache_path_for
+    from parquet_store import convert_csv
+
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = Path(workdir) / 'all_in_one.csv'
+        make_synthetic_csv(csv_path, args.rows)
+        fill_some_stats(csv_path)
+        paths = {'csv': csv_path}
+        for source, out_name, partition_by in [('parquet', 'all_in_one.parquet', None),
+                                               ('by-type', 'by_type', 'title/thumbnail'),
+                                               ('by-month', 'by_month', 'month')]:
+            start = time.perf_counter()
+            paths[source] = convert_csv(csv_path, Path(workdir) / out_name, partition_by=partition_by)
+            print(f"convert {source:<9} {time.perf_counter() - start:6.2f}s  {_size_mb(paths[source]):7.1f} MB")
+        start = time.perf_counter()
+        build_cache(csv_path)
+        paths['arrow'] = csv_path
+        print(f"build arrow     {time.perf_counter() - start:6.2f}s  {_size_mb(cache_path_for(csv_path)):7.1f} MB")
+        print(f"\n{args.rows:,} rows, CSV {csv_path.stat().st_size/1e6:.0f} MB\n")
+        print(f"{'variant':>15} {'load s':>8} {'peak MB':>8} {'rows':>10} {'cols':>5}")
+
+        for name in args.variants:
+            source, columns, filters = VARIANTS[name]
+            r = run_variant(paths[source], source, columns, filters)
+            print(f"{name:>15} {r['elapsed']:>8.2f} {r['peak_rss_mb']:>8.0f} {r['rows']:>10,} {r['cols']:>5}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark: ClickbaitDataProcessor.create_training_pairs as the old
+per-video loop (boolean-filter both frames for every casual videoID) vs the
+join-based version, on synthetic deArrow dumps of growing size. The loop is
+O(videos x rows), so it is only run up to --loop-max-videos; wherever both
+run, their outputs are compared: order, index, neutral titles and the
+winning vote count must match exactly. Among titles tied on votes the loop
+took whichever numpy's unstable quicksort put first; the join takes the
+first in file order, so the clickbait title may differ on ties only (counted
+in the 'tie picks' column).
+
+Usage:
+    python benchmarks/bench_training_pairs.py --videos 1000 10000 100000 1000000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'EDA'))
+from data_processor import ClickbaitDataProcessor  # noqa: E402
+
+
+def make_dearrow_dir(data_dir: Path, videos: int, seed: int = 0):
+    """
+    deArrow-shaped titles/titleVotes/casualVoteTitles/videoInfo CSVs:
+    ~3 titles per video with vote ties, casual titles for ~40% of the
+    videos (some several), video info for ~80%.
+    """
+    rng = np.random.default_rng(seed)
+    video_ids = np.char.add('vid', np.arange(videos).astype(str))
+    title_rows = videos * 3
+    uuids = np.char.add('uuid', np.arange(title_rows).astype(str))
+    pd.DataFrame({
+        'videoID': video_ids[rng.integers(0, videos, size=title_rows)],
+        'title': np.char.add('Clickbait title ', np.arange(title_rows).astype(str)),
+        'original': rng.integers(0, 2, size=title_rows),
+        'userID': 'user',
+        'timeSubmitted': rng.integers(1_600_000_000_000, 1_730_000_000_000, size=title_rows),
+        'UUID': uuids,
+    }).to_csv(data_dir / 'titles.csv', index=False)
+
+    voted = rng.random(title_rows) < 0.9  # some titles never got a vote row
+    pd.DataFrame({
+        'UUID': uuids[voted],
+        'votes': rng.integers(-2, 4, size=int(voted.sum())),  # narrow range: many ties
+        'locked': 0,
+        'shadowHidden': 0,
+    }).to_csv(data_dir / 'titleVotes.csv', index=False)
+
+    casual_videos = video_ids[rng.random(videos) < 0.4]
+    casual_ids = casual_videos[rng.integers(0, len(casual_videos), size=len(casual_videos) * 3 // 2)]
+    pd.DataFrame({
+        'videoID': casual_ids,
+        'id': np.arange(len(casual_ids)),
+        'title': np.char.add('casual title ', np.arange(len(casual_ids)).astype(str)),
+    }).to_csv(data_dir / 'casualVoteTitles.csv', index=False)
+
+    pd.DataFrame({
+        'videoID': video_ids[rng.random(videos) < 0.8],
+        'channelID': 'UCchannel',
+    }).to_csv(data_dir / 'videoInfo.csv', index=False)
+
+
+def loop_pairs(processor: ClickbaitDataProcessor, min_video_info_coverage=True) -> pd.DataFrame:
+    """The previous create_training_pairs: one boolean filter of each frame per video."""
+    titles_with_votes = processor.titles_df.merge(
+        processor.title_votes_df[['UUID', 'votes']], left_on='UUID', right_on='UUID', how='left')
+    pairs = []
+    for vid in processor.casual_titles_df['videoID'].unique():
+        casual = processor.casual_titles_df[processor.casual_titles_df['videoID'] == vid]
+        clickbaity = titles_with_votes[titles_with_votes['videoID'] == vid]
+        if len(casual) > 0 and len(clickbaity) > 0:
+            clickbaity_sorted = clickbaity.sort_values('votes', ascending=False, na_position='last')
+            pairs.append({
+                'videoID': vid,
+                'clickbait_title': clickbaity_sorted.iloc[0]['title'],
+                'neutral_title': casual.iloc[0]['title'],
+                'clickbait_votes': clickbaity_sorted.iloc[0].get('votes', 0),
+                'pair_source': 'titles_casual',
+            })
+    pairs_df = pd.DataFrame(pairs)
+    if min_video_info_coverage and processor.video_info_df is not None:
+        video_info_ids = set(processor.video_info_df['videoID'].dropna().unique())
+        pairs_df = pairs_df[pairs_df['videoID'].isin(video_info_ids)]
+    return pairs_df
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-video loop vs join-based training pairs')
+    parser.add_argument('--videos', type=int, nargs='+', default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument('--loop-max-videos', type=int, default=10_000,
+                        help='Largest size the per-video loop is run on')
+    args = parser.parse_args()
+
+    print(f"{'videos':>10} {'title rows':>11} {'pairs':>8} {'loop s':>8} {'join s':>8} {'tie picks':>10}")
+    for videos in args.videos:
+        with tempfile.TemporaryDirectory() as workdir:
+            make_dearrow_dir(Path(workdir), videos)
+            processor = ClickbaitDataProcessor(workdir)
+            processor.load_data(verbose=False)
+
+            start = time.perf_counter()
+            pairs = processor.create_training_pairs()
+            join_s = time.perf_counter() - start
+
+            loop_s, ties = float('nan'), ''
+            if videos <= args.loop_max_videos:
+                start = time.perf_counter()
+                expected = loop_pairs(processor)
+                loop_s = time.perf_counter() - start
+                # the loop built clickbait_votes from row scalars (object dtype); same values
+                expected = expected.astype({'clickbait_votes': pairs['clickbait_votes'].dtype})
+                pd.testing.assert_frame_equal(pairs.drop(columns='clickbait_title'),
+                                              expected.drop(columns='clickbait_title'))
+                ties = f"{(pairs['clickbait_title'] != expected['clickbait_title']).sum():,}"
+            print(f"{videos:>10,} {len(processor.titles_df):>11,} {len(pairs):>8,} "
+                  f"{loop_s:>8.2f} {join_s:>8.2f} {ties:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+"""
+Local stand-in for the YouTube Data API `/youtube/v3/videos` endpoint.
+Answers with deterministic fake snippet/statistics for any videoID, with
+configurable latency, server-error rate, missing-item rate and quotaExceeded
+responses, so the updaters can be benchmarked without spending quota.
+Like the real API it honours the `fields` selector and gzips responses for
+clients that send `Accept-Encoding: gzip` and "gzip" in their User-Agent.
+
+Usage:
+    python benchmarks/fake_youtube_api.py --port 8765 --latency 0.08 --error-rate 0.01
+    $env:YOUTUBE_API_BASE_URL = 'http://127.0.0.1:8765/youtube/v3'
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DESCRIPTION = ("Fake description text standing in for the long video descriptions "
+               "the real API returns in the snippet part. " * 8)
+
+
+class FakeApiConfig:
+    """Behaviour knobs shared by all request handlers."""
+
+    def __init__(self, latency=0.05, jitter=0.02, error_rate=0.0, missing_rate=0.02,
+                 quota_after=None, quota_rate=0.0, seed=0):
+        """
+        Args:
+            latency / jitter: Mean response delay and +/- uniform jitter (seconds)
+            error_rate: Fraction of requests answered with HTTP 500
+            missing_rate: Fraction of requested IDs left out of `items` (deleted/private)
+            quota_after: Answer 403 quotaExceeded after this many requests (None = never)
+            quota_rate: Fraction of requests answered with 403 quotaExceeded
+            seed: RNG seed for reproducible error patterns
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.missing_rate = missing_rate
+        self.quota_after = quota_after
+        self.quota_rate = quota_rate
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+
+
+def fake_item(video_id: str) -> dict:
+    """Deterministic snippet + statistics for a videoID."""
+    h = int(hashlib.md5(video_id.encode()).hexdigest(), 16)
+    day = 1 + h % 28
+    month = 1 + (h >> 8) % 12
+    return {
+        'kind': 'youtube#video',
+        'etag': f'{h:032x}'[:27],
+        'id': video_id,
+        'snippet': {
+            'publishedAt': f'20{15 + (h >> 16) % 10}-{month:02d}-{day:02d}T12:00:00Z',
+            'channelId': f'UC{h:022x}'[:24],
+            'title': f'Fake title for {video_id}',
+            'description': DESCRIPTION,
+            'thumbnails': {
+                size: {'url': f'https://i.ytimg.com/vi/{video_id}/{size}.jpg', 'width': w, 'height': hh}
+                for size, w, hh in (('default', 120, 90), ('medium', 320, 180), ('high', 480, 360))
+            },
+            'channelTitle': 'Fake Channel',
+            'tags': ['fake', 'benchmark', 'clickbait'],
+            'categoryId': '22',
+            'liveBroadcastContent': 'none',
+        },
+        'statistics': {
+            'viewCount': str(h % 10_000_000),
+            'likeCount': str(h % 100_000),
+            'favoriteCount': '0',
+            'commentCount': str(h % 5_000),
+        },
+    }
+
+
+def parse_fields(spec: str) -> dict:
+    """Parse a `fields` selector like "items(id,snippet(channelId))" into a nested dict."""
+    tree, stack, name = {}, [], ''
+    node = tree
+    for ch in spec + ',':
+        if ch in ',()':
+            if name.strip():
+                node[name.strip()] = {} if ch == '(' else None
+            if ch == '(':
+                stack.append(node)
+                node = node[name.strip()]
+            elif ch == ')':
+                node = stack.pop()
+            name = ''
+        else:
+            name += ch
+    return tree
+
+
+def select_fields(payload, tree: dict):
+    """Keep only the selected fields (lists are filtered element-wise)."""
+    if isinstance(payload, list):
+        return [select_fields(item, tree) for item in payload]
+    if not isinstance(payload, dict):
+        return payload
+    return {k: (payload[k] if sub is None else select_fields(payload[k], sub))
+            for k, sub in tree.items() if k in payload}
+
+
+def make_handler(config: FakeApiConfig):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, payload: dict):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=UTF-8')
+            if ('gzip' in self.headers.get('Accept-Encoding', '')
+                    and 'gzip' in self.headers.get('User-Agent', '')):
+                body = gzip.compress(body, compresslevel=6)
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            with config.lock:
+                config.bytes_sent += len(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if not url.path.rstrip('/').endswith('/youtube/v3/videos'):
+                self._send(404, {'error': {'code': 404, 'message': 'Not Found'}})
+                return
+
+            with config.lock:
+                config.requests += 1
+                n = config.requests
+                roll = config.rng.random()
+                delay = max(0.0, config.latency + config.rng.uniform(-config.jitter, config.jitter))
+            time.sleep(delay)
+
+            quota_hit = (config.quota_after is not None and n > config.quota_after) or roll < config.quota_rate
+            if quota_hit:
+                self._send(403, {'error': {'code': 403, 'message': 'quota exceeded', 'errors': [
+                    {'domain': 'youtube.quota', 'reason': 'quotaExceeded', 'message': 'quota exceeded'}]}})
+                return
+            if roll < config.quota_rate + config.error_rate:
+                self._send(500, {'error': {'code': 500, 'message': 'Backend Error'}})
+                return
+
+            params = parse_qs(url.query)
+            ids = [v for v in params.get('id', [''])[0].split(',') if v]
+            with config.lock:
+                keep = [v for v in ids if config.rng.random() >= config.missing_rate]
+            payload = {
+                'kind': 'youtube#videoListResponse',
+                'items': [fake_item(v) for v in keep],
+                'pageInfo': {'totalResults': len(keep), 'resultsPerPage': len(keep)},
+            }
+            if params.get('fields'):
+                payload = select_fields(payload, parse_fields(params['fields'][0]))
+            self._send(200, payload)
+
+    return Handler
+
+
+def start_server(port: int = 0, **config_kwargs):
+    """
+    Start the fake API on a background thread.
+
+    Returns:
+        (server, config, base_url) - pass base_url as YOUTUBE_API_BASE_URL;
+        call server.shutdown() when done
+    """
+    config = FakeApiConfig(**config_kwargs)
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(config))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}/youtube/v3'
+    return server, config, base_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake YouTube Data API /videos server')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--jitter', type=float, default=0.02)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--missing-rate', type=float, default=0.02)
+    parser.add_argument('--quota-after', type=int, default=None, help='403 quotaExceeded after N requests')
+    parser.add_argument('--quota-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, config, base_url = start_server(
+        args.port, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        missing_rate=args.missing_rate, quota_after=args.quota_after, quota_rate=args.quota_rate)
+    print(f"Fake YouTube API listening: {base_url}")
+    print(f"Set YOUTUBE_API_BASE_URL={base_url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print(f"\nServed {config.requests:,} requests, {config.bytes_sent/1e6:.1f} MB")
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
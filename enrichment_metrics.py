@@ -0,0 +1,289 @@
+"""
+Structured metrics for the enrichment runs.
+The updaters record every request (latency, outcome class, bytes), every
+checkpoint (duration) and every apply_stats pass (rows written) into one
+process-wide registry, METRICS. A background thread flushes a JSON snapshot
+to disk every few seconds, and an optional local endpoint serves the same
+numbers in Prometheus text format, so a stalled long run shows where the
+time goes.
+
+Pool workers record into their own copy; _worker_fetch ships it back with
+pop_state() and the parent folds it in with merge_state().
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+PREFIX = 'youtube_enrich'
+DEFAULT_METRICS_PATH = os.getenv("YOUTUBE_METRICS_FILE", "")  # empty = no JSON file
+DEFAULT_METRICS_PORT = int(os.getenv("YOUTUBE_METRICS_PORT", "0"))  # 0 = no endpoint
+FLUSH_EVERY = float(os.getenv("YOUTUBE_METRICS_FLUSH_EVERY", "15"))  # seconds between JSON flushes
+
+# Upper bounds (seconds) of the histogram buckets; +Inf is implicit
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60)
+CHECKPOINT_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 30, 120)
+
+HISTOGRAM_BUCKETS = {
+    'request_seconds': LATENCY_BUCKETS,
+    'checkpoint_seconds': CHECKPOINT_BUCKETS,
+}
+
+Key = Tuple[str, Tuple[Tuple[str, str], ...]]  # (metric name, sorted label pairs)
+
+
+def _key(name: str, labels: Dict[str, str]) -> Key:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class RunMetrics:
+    """Thread-safe counters and fixed-bucket histograms."""
+
+    def __init__(self):
+        self.started = time.time()
+        self._counters = defaultdict(float)
+        self._histograms = {}  # key -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    # Recording
+
+    def inc(self, name: str, value: float = 1, **labels):
+        with self._lock:
+            self._counters[_key(name, labels)] += value
+
+    def observe(self, name: str, value: float, **labels):
+        buckets = HISTOGRAM_BUCKETS.get(name, LATENCY_BUCKETS)
+        key = _key(name, labels)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+            hist[bisect.bisect_left(buckets, value)] += 1
+            hist[-1] += value
+
+    def observe_request(self, source: str, seconds: float, outcome: str, nbytes: int = 0):
+        """One request to YouTube: latency, outcome class and response size."""
+        self.observe('request_seconds', seconds, source=source)
+        self.inc('requests_total', source=source, outcome=outcome)
+        if nbytes:
+            self.inc('response_bytes_total', nbytes, source=source)
+
+    def observe_rows(self, rows: int):
+        """Rows written by one apply_stats pass."""
+        self.inc('rows_applied_total', rows)
+
+    @contextmanager
+    def checkpoint(self, source: str):
+        """Time a checkpoint write (journal append or CSV save)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe('checkpoint_seconds', time.perf_counter() - start, source=source)
+
+    def value(self, name: str, **labels) -> float:
+        """Current value of one counter."""
+        with self._lock:
+            return self._counters.get(_key(name, labels), 0.0)
+
+    # Moving state between processes
+
+    def reset(self):
+        """
+        Drop everything recorded so far, lock included. A forked pool worker
+        calls this first: it inherits the parent's counters (which pop_state
+        would ship back and merge_state count twice) and possibly a held lock.
+        """
+        self.started = time.time()
+        self._counters = defaultdict(float)
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def pop_state(self) -> dict:
+        """Return and reset everything recorded so far (for a pool worker's result)."""
+        with self._lock:
+            state = {'counters': dict(self._counters), 'histograms': self._histograms}
+            self._counters = defaultdict(float)
+            self._histograms = {}
+        return state
+
+    def merge_state(self, state: dict):
+        """Add a state from pop_state() recorded in another process."""
+        with self._lock:
+            for key, value in state['counters'].items():
+                self._counters[key] += value
+            for key, other in state['histograms'].items():
+                hist = self._histograms.setdefault(key, [0] * (len(other) - 1) + [0.0])
+                for i, value in enumerate(other):
+                    hist[i] += value
+
+    # Export
+
+    def snapshot(self) -> dict:
+        """JSON-ready view: counters, histograms with quantile estimates, rates."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {k: list(v) for k, v in self._histograms.items()}
+        uptime = time.time() - self.started
+
+        def labelled(key: Key) -> dict:
+            return {'metric': key[0], **dict(key[1])}
+
+        hist_out = []
+        for key, hist in sorted(histograms.items()):
+            buckets = HISTOGRAM_BUCKETS.get(key[0], LATENCY_BUCKETS)
+            count = sum(hist[:-1])
+            hist_out.append({
+                **labelled(key), 'count': count, 'sum': round(hist[-1], 6),
+                'mean': round(hist[-1] / count, 6) if count else None,
+                'p50': _quantile(buckets, hist, 0.5), 'p90': _quantile(buckets, hist, 0.9),
+                'p99': _quantile(buckets, hist, 0.99),
+                'buckets': {str(b): n for b, n in zip(list(buckets) + ['+Inf'], hist[:-1])},
+            })
+        rows = sum(v for (name, _), v in counters.items() if name == 'rows_applied_total')
+        requests = sum(v for (name, _), v in counters.items() if name == 'requests_total')
+        return {
+            'updated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'uptime_seconds': round(uptime, 1),
+            'rows_per_second': round(rows / uptime, 2) if uptime > 0 else 0.0,
+            'requests_per_second': round(requests / uptime, 2) if uptime > 0 else 0.0,
+            'counters': [{**labelled(k), 'value': v} for k, v in sorted(counters.items())],
+            'histograms': hist_out,
+        }
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {k: list(v) for k, v in self._histograms.items()}
+        lines = []
+        for name in sorted({k[0] for k in counters}):
+            lines.append(f"# TYPE {PREFIX}_{name} counter")
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{PREFIX}_{name}{_labels(labels)} {_num(value)}")
+        for name in sorted({k[0] for k in histograms}):
+            buckets = HISTOGRAM_BUCKETS.get(name, LATENCY_BUCKETS)
+            lines.append(f"# TYPE {PREFIX}_{name} histogram")
+            for (metric, labels), hist in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, n in zip(list(buckets) + ['+Inf'], hist[:-1]):
+                    cumulative += n
+                    lines.append(f"{PREFIX}_{name}_bucket{_labels(labels + (('le', str(bound)),))} {cumulative}")
+                lines.append(f"{PREFIX}_{name}_sum{_labels(labels)} {_num(hist[-1])}")
+                lines.append(f"{PREFIX}_{name}_count{_labels(labels)} {cumulative}")
+        lines.append(f"# TYPE {PREFIX}_uptime_seconds gauge")
+        lines.append(f"{PREFIX}_uptime_seconds {time.time() - self.started:.1f}")
+        return '\n'.join(lines) + '\n'
+
+    def write_json(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        tmp.write_text(json.dumps(self.snapshot(), indent=2), encoding='utf-8')
+        os.replace(tmp, path)
+
+
+def _labels(labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in labels) + '}'
+
+
+def _num(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _quantile(buckets, hist, q: float) -> Optional[float]:
+    """Upper bound of the bucket holding quantile q (None past the last bound)."""
+    count = sum(hist[:-1])
+    if not count:
+        return None
+    seen = 0
+    for bound, n in zip(buckets, hist):
+        seen += n
+        if seen >= q * count:
+            return bound
+    return None
+
+
+METRICS = RunMetrics()
+
+
+class MetricsExporter:
+    """Periodic JSON flush and/or a local Prometheus endpoint for METRICS."""
+
+    def __init__(self, path: Optional[Path] = None, port: int = 0,
+                 interval: float = FLUSH_EVERY, metrics: RunMetrics = METRICS):
+        """
+        Args:
+            path: JSON snapshot file rewritten every `interval` seconds (None = off)
+            port: Serve Prometheus text on http://127.0.0.1:<port>/metrics (0 = off)
+            interval: Seconds between JSON flushes
+        """
+        self.path = Path(path) if path else None
+        self.port = port
+        self.interval = interval
+        self.metrics = metrics
+        self._stop = threading.Event()
+        self._thread = None
+        self._server = None
+
+    def start(self):
+        if self.path is not None:
+            self._thread = threading.Thread(target=self._flush_loop, daemon=True)
+            self._thread.start()
+            print(f"Metrics: {self.path} (every {self.interval:g}s)")
+        if self.port:
+            self._server = ThreadingHTTPServer(('127.0.0.1', self.port), _make_handler(self.metrics))
+            self._server.daemon_threads = True
+            threading.Thread(target=self._server.serve_forever, daemon=True).start()
+            print(f"Metrics: http://127.0.0.1:{self._server.server_address[1]}/metrics")
+        return self
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.interval):
+            self.metrics.write_json(self.path)
+
+    def stop(self):
+        """Stop the endpoint and write a final JSON snapshot."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self.metrics.write_json(self.path)
+        if self._server is not None:
+            self._server.shutdown()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def _make_handler(metrics: RunMetrics):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.rstrip('/') not in ('', '/metrics'):
+                self.send_error(404)
+                return
+            body = metrics.to_prometheus().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
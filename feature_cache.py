@@ -0,0 +1,185 @@
+"""
+Persistent cache of per-title features, keyed by a 64-bit hash of the title
+text. Titles repeat across submissions and votes, so ClickbaitDataProcessor
+looks each distinct title up here and computes only the ones never seen
+before.
+
+Each kind of feature (e.g. 'features', 'language') is a table of sorted keys,
+a last-used time and one array per feature, searched with np.searchsorted:
+a lookup costs about as much as a NumPy gather, so even cheap features are
+worth caching. Tables are loaded on first use and kept in memory for the run;
+a lookup that added rows saves the table to <path>/<kind>.npz (atomic
+replace) so reruns start warm, while one that only hit leaves the file alone
+(its last-used times are written with the next save, or by flush()). Beyond
+`max_entries` rows the least recently used are evicted.
+
+A table is stamped with the definition version of its features (see
+definition_version); loading it under another version starts empty, so
+changed feature code never reads stale values.
+"""
+
+import hashlib
+import inspect
+import os
+import time
+import unicodedata
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_FEATURE_CACHE_PATH = Path(os.getenv(
+    "CLICKBAIT_FEATURE_CACHE",
+    Path(__file__).resolve().parent / "All_data" / "title_features_cache",
+))
+MAX_ENTRIES = 2_000_000  # rows kept per kind (~100 B each for the text features)
+
+
+def title_keys(texts: List[str]) -> np.ndarray:
+    """
+    Cache keys (int64) of (normalized) titles: pandas' stable 64-bit hash of
+    the UTF-8 text, blake2b for the odd string UTF-8 cannot encode (lone
+    surrogates). Among two million titles a collision has ~1e-7 probability.
+    """
+    values = np.array(texts, dtype=object)
+    try:
+        return pd.util.hash_array(values, categorize=False).view(np.int64)
+    except UnicodeEncodeError:
+        return np.array([int.from_bytes(hashlib.blake2b(t.encode('utf-8', 'surrogatepass'), digest_size=8).digest(),
+                                        'little', signed=True) for t in texts], dtype=np.int64)
+
+
+def definition_version(*functions) -> str:
+    """
+    Version of a feature definition: a hash of the source of the functions
+    computing it and of the Unicode database their str methods/regexes use.
+    Editing any of them gives a new version and so invalidates cached rows.
+    """
+    source = ''.join(inspect.getsource(f) for f in functions)
+    text = f'{unicodedata.unidata_version}\n{source}'
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+
+class FeatureCache:
+    """Title hash -> feature row store: sorted NumPy tables per kind, saved as .npz files."""
+
+    def __init__(self, path: Path = DEFAULT_FEATURE_CACHE_PATH, max_entries: int = MAX_ENTRIES):
+        """
+        Args:
+            path: Directory of the <kind>.npz files (created if missing); None keeps the cache in memory only
+            max_entries: Rows kept per kind (least recently used are evicted)
+        """
+        self.path = Path(path) if path is not None else None
+        self.max_entries = max_entries
+        self._tables = {}  # kind -> {'version', 'dtypes', 'keys', 'used_at', 'columns', 'dirty'}
+
+    def _file(self, kind: str) -> Path:
+        return self.path / f'{kind}.npz'
+
+    def _table(self, kind: str, version: str, columns: Dict[str, np.dtype]) -> dict:
+        """The table of `kind`, loaded from disk unless it was saved by another version."""
+        dtypes = {name: np.dtype(dtype) for name, dtype in columns.items()}
+        table = self._tables.get(kind)
+        if table is not None and table['version'] == version and table['dtypes'] == dtypes:
+            return table
+        table = {
+            'version': version,
+            'dtypes': dtypes,
+            'keys': np.empty(0, dtype=np.int64),
+            'used_at': np.empty(0, dtype=np.float64),
+            'columns': {name: np.empty(0, dtype=dtype) for name, dtype in dtypes.items()},
+            'dirty': False,  # rows or last-used times not saved yet
+        }
+        if self.path is not None and self._file(kind).exists():
+            with np.load(self._file(kind)) as stored:
+                if str(stored['version']) == version and str(stored['signature']) == _signature(dtypes):
+                    table['keys'] = stored['keys']
+                    table['used_at'] = stored['used_at']
+                    table['columns'] = {name: stored[f'column_{name}'].astype(dtype)
+                                        for name, dtype in dtypes.items()}
+        self._tables[kind] = table
+        return table
+
+    def lookup(self, kind: str, version: str, columns: Dict[str, np.dtype], texts: List[str],
+               compute: Callable[[List[str]], Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        """
+        Features of titles, from the cache where possible.
+
+        Args:
+            kind: Feature table name (file name)
+            version: Definition version of `compute` (see definition_version)
+            columns: Feature name -> dtype, as returned by `compute`
+            texts: Normalized titles (distinct, ideally)
+            compute: Computes the features of a list of titles (name -> array)
+
+        Returns:
+            Feature name -> array aligned with `texts`
+        """
+        table = self._table(kind, version, columns)
+        keys = title_keys(texts)
+        now = time.time()
+
+        pos = np.searchsorted(table['keys'], keys)
+        hits = np.zeros(len(keys), dtype=bool)
+        if len(table['keys']):
+            hits = table['keys'][np.minimum(pos, len(table['keys']) - 1)] == keys
+        result = {name: np.empty(len(keys), dtype=dtype) for name, dtype in table['dtypes'].items()}
+        for name, values in table['columns'].items():
+            result[name][hits] = values[pos[hits]]
+        table['used_at'][pos[hits]] = now
+        table['dirty'] |= bool(hits.any())
+
+        todo = np.flatnonzero(~hits)
+        if len(todo):
+            new_keys, first = np.unique(keys[todo], return_index=True)
+            computed = compute([texts[i] for i in todo[first]])
+            where = np.searchsorted(new_keys, keys[todo])
+            for name in result:
+                result[name][todo] = np.asarray(computed[name])[where]
+            self._insert(table, new_keys, computed, now)
+            self._save(kind, table)
+        return result
+
+    def _insert(self, table: dict, keys: np.ndarray, computed: Dict[str, np.ndarray], now: float):
+        """Merge new rows into the sorted table, then evict the least recently used beyond max_entries."""
+        merged = np.concatenate([table['keys'], keys])
+        order = np.argsort(merged, kind='stable')
+        used_at = np.concatenate([table['used_at'], np.full(len(keys), now)])[order]
+        if len(order) > self.max_entries:
+            keep = np.sort(np.argsort(used_at, kind='stable')[-self.max_entries:])
+            order, used_at = order[keep], used_at[keep]
+        table['keys'] = merged[order]
+        table['used_at'] = used_at
+        table['columns'] = {name: np.concatenate([values, np.asarray(computed[name], dtype=values.dtype)])[order]
+                            for name, values in table['columns'].items()}
+        table['dirty'] = True
+
+    def flush(self):
+        """Save every table with unsaved changes (e.g. last-used times of hit-only lookups)."""
+        for kind, table in self._tables.items():
+            if table['dirty']:
+                self._save(kind, table)
+
+    def _save(self, kind: str, table: dict):
+        """Write the table to <path>/<kind>.npz via a temporary file (object columns as text)."""
+        if self.path is None:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        arrays = {f'column_{name}': values.astype(str) if values.dtype == object else values
+                  for name, values in table['columns'].items()}
+        tmp = self._file(kind).with_suffix('.tmp')
+        with open(tmp, 'wb') as f:
+            np.savez(f, version=table['version'], signature=_signature(table['dtypes']),
+                     keys=table['keys'], used_at=table['used_at'], **arrays)
+        os.replace(tmp, self._file(kind))
+        table['dirty'] = False
+
+    def count(self, kind: str) -> int:
+        """Rows of `kind` loaded so far."""
+        table = self._tables.get(kind)
+        return len(table['keys']) if table is not None else 0
+
+
+def _signature(dtypes: Dict[str, np.dtype]) -> str:
+    return ','.join(f'{name}:{dtype.str}' for name, dtype in dtypes.items())
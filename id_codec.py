@@ -0,0 +1,287 @@
+"""
+Compact integer encoding of YouTube videoIDs.
+A videoID is 11 base64url characters: 10 carry 6 bits each and the last one
+only 4 (it is always one of 16 characters), so every ID fits exactly in one
+unsigned 64-bit integer. The alphabets are taken in ASCII order, so codes
+sort like the IDs they encode.
+
+encode_ids()/decode_ids() convert whole arrays at once (no per-ID Python
+work). IdSet and IdMap hold sorted uint64 arrays instead of Python str
+objects: 8 bytes per ID instead of ~100 for a str in a set or dict. Strings
+that are not well-formed videoIDs (wrong length, other characters) cannot be
+encoded; both structures keep those few in a plain Python set/dict on the
+side, so nothing is lost.
+
+Usage:
+    from id_codec import IdMap, IdSet
+    missing = IdSet(work.missing)            # from any array/list of IDs
+    todo = (missing - IdSet(cached)).tolist()
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+ID_LENGTH = 11
+ALPHABET = b'-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz'  # 6 bits, ASCII order
+LAST_ALPHABET = b'048AEIMQUYcgkosw'  # 4 bits: characters allowed in the last position
+ENCODE_BLOCK = 1 << 18  # IDs per block while encoding, bounds the per-character temporaries
+
+_DIGITS = np.frombuffer(ALPHABET, dtype=np.uint8)
+_LAST_DIGITS = np.frombuffer(LAST_ALPHABET, dtype=np.uint8)
+_LOOKUP = np.full(256, -1, dtype=np.int16)
+_LOOKUP[_DIGITS] = np.arange(len(_DIGITS))
+_LAST_LOOKUP = np.full(256, -1, dtype=np.int16)
+_LAST_LOOKUP[_LAST_DIGITS] = np.arange(len(_LAST_DIGITS))
+_SHIFTS = np.array([4 + 6 * (9 - i) for i in range(10)], dtype=np.uint64)
+
+
+def _as_array(ids) -> np.ndarray:
+    """A numpy str/bytes array of `ids` (array, Series, Arrow array, list or any iterable)."""
+    if isinstance(ids, IdSet):
+        return ids.to_array()
+    if hasattr(ids, 'to_numpy'):  # pandas and Arrow
+        ids = ids.to_numpy(zero_copy_only=False) if hasattr(ids, 'type') else ids.to_numpy()
+    elif not isinstance(ids, np.ndarray):
+        ids = list(ids)
+    arr = np.asarray(ids)
+    if arr.dtype.kind in 'SU':
+        return arr
+    return arr.astype(str) if len(arr) else np.array([], dtype=str)
+
+
+def _encode_block(arr: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    width = arr.dtype.itemsize // (4 if arr.dtype.kind == 'U' else 1)
+    if width < ID_LENGTH:
+        return np.zeros(len(arr), dtype=np.uint64), np.zeros(len(arr), dtype=bool)
+    chars = np.ascontiguousarray(arr).view(np.uint32 if arr.dtype.kind == 'U' else np.uint8)
+    chars = chars.reshape(len(arr), width)
+    points = chars[:, :ID_LENGTH]
+    ascii_points = np.minimum(points, 255)
+    digits = _LOOKUP[ascii_points[:, :10]]
+    last = _LAST_LOOKUP[ascii_points[:, 10]]
+    valid = (digits >= 0).all(axis=1) & (last >= 0) & (points < 256).all(axis=1)
+    if width > ID_LENGTH:
+        valid &= chars[:, ID_LENGTH] == 0  # str arrays pad shorter strings with NULs
+    digits = np.where(valid[:, None], digits, 0).astype(np.uint64)
+    codes = np.bitwise_or.reduce(digits << _SHIFTS, axis=1)
+    codes |= np.where(valid, last, 0).astype(np.uint64)
+    return codes, valid
+
+
+def encode_ids(ids) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode videoIDs to uint64 codes.
+
+    Args:
+        ids: videoIDs (numpy/pandas/Arrow array, list or iterable of str);
+             strip whitespace and drop missing values beforehand
+
+    Returns:
+        (codes, valid): uint64 codes and a bool mask of the IDs that could be
+        encoded; codes of invalid entries are 0 and must be ignored
+    """
+    arr = _as_array(ids)
+    codes = np.empty(len(arr), dtype=np.uint64)
+    valid = np.empty(len(arr), dtype=bool)
+    for start in range(0, len(arr), ENCODE_BLOCK):
+        end = start + ENCODE_BLOCK
+        codes[start:end], valid[start:end] = _encode_block(arr[start:end])
+    return codes, valid
+
+
+def decode_ids(codes) -> np.ndarray:
+    """videoIDs (str array) of uint64 codes from encode_ids()."""
+    codes = np.asarray(codes, dtype=np.uint64)
+    chars = np.empty((len(codes), ID_LENGTH), dtype=np.uint8)
+    for i, shift in enumerate(_SHIFTS):
+        chars[:, i] = _DIGITS[(codes >> shift) & np.uint64(63)]
+    chars[:, 10] = _LAST_DIGITS[codes & np.uint64(15)]
+    return chars.view(f'S{ID_LENGTH}').ravel().astype(f'U{ID_LENGTH}')
+
+
+def _positions(sorted_codes: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """Index of each code in `sorted_codes`, -1 where absent."""
+    pos = np.searchsorted(sorted_codes, codes)
+    found = pos < len(sorted_codes)
+    found[found] = sorted_codes[pos[found]] == codes[found]
+    return np.where(found, pos, -1)
+
+
+class IdSet:
+    """Set of videoIDs as a sorted uint64 array (plus any unencodable strings)."""
+
+    __slots__ = ('codes', 'extra')
+
+    def __init__(self, ids: Iterable[str] = ()):
+        if isinstance(ids, IdSet):
+            self.codes, self.extra = ids.codes, ids.extra
+            return
+        arr = _as_array(ids)
+        codes, valid = encode_ids(arr)
+        self.codes = np.unique(codes[valid])
+        self.extra = frozenset(arr[~valid].tolist())
+
+    @classmethod
+    def _from_parts(cls, codes: np.ndarray, extra: frozenset) -> 'IdSet':
+        result = cls.__new__(cls)
+        result.codes, result.extra = codes, extra
+        return result
+
+    @classmethod
+    def union_all(cls, sets: Iterable['IdSet']) -> 'IdSet':
+        """Union of many sets in one sort."""
+        sets = [s if isinstance(s, IdSet) else IdSet(s) for s in sets]
+        if not sets:
+            return cls()
+        return cls._from_parts(np.unique(np.concatenate([s.codes for s in sets])),
+                               frozenset().union(*(s.extra for s in sets)))
+
+    def __len__(self):
+        return len(self.codes) + len(self.extra)
+
+    def __contains__(self, video_id) -> bool:
+        return bool(self.contains([video_id])[0])
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __repr__(self):
+        return f"IdSet({len(self):,} videoIDs, {self.codes.nbytes / 1e6:.1f} MB)"
+
+    def contains(self, ids) -> np.ndarray:
+        """Vectorized membership: bool mask over `ids`."""
+        arr = _as_array(ids)
+        codes, valid = encode_ids(arr)
+        hit = valid & (_positions(self.codes, codes) >= 0)
+        if self.extra:
+            for i in np.flatnonzero(~valid):
+                hit[i] = str(arr[i]) in self.extra
+        return hit
+
+    def drop_from(self, ids) -> List[str]:
+        """The IDs of `ids` not in this set, order and duplicates preserved."""
+        arr = _as_array(ids)
+        return arr[~self.contains(arr)].tolist()
+
+    def union(self, other) -> 'IdSet':
+        other = IdSet(other)
+        return IdSet._from_parts(np.union1d(self.codes, other.codes), self.extra | other.extra)
+
+    def intersection(self, other) -> 'IdSet':
+        other = IdSet(other)
+        return IdSet._from_parts(np.intersect1d(self.codes, other.codes, assume_unique=True),
+                                 self.extra & other.extra)
+
+    def difference(self, other) -> 'IdSet':
+        other = IdSet(other)
+        return IdSet._from_parts(np.setdiff1d(self.codes, other.codes, assume_unique=True),
+                                 self.extra - other.extra)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def to_array(self) -> np.ndarray:
+        """Sorted str array of the IDs."""
+        ids = decode_ids(self.codes)
+        if self.extra:
+            ids = np.sort(np.concatenate([ids, np.array(list(self.extra), dtype=str)]))
+        return ids
+
+    def tolist(self) -> List[str]:
+        return self.to_array().tolist()
+
+
+class IdMap:
+    """
+    videoID -> dense position (0, 1, 2, ... in first-seen order).
+    Per-ID values live in plain numpy arrays indexed by position, e.g.
+    `flags[ids.add(chunk['videoID'])] |= ...`, so a videoID -> value dict
+    costs a sorted uint64 key array, an int64 position array and the values.
+    """
+
+    def __init__(self):
+        self.codes = np.array([], dtype=np.uint64)  # sorted
+        self.positions = np.array([], dtype=np.int64)  # aligned with codes
+        self.extra: Dict[str, int] = {}  # unencodable IDs -> position
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, video_id) -> bool:
+        return bool(self.get([video_id])[0] >= 0)
+
+    def get(self, ids) -> np.ndarray:
+        """Positions of `ids`, -1 for IDs never added."""
+        arr = _as_array(ids)
+        codes, valid = encode_ids(arr)
+        out = self.get_codes(codes, valid)
+        for i in np.flatnonzero(~valid):
+            out[i] = self.extra.get(str(arr[i]), -1)
+        return out
+
+    def add(self, ids) -> np.ndarray:
+        """
+        Positions of `ids`, assigning the next positions to unseen IDs in the
+        order they first appear.
+
+        Args:
+            ids: videoIDs (array, Series, list...); strip and drop missing values first
+
+        Returns:
+            int64 array of positions, one per entry of `ids`
+        """
+        arr = _as_array(ids)
+        codes, valid = encode_ids(arr)
+        out = self.get_codes(codes, valid)
+
+        # Unseen IDs, each with the index of its first occurrence in `ids`
+        new_rows = np.flatnonzero(valid & (out < 0))
+        new_codes, first = np.unique(codes[new_rows], return_index=True)
+        first = new_rows[first]
+        new_extra = {}
+        for i in np.flatnonzero(~valid):
+            key = str(arr[i])
+            if key not in self.extra and key not in new_extra:
+                new_extra[key] = i
+        if not len(new_codes) and not new_extra:
+            return out
+
+        # Number them by first occurrence, across both kinds
+        firsts = np.concatenate([first, np.fromiter(new_extra.values(), dtype=np.int64, count=len(new_extra))])
+        numbers = np.empty(len(firsts), dtype=np.int64)
+        numbers[np.argsort(firsts, kind='stable')] = self.count + np.arange(len(firsts))
+        self.count += len(firsts)
+        code_numbers = numbers[:len(new_codes)]
+        for key, number in zip(new_extra, numbers[len(new_codes):]):
+            self.extra[key] = int(number)
+
+        insert_at = np.searchsorted(self.codes, new_codes)
+        self.codes = np.insert(self.codes, insert_at, new_codes)
+        self.positions = np.insert(self.positions, insert_at, code_numbers)
+
+        rows = valid & (out < 0)
+        out[rows] = code_numbers[np.searchsorted(new_codes, codes[rows])]
+        for i in np.flatnonzero(~valid):
+            out[i] = self.extra[str(arr[i])]
+        return out
+
+    def get_codes(self, codes: np.ndarray, valid: np.ndarray) -> np.ndarray:
+        """Positions of already encoded IDs; -1 for unknown or invalid entries."""
+        found = _positions(self.codes, codes)
+        found[~valid] = -1
+        out = np.full(len(codes), -1, dtype=np.int64)
+        out[found >= 0] = self.positions[found[found >= 0]]
+        return out
+
+    def ids(self) -> np.ndarray:
+        """All IDs as a str array, indexed by position."""
+        decoded = decode_ids(self.codes)
+        width = max([ID_LENGTH] + [len(key) for key in self.extra])
+        out = np.empty(self.count, dtype=f'U{width}')
+        out[self.positions] = decoded
+        for key, position in self.extra.items():
+            out[position] = key
+        return out
@@ -0,0 +1,157 @@
+"""
+Missing-work scanner for the All_data CSVs.
+Reads only videoID and the five stat columns (never the long title text)
+and classifies every row in one streaming pass: videos still missing
+stats, videos previously marked -1, and rows that break the
+"all filled or all -1" rule checked by chunk_check_status.py.
+Uses pyarrow's multithreaded CSV reader when installed and falls back to
+the pandas C parser with usecols otherwise.
+"""
+
+from functools import reduce
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from stats_apply import STAT_COLS
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:  # optional: pandas fallback below
+    pa = None
+
+SCAN_COLS = ['videoID', *STAT_COLS]
+FAILED_MARKERS = ['-1', '-1.0']  # float columns round-trip -1 as "-1.0"
+BLOCK_SIZE = 1 << 20  # bytes per pyarrow block; the reader keeps ~30 blocks in readahead
+CHUNKSIZE = 100_000  # rows per chunk for the pandas fallback
+
+
+class MissingWork:
+    """Outcome of scan_missing_work; ID arrays are sorted and deduplicated."""
+
+    def __init__(self, missing: np.ndarray, failed: np.ndarray, bad_ids: np.ndarray,
+                 total_rows: int, bad_rows: int, engine: str):
+        self.missing = missing      # videoIDs with at least one empty stat (and Views != -1)
+        self.failed = failed        # videoIDs whose Views is -1
+        self.bad_ids = bad_ids      # videoIDs of rows neither fully filled nor fully -1 (if collected)
+        self.total_rows = total_rows
+        self.bad_rows = bad_rows
+        self.engine = engine
+
+    def __repr__(self):
+        return (f"MissingWork(missing={len(self.missing):,}, failed={len(self.failed):,}, "
+                f"bad_rows={self.bad_rows:,}/{self.total_rows:,}, engine={self.engine})")
+
+
+def row_masks(has_id, empty, neg1, views_failed, or_, and_, invert):
+    """(missing, failed, bad) row masks from per-column empty / -1 masks."""
+    any_empty = reduce(or_, empty)
+    all_filled = and_(invert(any_empty), invert(reduce(or_, neg1)))
+    bad = invert(or_(all_filled, reduce(and_, neg1)))
+    missing = and_(and_(has_id, invert(views_failed)), any_empty)
+    return missing, and_(has_id, views_failed), and_(has_id, bad), bad
+
+
+def _scan_arrow(csv_path: Path, header, collect_bad: bool) -> Iterator[tuple]:
+    reader = pacsv.open_csv(
+        csv_path,
+        read_options=pacsv.ReadOptions(block_size=BLOCK_SIZE, use_threads=True),
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),  # titles may contain newlines
+        convert_options=pacsv.ConvertOptions(
+            include_columns=SCAN_COLS, include_missing_columns=True,
+            column_types={c: pa.string() for c in SCAN_COLS},
+        ),
+    )
+    markers = pa.array(FAILED_MARKERS)
+    for batch in reader:
+        cols = {c: pc.fill_null(batch.column(c), '') for c in SCAN_COLS}
+        video_ids = pc.utf8_trim_whitespace(cols['videoID'])
+        empty = [pc.equal(cols[c], '') for c in STAT_COLS]
+        neg1 = [pc.is_in(cols[c], value_set=markers) for c in STAT_COLS]
+        missing, failed, bad, bad_rows = row_masks(
+            pc.not_equal(video_ids, ''), empty, neg1, neg1[STAT_COLS.index('Views')],
+            pc.or_, pc.and_, pc.invert)
+        yield (len(batch), pc.sum(bad_rows).as_py() or 0,
+               *(pc.unique(pc.filter(video_ids, m)) if m is not None else None
+                 for m in (missing, failed, bad if collect_bad else None)))
+
+
+def _scan_pandas(csv_path: Path, header, collect_bad: bool) -> Iterator[tuple]:
+    for chunk in pd.read_csv(csv_path, usecols=[c for c in SCAN_COLS if c in header],
+                             dtype=str, keep_default_na=False, chunksize=CHUNKSIZE):
+        # Absent stat columns count as empty
+        chunk = chunk.reindex(columns=SCAN_COLS).fillna('')
+        video_ids = chunk['videoID'].str.strip().to_numpy()
+        stats = chunk[STAT_COLS]
+        neg1 = stats.isin(FAILED_MARKERS).to_numpy()
+        missing, failed, bad, bad_rows = row_masks(
+            video_ids != '', list(stats.eq('').to_numpy().T), list(neg1.T),
+            neg1[:, STAT_COLS.index('Views')],
+            np.logical_or, np.logical_and, np.logical_not)
+        yield (len(chunk), int(bad_rows.sum()),
+               *(pd.unique(video_ids[m]).astype(str) if m is not None else None
+                 for m in (missing, failed, bad if collect_bad else None)))
+
+
+def _arrow_to_numpy(ids) -> np.ndarray:
+    """Fixed-width numpy copy of an Arrow string array without per-ID Python objects."""
+    width = pc.max(pc.binary_length(ids)).as_py() if len(ids) else 0
+    if width:
+        try:
+            fixed = ids.cast(pa.binary(width))
+            return np.frombuffer(fixed.buffers()[1], dtype=f'S{width}', count=len(fixed),
+                                 offset=fixed.offset * width).astype(f'U{width}')
+        except (pa.ArrowInvalid, UnicodeDecodeError):  # mixed widths or non-ASCII
+            pass
+    return ids.to_numpy(zero_copy_only=False).astype(str)
+
+
+def _unique(parts: list) -> np.ndarray:
+    """Sorted, deduplicated IDs from per-chunk arrays (Arrow or numpy)."""
+    if not parts:
+        return np.array([], dtype=str)
+    if pa is not None and isinstance(parts[0], pa.Array):
+        ids = pa.chunked_array(parts, type=pa.string()).unique()
+        return _arrow_to_numpy(ids.take(pc.array_sort_indices(ids)))
+    try:
+        # Sort as 1-byte chars (videoIDs are ASCII): a quarter of the memory of <U11
+        return np.unique(np.concatenate([p.astype('S') for p in parts])).astype(str)
+    except UnicodeEncodeError:
+        return np.unique(np.concatenate(parts))
+
+
+def scan_missing_work(csv_path: Path, engine: Optional[str] = None,
+                      collect_bad: bool = False) -> MissingWork:
+    """
+    Stream one CSV and collect the videoIDs that still need work.
+
+    Args:
+        csv_path: All_data CSV with a videoID column
+        engine: 'pyarrow' or 'pandas' (default: pyarrow when installed)
+        collect_bad: Also collect the IDs of rows breaking the filled-or--1 rule
+                     (bad_rows is always counted)
+
+    Returns:
+        MissingWork with compact, deduplicated ID arrays and row counts
+    """
+    csv_path = Path(csv_path)
+    engine = engine or ('pyarrow' if pa is not None else 'pandas')
+    header = pd.read_csv(csv_path, nrows=0).columns
+    scan = _scan_arrow if engine == 'pyarrow' else _scan_pandas
+
+    missing, failed, bad = [], [], []
+    total_rows = bad_rows = 0
+    for rows, chunk_bad_rows, chunk_missing, chunk_failed, chunk_bad in scan(csv_path, header, collect_bad):
+        total_rows += rows
+        bad_rows += chunk_bad_rows
+        missing.append(chunk_missing)
+        failed.append(chunk_failed)
+        if collect_bad:
+            bad.append(chunk_bad)
+
+    return MissingWork(_unique(missing), _unique(failed), _unique(bad),
+                       total_rows, bad_rows, engine)
@@ -0,0 +1,372 @@
+"""
+Single-pass status reports over the All_data CSVs.
+chunk_check_status.py, EDA/check_youtube_progress.py and the three
+scripts/check_* / find_* reports used to read the same files once each.
+Here every check is a Report that accumulates chunk by chunk; scan_files()
+reads each file once (only the union of the columns the selected reports
+need, from its Parquet copy if fresh, else from the CSV) and feeds every
+chunk to all of them. --arrow-cache reads through arrow_cache instead, which
+writes a `.arrow` copy next to each file on first use.
+The old scripts are thin wrappers around their report.
+
+Reports:
+    status          rows breaking the "all stats filled or all -1" rule
+    progress        unique videoIDs with every stat filled on some row
+    stats-columns   non-empty cells per stat column
+    titles          non-empty titles, channelIDs with several videoIDs
+    conflicts       videoIDs with both title and thumbnail submissions
+
+Usage:
+    python multi_report.py                                  # all reports, all_in_one.csv
+    python multi_report.py --all --reports progress stats-columns
+    python multi_report.py --arrow-cache                    # reuse/build all_in_one.csv.arrow
+"""
+
+import argparse
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from arrow_cache import iter_cached
+from id_codec import IdMap
+from missing_scan import FAILED_MARKERS, row_masks
+from parquet_store import iter_table
+from stats_apply import STAT_COLS
+
+ROOT = Path(__file__).resolve().parent
+ALL_DATA = ROOT / 'All_data'
+DEFAULT_CSV = ALL_DATA / 'all_in_one.csv'
+CHUNKSIZE = 100_000
+
+
+def _filled(series: pd.Series) -> pd.Series:
+    """Non-null and, for text, not blank after stripping."""
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.notna()
+    return series.notna() & (series.astype(str).str.strip() != '')
+
+
+def _is_failed(series: pd.Series) -> np.ndarray:
+    """Cells holding the -1 "unavailable" marker (numeric or text columns)."""
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.eq(-1).fillna(False).to_numpy(dtype=bool)
+    return series.isin(FAILED_MARKERS).to_numpy(dtype=bool)
+
+
+class Report(ABC):
+    """One check fed chunk by chunk; subclasses keep their own running state."""
+
+    name = ''
+    columns: tuple = ()  # columns read for this report (absent ones are skipped)
+    required: tuple = ('videoID',)  # the report is skipped for files lacking these
+
+    def __init__(self):
+        self.results = []  # one entry per scanned file
+
+    def applies(self, csv_path: Path, header: List[str]) -> bool:
+        return set(self.required) <= set(header)
+
+    def start_file(self, csv_path: Path, header: List[str]):
+        self.csv_path = csv_path
+
+    @abstractmethod
+    def update(self, chunk: pd.DataFrame):
+        """Accumulate one chunk of the current file."""
+
+    @abstractmethod
+    def end_file(self):
+        """Store the current file's result in self.results."""
+
+    @abstractmethod
+    def render(self) -> str:
+        """Text of the results of every scanned file."""
+
+
+class StatusReport(Report):
+    """chunk_check_status.py: rows neither fully filled nor fully -1."""
+
+    name = 'status'
+    columns = ('videoID', *STAT_COLS)
+
+    def start_file(self, csv_path, header):
+        super().start_file(csv_path, header)
+        self.total_rows = self.bad_rows = 0
+        self.bad_ids = set()
+
+    def update(self, chunk):
+        # Absent stat columns count as empty, as in missing_scan
+        stats = chunk.reindex(columns=STAT_COLS)
+        video_ids = chunk['videoID'].fillna('').astype(str).str.strip().to_numpy()
+        empty = [stats[c].isna().to_numpy() for c in STAT_COLS]
+        neg1 = [_is_failed(stats[c]) for c in STAT_COLS]
+        _, _, bad, bad_rows = row_masks(video_ids != '', empty, neg1, neg1[STAT_COLS.index('Views')],
+                                        np.logical_or, np.logical_and, np.logical_not)
+        self.total_rows += len(chunk)
+        self.bad_rows += int(bad_rows.sum())
+        self.bad_ids.update(video_ids[bad])
+
+    def end_file(self):
+        self.results.append((self.csv_path.name, self.total_rows, self.bad_rows, len(self.bad_ids)))
+
+    def render(self):
+        lines = []
+        for name, total_rows, bad_rows, bad_ids in self.results:
+            if len(self.results) > 1:
+                lines.append(f"{name}:")
+            lines.append(f"Total rows checked: {total_rows}")
+            lines.append(f"Rows not satisfying filled-or--1 rule: {bad_rows}")
+            lines.append(f"Unique videoIDs needing attention: {bad_ids}")
+        return '\n'.join(lines)
+
+
+class ProgressReport(Report):
+    """EDA/check_youtube_progress.py: unique videoIDs whose stats are all filled on some row."""
+
+    name = 'progress'
+    columns = ('videoID', *STAT_COLS)
+
+    def __init__(self, sleep_s: Optional[float] = None):
+        super().__init__()
+        if sleep_s is None:
+            sleep_s = os.environ.get('YOUTUBE_SLEEP') or os.environ.get('YOUTUBE_API_SLEEP')
+            try:
+                sleep_s = float(sleep_s) if sleep_s is not None else 0.2
+            except ValueError:
+                sleep_s = 0.2
+        self.sleep_s = sleep_s
+
+    def applies(self, csv_path, header):
+        return True  # files without videoID or stats report zeros
+
+    def start_file(self, csv_path, header):
+        super().start_file(csv_path, header)
+        self.present = [c for c in STAT_COLS if c in header] if 'videoID' in header else []
+        self.parts = []
+
+    def update(self, chunk):
+        if self.present:
+            filled = chunk[self.present].notna()
+            self.parts.append(filled.groupby(chunk['videoID'], dropna=False, sort=False).any())
+
+    def end_file(self):
+        total = complete = 0
+        if self.parts:
+            per_id = pd.concat(self.parts).groupby(level=0, dropna=False).any()
+            total, complete = len(per_id), int(per_id.all(axis=1).sum())
+        self.results.append({
+            'file': self.csv_path.name,
+            'total': total,
+            'complete': complete,
+            'missing': total - complete,
+            'pct': (complete / total * 100.0) if total else 0.0,
+        })
+
+    def render(self):
+        lines = [f"{r['file']}: total_unique={r['total']}, complete={r['complete']}, "
+                 f"missing={r['missing']} ({r['pct']:.2f}%)" for r in self.results]
+        total = sum(r['total'] for r in self.results)
+        complete = sum(r['complete'] for r in self.results)
+        missing = sum(r['missing'] for r in self.results)
+        eta_hours = (missing * self.sleep_s) / 3600.0
+        lines.append(f"\nTOTAL: total_unique={total}, complete={complete}, missing={missing}")
+        lines.append(f"Approx. remaining time (@{self.sleep_s:.2f}s/ID): {eta_hours:.2f} hours")
+        return '\n'.join(lines)
+
+
+class StatsColumnsReport(Report):
+    """scripts/check_stats_columns_alldata.py: non-empty stat cells per file."""
+
+    name = 'stats-columns'
+    columns = tuple(STAT_COLS)
+    required = ()
+
+    def applies(self, csv_path, header):
+        return csv_path.name != 'channels_multiple_videos.csv'  # an export, not a data table
+
+    def start_file(self, csv_path, header):
+        super().start_file(csv_path, header)
+        self.total = 0
+        self.counts = {c: 0 for c in STAT_COLS}
+
+    def update(self, chunk):
+        self.total += len(chunk)
+        for c in STAT_COLS:
+            if c in chunk.columns:
+                self.counts[c] += int(_filled(chunk[c]).sum())
+
+    def end_file(self):
+        self.results.append((self.csv_path.name, self.total, self.counts))
+
+    def render(self):
+        lines = ["file," + ",".join(["total", *STAT_COLS])]
+        for name, total, counts in sorted(self.results, key=lambda r: r[0]):
+            lines.append(",".join([name, str(total)] + [str(counts[c]) for c in STAT_COLS]))
+        return '\n'.join(lines)
+
+
+class TitlesReport(Report):
+    """scripts/check_title_and_channels.py: title coverage and multi-video channels."""
+
+    name = 'titles'
+    columns = ('videoID', 'channelID', 'title')
+    required = columns
+
+    def start_file(self, csv_path, header):
+        super().start_file(csv_path, header)
+        self.total_rows = self.nonempty_title = 0
+        self.pairs = []
+
+    def update(self, chunk):
+        self.total_rows += len(chunk)
+        self.nonempty_title += int(_filled(chunk['title']).sum())
+        has_channel = chunk['channelID'].notna() & (chunk['channelID'].astype(str) != '')
+        pairs = chunk.loc[has_channel, ['channelID', 'videoID']].astype(object)
+        self.pairs.append(pairs.drop_duplicates())
+
+    def end_file(self):
+        pairs = pd.concat(self.pairs).drop_duplicates() if self.pairs else pd.DataFrame(columns=['channelID', 'videoID'])
+        per_channel = pairs.groupby('channelID', sort=False)['videoID'].nunique()
+        self.results.append((self.csv_path.name, self.total_rows, self.nonempty_title, per_channel))
+
+    def render(self):
+        lines = []
+        for name, total_rows, nonempty_title, per_channel in self.results:
+            multi = per_channel[per_channel > 1]
+            if len(self.results) > 1:
+                lines.append(f"{name}:")
+            lines.append(f"Total rows scanned: {total_rows}")
+            lines.append(f"Non-empty `title` cells: {nonempty_title} ({nonempty_title/total_rows:.2%})"
+                         if total_rows else f"Non-empty `title` cells: {nonempty_title}")
+            lines.append("")
+            lines.append(f"ChannelIDs present: {len(per_channel)}")
+            lines.append(f"ChannelIDs with >1 distinct videoIDs: {len(multi)}")
+            if len(multi):
+                lines.append("Sample channelIDs with multiple videoIDs (showing up to 20, format: channelID -> count):")
+                for ch, count in multi.head(20).items():
+                    lines.append(f"{ch} -> {count}")
+                if len(multi) > 20:
+                    lines.append(f"... (+{len(multi) - 20} more)")
+        return '\n'.join(lines)
+
+
+class ConflictsReport(Report):
+    """scripts/find_title_thumbnail_conflicts.py: videoIDs submitted as both title and thumbnail."""
+
+    name = 'conflicts'
+    columns = ('videoID', 'title/thumbnail')
+    required = columns
+
+    def start_file(self, csv_path, header):
+        super().start_file(csv_path, header)
+        self.ids = IdMap()  # videoID -> position, first-seen order
+        self.flags = np.zeros(0, dtype=np.uint8)  # per position: 1 title, 2 thumbnail
+
+    def update(self, chunk):
+        chunk = chunk[chunk['title/thumbnail'].notna() & chunk['videoID'].notna()]
+        kinds = chunk['title/thumbnail'].astype(str).str.strip().str.lower()
+        flags = (kinds.str.startswith('title').to_numpy(dtype=np.uint8)
+                 | kinds.str.startswith('thumb').to_numpy(dtype=np.uint8) << 1)
+        positions = self.ids.add(chunk['videoID'].astype(str).to_numpy())
+        self.flags = np.pad(self.flags, (0, len(self.ids) - len(self.flags)))
+        np.bitwise_or.at(self.flags, positions, flags)
+
+    def end_file(self):
+        both = self.ids.ids()[self.flags == 3].tolist()
+        self.results.append((self.csv_path.name, both))
+
+    def render(self):
+        lines = []
+        for name, both in self.results:
+            if len(self.results) > 1:
+                lines.append(f"{name}:")
+            lines.append(f"Found {len(both)} videoIDs with both title and thumbnail submissions")
+            if both:
+                lines.append("Sample (up to 20):")
+                lines.extend(str(vid) for vid in both[:20])
+        return '\n'.join(lines)
+
+
+REPORTS = {cls.name: cls for cls in
+           (StatusReport, ProgressReport, StatsColumnsReport, TitlesReport, ConflictsReport)}
+
+
+def scan_files(csv_paths: Iterable[Path], reports: List[Report], chunksize: int = CHUNKSIZE,
+               use_cache: bool = False) -> List[Report]:
+    """
+    Read each CSV once and feed every chunk to all reports that apply to it.
+
+    Args:
+        csv_paths: Files to scan
+        reports: Report instances; their results accumulate across files
+        chunksize: Rows per chunk
+        use_cache: Read through the Arrow cache (builds `<csv>.arrow` next to each file if missing or stale)
+
+    Returns:
+        The same reports, ready to render()
+    """
+    for csv_path in csv_paths:
+        csv_path = Path(csv_path)
+        try:
+            header = list(pd.read_csv(csv_path, nrows=0).columns)
+        except pd.errors.EmptyDataError:
+            print(f"  {csv_path.name}: empty file, skipped")
+            continue
+        active = [r for r in reports if r.applies(csv_path, header)]
+        if not active:
+            continue
+        wanted = {c for r in active for c in r.columns}
+        columns = [c for c in header if c in wanted] or header[:1]  # row counts need one column
+        for report in active:
+            report.start_file(csv_path, header)
+        read = iter_cached if use_cache else iter_table
+        for chunk in read(csv_path, columns=columns, batch_size=chunksize):
+            for report in active:
+                report.update(chunk)
+        for report in active:
+            report.end_file()
+    return reports
+
+
+def run_reports(names: List[str], csv_paths: Iterable[Path], use_cache: bool = False,
+                **options) -> Dict[str, Report]:
+    """Scan `csv_paths` once for the named reports; options go to the report constructors."""
+    reports = [REPORTS[name](**options.get(name, {})) for name in names]
+    scan_files(csv_paths, reports, use_cache=use_cache)
+    return {report.name: report for report in reports}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run several status reports in one pass over the CSVs')
+    parser.add_argument('--reports', nargs='+', choices=list(REPORTS), default=list(REPORTS),
+                        help='Reports to run (default: all)')
+    parser.add_argument('--files', nargs='+', type=Path, default=None,
+                        help='CSV files to scan (default: All_data/all_in_one.csv)')
+    parser.add_argument('--all', action='store_true', help='Scan every CSV under All_data')
+    parser.add_argument('--arrow-cache', action='store_true',
+                        help='Read through the Arrow cache, building <csv>.arrow next to each file if needed')
+    args = parser.parse_args()
+
+    if args.all:
+        csv_paths = sorted(ALL_DATA.glob('*.csv'))
+    else:
+        csv_paths = args.files or [DEFAULT_CSV]
+    missing = [p for p in csv_paths if not p.exists()]
+    if missing:
+        print(f"Missing file(s): {', '.join(str(p) for p in missing)}")
+        raise SystemExit(1)
+
+    reports = run_reports(args.reports, csv_paths, use_cache=args.arrow_cache)
+    for name, report in reports.items():
+        print("=" * 70)
+        print(name)
+        print("=" * 70)
+        print(report.render())
+        print()
+
+
+if __name__ == '__main__':
+    main()
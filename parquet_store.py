@@ -0,0 +1,299 @@
+"""
+Columnar (Parquet) copies of the All_data and deArrow_data CSVs.
+`convert_csv` streams a CSV into Parquet with the column types from
+table_schema (int64 counters and timestamps, dictionary-encoded
+categoricals, strings elsewhere), optionally hive-partitioned by
+submission type or submission month. `load_table` / `iter_table` read the
+Parquet copy next to a CSV when it is at least as new as the CSV, with
+column pruning and predicate pushdown, and fall back to pandas.read_csv
+otherwise, so scripts can switch over before the conversion has been run.
+
+Usage:
+    python parquet_store.py                          # convert All_data/ and deArrow_data/
+    python parquet_store.py All_data/all_in_one.csv --partition-by month
+"""
+
+import argparse
+import operator
+import shutil
+import time
+import warnings
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+import table_schema
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # optional: loaders fall back to CSV
+    pa = None
+
+ROOT = Path(__file__).resolve().parent
+DEFAULT_DIRS = [ROOT / 'All_data', ROOT / 'deArrow_data']
+BLOCK_SIZE = 32 << 20  # bytes of CSV per record batch while converting
+COMPRESSION = 'zstd'
+
+# --partition-by choice -> (partition column written to paths, derivation)
+PARTITIONS = {
+    'title/thumbnail': 'submission_type',
+    'month': 'submission_month',
+}
+
+Filter = Tuple[str, str, object]  # (column, op, value), pyarrow/pandas read_parquet style
+NUMBER = r'^\s*[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?\s*$'
+
+
+def parquet_path_for(csv_path: Path) -> Path:
+    """Parquet file (or partitioned dataset directory) kept next to a CSV."""
+    return Path(csv_path).with_suffix('.parquet')
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for Parquet conversion: pip install pyarrow")
+
+
+def _schema(header: Sequence[str]):
+    return pa.schema([(c, table_schema.arrow_storage_type(c)) for c in header])
+
+
+def _to_number(column):
+    """Text column -> float64; cells that do not parse as a number become null."""
+    try:
+        return pc.cast(column, pa.float64())
+    except pa.ArrowInvalid:  # stray text: null it instead of failing the whole file
+        trimmed = pc.utf8_trim_whitespace(column)
+        return pc.cast(pc.if_else(pc.match_substring_regex(trimmed, NUMBER), trimmed, None), pa.float64())
+
+
+def _numeric(column, field, source: str):
+    """
+    Numeric column parsed as text, cast to its storage type. Like
+    table_schema.read_csv, a cell that is not a number (or, for integer
+    fields, not an integer in range) becomes null, with a warning.
+    """
+    numbers = _to_number(column)
+    valid = pc.is_valid(numbers)
+    if pa.types.is_integer(field.type):
+        limit = 2.0 ** (field.type.bit_width - 1)
+        in_range = pc.and_(pc.greater_equal(numbers, -limit), pc.less(numbers, limit))
+        whole = pc.fill_null(pc.and_(pc.equal(pc.floor(numbers), numbers), in_range), False)
+        valid = pc.and_(valid, whole)
+    bad = pc.and_(pc.is_valid(column), pc.invert(valid))
+    count = pc.sum(bad).as_py() or 0
+    if count:
+        example = pc.filter(column, bad)[0].as_py()
+        kind = 'integer' if pa.types.is_integer(field.type) else 'numeric'
+        warnings.warn(f"{source}: {count:,} non-{kind} value(s) in {field.name!r} (e.g. {example!r}) "
+                      f"read as missing", stacklevel=3)
+        numbers = pc.if_else(valid, numbers, None)
+    return pc.cast(numbers, field.type)
+
+
+def _typed(batch, schema, source: str = ''):
+    """Cast a parsed batch to the storage schema; bad numeric cells become null (see _numeric)."""
+    return pa.RecordBatch.from_arrays(
+        [_numeric(batch.column(field.name), field, source)
+         if pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+         else pc.cast(batch.column(field.name), field.type)
+         for field in schema], schema=schema)
+
+
+def _with_partition_column(batch, partition_by: str):
+    if partition_by == 'title/thumbnail':
+        kinds = pc.cast(batch.column('title/thumbnail'), pa.string())
+        values = pc.utf8_lower(pc.utf8_trim_whitespace(kinds))
+    else:
+        stamps = pc.cast(batch.column('timeSubmitted'), pa.timestamp('ms'))
+        values = pc.strftime(stamps, format='%Y-%m')
+    return batch.append_column(PARTITIONS[partition_by], values)
+
+
+def read_csv_batches(csv_path: Path):
+    """
+    Stream a CSV as Arrow record batches typed per table_schema.
+
+    Returns:
+        (schema, iterator of RecordBatch)
+    """
+    _require_pyarrow()
+    header = list(pd.read_csv(csv_path, nrows=0).columns)
+    reader = pacsv.open_csv(
+        csv_path,
+        read_options=pacsv.ReadOptions(block_size=BLOCK_SIZE),
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),  # titles may contain newlines
+        convert_options=pacsv.ConvertOptions(
+            column_types={c: table_schema.arrow_read_type(c) for c in header},
+            strings_can_be_null=True),
+    )
+    schema = _schema(header)
+    return schema, (_typed(batch, schema, Path(csv_path).name) for batch in reader)
+
+
+def convert_csv(csv_path: Path, out_path: Optional[Path] = None,
+                partition_by: Optional[str] = None) -> Path:
+    """
+    Stream one CSV into Parquet.
+
+    Args:
+        csv_path: Source CSV
+        out_path: Target file/directory (default: parquet_path_for(csv_path))
+        partition_by: None, 'title/thumbnail' or 'month' (hive-partitioned directory)
+
+    Returns:
+        Path of the written Parquet file or dataset directory
+    """
+    csv_path = Path(csv_path)
+    out_path = Path(out_path) if out_path is not None else parquet_path_for(csv_path)
+    schema, batches = read_csv_batches(csv_path)
+    if partition_by is not None:
+        source = 'timeSubmitted' if partition_by == 'month' else partition_by
+        if source not in schema.names:
+            raise ValueError(f"{csv_path.name} has no {source!r} column to partition by")
+
+    if out_path.is_dir():
+        shutil.rmtree(out_path)
+    elif out_path.exists():
+        out_path.unlink()
+
+    if partition_by is None:
+        with pq.ParquetWriter(out_path, schema, compression=COMPRESSION) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+    else:
+        part = PARTITIONS[partition_by]
+        batches = (_with_partition_column(batch, partition_by) for batch in batches)
+        first = next(batches, None)
+        if first is None:
+            raise ValueError(f"{csv_path.name} has no rows to partition")
+        ds.write_dataset(
+            _chain(first, batches), out_path, schema=first.schema, format='parquet',
+            partitioning=ds.partitioning(pa.schema([(part, pa.string())]), flavor='hive'),
+            file_options=ds.ParquetFileFormat().make_write_options(compression=COMPRESSION),
+            existing_data_behavior='delete_matching',
+        )
+    return out_path
+
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+def _fresh_parquet(path: Path) -> Optional[Path]:
+    """The Parquet copy to read for `path`, or None to read the CSV."""
+    path = Path(path)
+    if path.suffix == '.parquet' or path.is_dir():
+        return path
+    if pa is None:
+        return None
+    pq_path = parquet_path_for(path)
+    if not pq_path.exists():
+        return None
+    if path.exists() and pq_path.stat().st_mtime < path.stat().st_mtime:
+        print(f"  {pq_path.name} is older than {path.name}; reading the CSV (re-run parquet_store.py)")
+        return None
+    return pq_path
+
+
+def _dataset(pq_path: Path):
+    return ds.dataset(pq_path, format='parquet', partitioning='hive' if pq_path.is_dir() else None)
+
+
+_OPS = {'==': operator.eq, '=': operator.eq, '!=': operator.ne, '<': operator.lt,
+        '<=': operator.le, '>': operator.gt, '>=': operator.ge}
+
+
+def _filter_frame(df: pd.DataFrame, filters: Optional[List[Filter]]) -> pd.DataFrame:
+    """Apply (column, op, value) filters to a frame read from CSV."""
+    if not filters:
+        return df
+    mask = pd.Series(True, index=df.index)
+    for col, op, value in filters:
+        if op == 'in':
+            mask &= df[col].isin(value)
+        elif op == 'not in':
+            mask &= ~df[col].isin(value)
+        else:
+            mask &= _OPS[op](df[col], value)
+    return df[mask]
+
+
+def table_columns(path: Path) -> List[str]:
+    """Column names of a table (Parquet copy if fresh, else the CSV header)."""
+    pq_path = _fresh_parquet(path)
+    if pq_path is not None:
+        return list(_dataset(pq_path).schema.names)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def load_table(path: Path, columns: Optional[List[str]] = None,
+               filters: Optional[List[Filter]] = None) -> pd.DataFrame:
+    """
+    Read a table into a DataFrame, preferring its Parquet copy.
+
+    Args:
+        path: CSV path (its Parquet sibling is used when fresh) or a .parquet path
+        columns: Only these columns (None = all)
+        filters: [(column, op, value), ...] ANDed; ops ==, !=, <, <=, >, >=, in, not in.
+                 Pushed down to Parquet row groups/partitions; applied after reading a CSV
+
+    Returns:
+        DataFrame with the selected columns and rows, typed per table_schema
+    """
+    pq_path = _fresh_parquet(path)
+    if pq_path is not None:
+        expr = pq.filters_to_expression(filters) if filters else None
+        table = _dataset(pq_path).to_table(columns=columns, filter=expr)
+        return table.to_pandas(types_mapper=table_schema.pandas_types_mapper)
+    usecols = columns
+    if columns is not None and filters:
+        usecols = list(dict.fromkeys([*columns, *(f[0] for f in filters)]))
+    df = _filter_frame(table_schema.read_csv(path, usecols=usecols), filters)
+    return df[columns] if columns is not None else df
+
+
+def iter_table(path: Path, columns: Optional[List[str]] = None,
+               batch_size: int = 100_000) -> Iterator[pd.DataFrame]:
+    """Yield a table in DataFrame chunks of about `batch_size` rows, preferring its Parquet copy."""
+    pq_path = _fresh_parquet(path)
+    if pq_path is not None:
+        for batch in _dataset(pq_path).to_batches(columns=columns, batch_size=batch_size):
+            yield batch.to_pandas(types_mapper=table_schema.pandas_types_mapper)
+        return
+    yield from table_schema.read_csv(path, usecols=columns, chunksize=batch_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert All_data / deArrow_data CSVs to Parquet')
+    parser.add_argument('paths', nargs='*', type=Path,
+                        help='CSV files or directories (default: All_data/ and deArrow_data/)')
+    parser.add_argument('--partition-by', choices=sorted(PARTITIONS), default=None,
+                        help='Write a hive-partitioned directory instead of a single file')
+    args = parser.parse_args()
+    _require_pyarrow()
+
+    csv_files = []
+    for path in args.paths or DEFAULT_DIRS:
+        csv_files += sorted(path.glob('*.csv')) if path.is_dir() else [path]
+
+    for csv_path in csv_files:
+        start = time.time()
+        try:
+            out = convert_csv(csv_path, partition_by=args.partition_by)
+        except (ValueError, pa.ArrowInvalid) as e:
+            print(f"  ⚠️  {csv_path.name}: skipped ({e})")
+            continue
+        size = sum(f.stat().st_size for f in out.rglob('*.parquet')) if out.is_dir() else out.stat().st_size
+        print(f"  ✓ {csv_path.name} -> {out.name}: {csv_path.stat().st_size/1e6:.1f} MB CSV, "
+              f"{size/1e6:.1f} MB Parquet ({time.time() - start:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Daily YouTube Data API quota tracking for unattended (cron) runs.
+The ledger records units spent in the current quota day (quota resets at
+midnight Pacific Time) so a run spends up to a configured budget and stops
+before the API starts answering 403 quotaExceeded. The work queue keeps the
+videoIDs still to fetch so the next day's run resumes without rescanning
+the CSV.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional
+
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TZ = ZoneInfo("America/Los_Angeles")
+except Exception:  # no tz database (e.g. Windows without tzdata)
+    QUOTA_TZ = timezone(timedelta(hours=-8))
+
+DAILY_QUOTA = 10_000  # default Data API allocation, units/day
+DEFAULT_BUDGET = int(os.getenv("YOUTUBE_API_DAILY_BUDGET", "9900"))  # leave headroom for other tools
+DEFAULT_LEDGER_PATH = Path(os.getenv(
+    "YOUTUBE_QUOTA_LEDGER",
+    Path(__file__).resolve().parent / "All_data" / "api_quota_ledger.json",
+))
+
+
+class QuotaExceededError(Exception):
+    """The API rejected a request because the daily quota is used up."""
+
+    rejected = 1  # calls the API answered with quotaExceeded (each one was still issued)
+
+
+def quota_day(now: Optional[datetime] = None) -> str:
+    """Current quota day (Pacific Time date) as YYYY-MM-DD."""
+    now = now or datetime.now(timezone.utc)
+    return now.astimezone(QUOTA_TZ).strftime('%Y-%m-%d')
+
+
+def _write_atomic(path: Path, text: str):
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(text, encoding='utf-8')
+    os.replace(tmp, path)
+
+
+class QuotaLedger:
+    """Units spent per quota day, persisted as a small JSON file."""
+
+    def __init__(self, path: Path = DEFAULT_LEDGER_PATH, budget: int = DEFAULT_BUDGET):
+        self.path = Path(path)
+        self.budget = budget
+        self.day = quota_day()
+        self.used = 0
+        self.exhausted = False
+        if self.path.exists():
+            state = json.loads(self.path.read_text(encoding='utf-8'))
+            if state.get('day') == self.day:
+                self.used = int(state.get('units_used', 0))
+                self.exhausted = bool(state.get('exhausted', False))
+
+    def _roll_over(self):
+        today = quota_day()
+        if today != self.day:
+            self.day, self.used, self.exhausted = today, 0, False
+
+    def remaining(self) -> int:
+        """Units still spendable today under the budget."""
+        self._roll_over()
+        if self.exhausted:
+            return 0
+        return max(0, self.budget - self.used)
+
+    def spend(self, units: int = 1):
+        self._roll_over()
+        self.used += units
+        self.save()
+
+    def mark_exhausted(self):
+        """Record that the API reported quotaExceeded; nothing more is spent today."""
+        self._roll_over()
+        self.exhausted = True
+        self.save()
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(self.path, json.dumps({
+            'day': self.day,
+            'units_used': self.used,
+            'budget': self.budget,
+            'exhausted': self.exhausted,
+        }, indent=2))
+
+    def __str__(self):
+        state = 'exhausted' if self.exhausted else f'{self.remaining():,} left'
+        return f"{self.day}: {self.used:,}/{self.budget:,} units used ({state})"
+
+
+class WorkQueue:
+    """Pending videoIDs saved between runs, one per line."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self) -> List[str]:
+        with open(self.path, encoding='utf-8') as fh:
+            return [line.strip() for line in fh if line.strip()]
+
+    def save(self, video_ids: List[str]):
+        if not video_ids:
+            self.clear()
+            return
+        _write_atomic(self.path, '\n'.join(video_ids) + '\n')
+
+    def clear(self):
+        if self.path.exists():
+            self.path.unlink()
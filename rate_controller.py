@@ -0,0 +1,119 @@
+"""
+Feedback-driven pacing for the yt-dlp scrapers (AIMD).
+Every fetch reports an outcome. A streak of clean fetches shortens the delay
+by a fixed step and admits one more concurrent request (additive increase
+of rate). Timeouts/errors above a threshold in the recent window, or any
+bot/captcha signal, multiply the delay and halve concurrency
+(multiplicative decrease). The scrapers then run at the fastest rate YouTube
+tolerates instead of a fixed pessimistic sleep.
+"""
+
+import random
+import re
+import threading
+import time
+from collections import deque
+
+# Outcome classes reported by get_video_stats
+OK = 'ok'
+UNAVAILABLE = 'unavailable'  # private/deleted video: the server answered normally
+TIMEOUT = 'timeout'
+BOT = 'bot'
+ERROR = 'error'  # throttling (429), server errors (5xx) and anything unrecognized
+
+# yt-dlp error messages about the video itself (the request was served normally)
+UNAVAILABLE_MARKERS = ('private video', 'video unavailable', 'not available', 'no longer available',
+                       'has been removed', 'been terminated', 'does not exist', 'members-only')
+THROTTLED = re.compile(r'http error (429|5\d\d)|too many requests')
+
+
+def classify_error(message: str) -> str:
+    """
+    Outcome class of a failed yt-dlp extraction, from its error message.
+    Only messages naming the video as private/removed/unavailable count as
+    UNAVAILABLE; throttling, 5xx responses and unknown errors are ERROR so
+    they slow the controller down instead of extending its clean streak.
+    """
+    text = message.lower()
+    if 'bot' in text or 'captcha' in text:
+        return BOT
+    if THROTTLED.search(text):
+        return ERROR
+    if any(marker in text for marker in UNAVAILABLE_MARKERS):
+        return UNAVAILABLE
+    return ERROR
+
+
+class AdaptiveRateController:
+    """AIMD controller for the delay between requests and the number in flight."""
+
+    def __init__(self, initial_delay: float, min_delay: float = 0.0, max_delay: float = 120.0,
+                 max_concurrency: int = 1, step: float = 0.1, increase_every: int = 10,
+                 window: int = 50, error_threshold: float = 0.2,
+                 backoff_factor: float = 2.0, bot_factor: float = 4.0):
+        """
+        Args:
+            initial_delay: Starting delay between requests (seconds)
+            min_delay / max_delay: Bounds for the delay
+            max_concurrency: Upper bound on requests in flight (1 = serial)
+            step: Delay removed after each clean streak
+            increase_every: Clean fetches needed before speeding up
+            window: Number of recent outcomes used for the error rate
+            error_threshold: Error rate in the window that triggers a backoff
+            backoff_factor: Delay multiplier on timeouts/errors
+            bot_factor: Delay multiplier on bot/captcha detection
+        """
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.delay = min(max(initial_delay, min_delay), max_delay)
+        self.max_concurrency = max(1, max_concurrency)
+        self.concurrency = 1
+        self.step = step
+        self.increase_every = increase_every
+        self.error_threshold = error_threshold
+        self.backoff_factor = backoff_factor
+        self.bot_factor = bot_factor
+        self.recent = deque(maxlen=window)
+        self.streak = 0
+        self.backoffs = 0
+        self._lock = threading.Lock()
+
+    def record(self, outcome: str):
+        """Feed one fetch outcome back into the controller."""
+        with self._lock:
+            failed = outcome in (TIMEOUT, ERROR, BOT)
+            self.recent.append(failed)
+            if outcome == BOT:
+                self._back_off(self.bot_factor)
+            elif failed:
+                self.streak = 0
+                if len(self.recent) >= 10 and self.error_rate() > self.error_threshold:
+                    self._back_off(self.backoff_factor)
+            else:
+                self.streak += 1
+                if self.streak >= self.increase_every:
+                    self.streak = 0
+                    self.delay = max(self.min_delay, self.delay - self.step)
+                    self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+
+    def _back_off(self, factor: float):
+        self.delay = min(self.max_delay, max(self.delay, self.step) * factor)
+        self.concurrency = max(1, self.concurrency // 2)
+        self.streak = 0
+        self.recent.clear()  # judge the new rate on fresh outcomes only
+        self.backoffs += 1
+
+    def error_rate(self) -> float:
+        return sum(self.recent) / len(self.recent) if self.recent else 0.0
+
+    def wait(self, jitter: float = 0.0):
+        """Sleep the current delay, randomized by +/- `jitter` (fraction)."""
+        delay = self.delay
+        if jitter:
+            delay *= random.uniform(1 - jitter, 1 + jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def __str__(self):
+        return (f"delay {self.delay:.2f}s, concurrency {self.concurrency}, "
+                f"errors {self.error_rate()*100:.0f}%, backoffs {self.backoffs}")
@@ -0,0 +1,133 @@
+"""
+Append-only journal of fetched video statistics.
+Updaters append each batch of results to a small JSONL segment instead of
+rewriting the whole CSV at every checkpoint; one streaming pass later merges
+the journal into the CSV. Checkpoint cost is proportional to the batch, not
+to the size of the dataset.
+"""
+
+import csv
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable
+
+import pandas as pd
+
+from stats_apply import STAT_COLS, apply_stats, stats_frame
+
+FAILED_STATS = {'channelID': '', 'Views': -1, 'Published': '', 'likes': -1, 'comments': -1}
+MERGE_CHUNKSIZE = 100_000
+
+
+def journal_dir_for(csv_path: Path) -> Path:
+    """Default journal directory for a CSV: `<name>.journal` next to it."""
+    csv_path = Path(csv_path)
+    return csv_path.with_name(csv_path.name + '.journal')
+
+
+class ResultsJournal:
+    """Directory of JSONL segments holding videoID -> stats records (last write wins)."""
+
+    def __init__(self, journal_dir: Path, include_shards: bool = False):
+        """
+        Args:
+            journal_dir: Directory holding the segments (created if missing)
+            include_shards: Also read/merge/clear the segments that sharded
+                            workers wrote to `shard-*/` subdirectories
+        """
+        self.dir = Path(journal_dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.include_shards = include_shards
+        self._segment = None
+        self._fh = None
+
+    def segments(self) -> list:
+        segments = list(self.dir.glob('segment-*.jsonl'))
+        if self.include_shards:
+            segments += self.dir.glob('shard-*/segment-*.jsonl')
+        return sorted(segments, key=lambda p: p.name)  # timestamped names: oldest first
+
+    def _open_segment(self):
+        # One new segment per writer so an interrupted run never corrupts older ones
+        name = f"segment-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.jsonl"
+        self._segment = self.dir / name
+        self._fh = open(self._segment, 'a', encoding='utf-8')
+
+    def append(self, batch: Iterable[str], batch_results: Dict[str, Dict]):
+        """
+        Record one batch: fetched stats for videos in `batch_results` and the
+        failure marker for every other videoID in `batch`.
+        """
+        if self._fh is None:
+            self._open_segment()
+        lines = []
+        for video_id in batch:
+            stats = batch_results.get(video_id) or FAILED_STATS
+            lines.append(json.dumps({'videoID': video_id, **{c: stats[c] for c in STAT_COLS}}))
+        if not lines:
+            return
+        self._fh.write('\n'.join(lines) + '\n')
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def load(self) -> Dict[str, Dict]:
+        """Read every segment into a videoID -> stats dict (later records win)."""
+        results = {}
+        for segment in self.segments():
+            with open(segment, encoding='utf-8') as fh:
+                for line in fh:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line from an interrupted write
+                    results[record.pop('videoID')] = record
+        return results
+
+    def __len__(self):
+        return len(self.load())
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def clear(self):
+        """Delete all segments (after a successful merge)."""
+        self.close()
+        for segment in self.segments():
+            segment.unlink()
+
+    def merge_into_csv(self, csv_path: Path, chunksize: int = MERGE_CHUNKSIZE) -> int:
+        """
+        Apply all journaled results to `csv_path` in one streaming pass,
+        replacing the file atomically, then clear the journal.
+
+        Returns:
+            Number of CSV rows updated
+        """
+        self.close()
+        results = self.load()
+        if not results:
+            return 0
+
+        csv_path = Path(csv_path)
+        updates = stats_frame(results)
+        tmp_path = csv_path.with_name(csv_path.name + '.merging')
+        rows_updated = 0
+
+        # Read everything as text so untouched cells are written back unchanged
+        reader = pd.read_csv(csv_path, dtype=str, keep_default_na=False,
+                             on_bad_lines='skip', chunksize=chunksize)
+        chunk_num = -1
+        for chunk_num, chunk in enumerate(reader):
+            rows_updated += apply_stats(chunk, updates, as_text=True)
+            chunk.to_csv(tmp_path, index=False, quoting=csv.QUOTE_ALL,
+                         mode='w' if chunk_num == 0 else 'a', header=chunk_num == 0)
+
+        if chunk_num < 0:
+            return 0  # header-only CSV: nothing to update, keep the journal
+        os.replace(tmp_path, csv_path)
+        self.clear()
+        return rows_updated
@@ -0,0 +1,168 @@
+"""
+Failure table for videos whose stats could not be fetched.
+Instead of a permanent -1 tombstone, every failure records its reason, the
+attempt count and the next time the videoID is eligible for a retry, using
+exponential backoff per reason. Updaters re-check only the IDs that are due,
+whether their row holds -1 or was left empty (bot checks, timeouts).
+Stored in the same SQLite file as the stats cache.
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+
+from stats_cache import DEFAULT_CACHE_PATH, SQL_BATCH, connect_read_only
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# First retry delay per failure reason; doubles with every further attempt
+RETRY_BASE = {
+    'not_found': 7 * DAY,      # API returned no item: deleted/private, rarely comes back
+    'unavailable': 7 * DAY,    # yt-dlp: unavailable/private
+    'timeout': 1 * HOUR,
+    'request_error': 1 * HOUR,  # HTTP/network error for the whole batch
+    'bot': 1 * HOUR,
+    'error': 6 * HOUR,
+    'legacy': 0,               # -1 rows written before this table existed: due immediately
+}
+DEFAULT_BASE = 6 * HOUR
+MAX_BACKOFF = 60 * DAY
+
+
+def backoff_seconds(reason: str, attempts: int) -> float:
+    """Delay before the next retry after `attempts` failures for `reason`."""
+    base = RETRY_BASE.get(reason, DEFAULT_BASE)
+    return min(MAX_BACKOFF, base * 2 ** max(0, attempts - 1))
+
+
+class FailureTable:
+    """videoID -> (reason, attempts, next_eligible) with exponential backoff."""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS fetch_failures (
+                videoID TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                reason TEXT NOT NULL,
+                attempts INTEGER NOT NULL,
+                first_failed REAL NOT NULL,
+                last_failed REAL NOT NULL,
+                next_eligible REAL NOT NULL
+            )
+        """)
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS fetch_failures_due ON fetch_failures (source, next_eligible)")
+        self.conn.commit()
+
+    def record_failures(self, video_ids: Iterable[str], reason: str, source: str):
+        """Count one more failed attempt for each ID and schedule its next retry."""
+        now = time.time()
+        ids = list(video_ids)
+        for i in range(0, len(ids), SQL_BATCH):
+            chunk = ids[i:i+SQL_BATCH]
+            placeholders = ','.join('?' * len(chunk))
+            attempts = dict(self.conn.execute(
+                f"SELECT videoID, attempts FROM fetch_failures WHERE videoID IN ({placeholders})", chunk))
+            rows = []
+            for vid in chunk:
+                n = attempts.get(vid, 0) + 1
+                rows.append((vid, source, reason, n, now, now, now + backoff_seconds(reason, n)))
+            self.conn.executemany("""
+                INSERT INTO fetch_failures VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(videoID) DO UPDATE SET
+                    source = excluded.source, reason = excluded.reason,
+                    attempts = excluded.attempts, last_failed = excluded.last_failed,
+                    next_eligible = excluded.next_eligible
+            """, rows)
+        self.conn.commit()
+
+    def record_successes(self, video_ids: Iterable[str]):
+        """Forget failures for IDs that have now been fetched."""
+        ids = list(video_ids)
+        for i in range(0, len(ids), SQL_BATCH):
+            chunk = ids[i:i+SQL_BATCH]
+            self.conn.execute(
+                f"DELETE FROM fetch_failures WHERE videoID IN ({','.join('?' * len(chunk))})", chunk)
+        self.conn.commit()
+
+    def seed_legacy(self, video_ids: Iterable[str], source: str):
+        """Register -1 rows that have no failure record yet, due immediately."""
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO fetch_failures VALUES (?, ?, 'legacy', 0, ?, ?, ?)",
+            ((vid, source, now, now, now) for vid in video_ids))
+        self.conn.commit()
+
+    def due(self, source: Optional[str] = None, now: Optional[float] = None) -> List[str]:
+        """IDs whose next retry time has passed (optionally for one source only)."""
+        now = time.time() if now is None else now
+        if source is None:
+            rows = self.conn.execute(
+                "SELECT videoID FROM fetch_failures WHERE next_eligible <= ?", (now,))
+        else:
+            rows = self.conn.execute(
+                "SELECT videoID FROM fetch_failures WHERE source = ? AND next_eligible <= ?", (source, now))
+        return [r[0] for r in rows]
+
+    def waiting(self, source: Optional[str] = None, now: Optional[float] = None) -> List[str]:
+        """IDs still backing off: their next retry time has not come yet (optionally for one source only)."""
+        now = time.time() if now is None else now
+        if source is None:
+            rows = self.conn.execute(
+                "SELECT videoID FROM fetch_failures WHERE next_eligible > ?", (now,))
+        else:
+            rows = self.conn.execute(
+                "SELECT videoID FROM fetch_failures WHERE source = ? AND next_eligible > ?", (source, now))
+        return [r[0] for r in rows]
+
+    def copy_from(self, path: Path, keep: Optional[Callable[[str], bool]] = None,
+                  replace: bool = True) -> int:
+        """
+        Copy failure rows from another file's failure table.
+
+        Args:
+            path: SQLite file to read (read-only; missing file or table = nothing to copy)
+            keep: Only videoIDs for which this returns True (None = all)
+            replace: Overwrite rows already here (False keeps them)
+
+        Returns:
+            Number of rows copied
+        """
+        if not Path(path).exists():
+            return 0
+        src = connect_read_only(path)
+        try:
+            rows = src.execute("SELECT * FROM fetch_failures").fetchall()
+        except sqlite3.OperationalError:
+            rows = []
+        finally:
+            src.close()
+        if keep is not None:
+            rows = [row for row in rows if keep(row[0])]
+        self.conn.executemany(
+            f"INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO fetch_failures VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        self.conn.commit()
+        return len(rows)
+
+    def summary(self) -> dict:
+        """Counts of failing IDs by reason and how many are due now."""
+        by_reason = dict(self.conn.execute(
+            "SELECT reason, COUNT(*) FROM fetch_failures GROUP BY reason"))
+        due = self.conn.execute(
+            "SELECT COUNT(*) FROM fetch_failures WHERE next_eligible <= ?", (time.time(),)).fetchone()[0]
+        return {'by_reason': by_reason, 'due': due}
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
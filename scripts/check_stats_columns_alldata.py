@@ -1,39 +1,16 @@
 import os
-import pandas as pd
+import sys
+from pathlib import Path
 
-ALLOWED = ["channelID", "Views", "Published", "likes", "comments"]
-
-
-def check_file(path):
-    counts = {c: 0 for c in ALLOWED}
-    total = 0
-    chunksize = 100_000
-    try:
-        for chunk in pd.read_csv(path, chunksize=chunksize):
-            total += len(chunk)
-            for c in ALLOWED:
-                if c in chunk.columns:
-                    # treat NaN or empty-string as empty
-                    vals = chunk[c].fillna("").astype(str).str.strip()
-                    counts[c] += (vals != "").sum()
-    except pd.errors.EmptyDataError:
-        return path, 0, counts
-    return path, total, counts
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from multi_report import run_reports  # noqa: E402
 
 
 def main():
     base = "All_data"
     files = [f for f in os.listdir(base) if f.endswith(".csv") and f != "channels_multiple_videos.csv"]
-    results = []
-    for f in sorted(files):
-        path = os.path.join(base, f)
-        p, total, counts = check_file(path)
-        results.append((f, total, counts))
-
-    print("file,total,channelID,Views,Published,likes,comments")
-    for f, total, counts in results:
-        row = [f, str(total)] + [str(counts[c]) for c in ALLOWED]
-        print(",".join(row))
+    paths = [Path(base) / f for f in sorted(files)]
+    print(run_reports(["stats-columns"], paths)["stats-columns"].render())
 
 
 if __name__ == '__main__':
@@ -1,75 +1,96 @@
+import sys
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from arrow_cache import iter_cached  # noqa: E402
+from id_codec import IdMap  # noqa: E402
+
+KEYS = ["channelID", "video"]
+
 
 def main(infile="All_data/all_in_one.csv", outfile="All_data/channels_multiple_videos.csv"):
     cols = ["videoID", "channelID", "title/thumbnail", "Published", "nb_submissions"]
     chunksize = 100_000
 
-    channels = {}  # channelID -> { videoID -> info }
+    # (channelID, video) aggregates per chunk, with videoIDs as IdMap positions
+    # instead of str keys; merged once at the end
+    videos = IdMap()
+    parts = []
+    other_types = []  # (channelID, video, type) for types other than title/thumbnail
+    row = 0
 
-    for chunk in pd.read_csv(infile, usecols=cols, chunksize=chunksize):
-        for vid, ch, ttype, pub, nb in zip(chunk["videoID"], chunk["channelID"], chunk["title/thumbnail"], chunk["Published"], chunk["nb_submissions"]):
-            if pd.isna(ch) or ch == "":
-                continue
-            chd = channels.setdefault(ch, {})
-            v = chd.get(vid)
-            if v is None:
-                v = {
-                    "published": None,
-                    "types": set(),
-                    "nb_title_max": None,
-                    "nb_thumb_max": None,
-                }
-                chd[vid] = v
+    for chunk in iter_cached(infile, columns=cols, batch_size=chunksize):
+        first_row = row + np.arange(len(chunk))
+        row += len(chunk)
+        keep = (chunk["channelID"].notna() & (chunk["channelID"].astype(str) != "")
+                & chunk["videoID"].notna()).to_numpy()
+        chunk = chunk[keep]
+        kinds = chunk["title/thumbnail"].astype(str).str.strip().str.lower().where(chunk["title/thumbnail"].notna())
+        is_title = kinds.str.startswith("title").fillna(False).astype(bool)
+        is_thumb = kinds.str.startswith("thumb").fillna(False).astype(bool) & ~is_title
+        nb = np.trunc(pd.to_numeric(chunk["nb_submissions"], errors="coerce").astype(float))
+        frame = pd.DataFrame({
+            "channelID": chunk["channelID"].astype(str).to_numpy(),
+            "video": videos.add(chunk["videoID"].astype(str).to_numpy()),
+            "first_row": first_row[keep],
+            "Published": chunk["Published"].to_numpy(),
+            "title": is_title.to_numpy(),
+            "thumb": is_thumb.to_numpy(),
+            "nb_title": nb.where(is_title).to_numpy(),
+            "nb_thumb": nb.where(is_thumb).to_numpy(),
+        })
+        other = (kinds.notna() & ~is_title & ~is_thumb).to_numpy()
+        if other.any():
+            other_types.extend(zip(frame["channelID"][other], frame["video"][other], kinds[other]))
+        parts.append(_aggregate(frame))
 
-            # published: keep first non-null
-            if v["published"] is None and not pd.isna(pub):
-                v["published"] = pub
+    if not parts:
+        pd.DataFrame().to_csv(outfile, index=False)
+        print(f"Wrote 0 rows for 0 channels to {outfile}")
+        return
+    agg = _aggregate(pd.concat(parts))
 
-            if not pd.isna(ttype):
-                s = str(ttype).strip().lower()
-                if s.startswith("title"):
-                    v["types"].add("title")
-                    try:
-                        if not pd.isna(nb):
-                            n = int(nb)
-                            if v["nb_title_max"] is None or n > v["nb_title_max"]:
-                                v["nb_title_max"] = n
-                    except Exception:
-                        pass
-                elif s.startswith("thumb"):
-                    v["types"].add("thumbnail")
-                    try:
-                        if not pd.isna(nb):
-                            n = int(nb)
-                            if v["nb_thumb_max"] is None or n > v["nb_thumb_max"]:
-                                v["nb_thumb_max"] = n
-                    except Exception:
-                        pass
-                else:
-                    v["types"].add(s)
+    # keep channels with >1 videos, in order of first appearance (channel, then video)
+    per_channel = agg.groupby(level="channelID", sort=False)["first_row"]
+    agg = agg[(per_channel.transform("size") > 1).to_numpy()]
+    agg = agg.assign(channel_row=per_channel.transform("min")).sort_values(["channel_row", "first_row"])
 
-    # collect rows for channels with >1 videos
-    rows = []
-    chan_count = 0
-    for ch, vids in channels.items():
-        if len(vids) <= 1:
-            continue
-        chan_count += 1
-        for vid, info in vids.items():
-            rows.append({
-                "channelID": ch,
-                "videoID": vid,
-                "Published": info["published"],
-                "submission_types": ";".join(sorted(info["types"])) if info["types"] else "",
-                "nb_title_max": info["nb_title_max"],
-                "nb_thumb_max": info["nb_thumb_max"],
-            })
+    types = pd.Series(np.select([agg["title"] & agg["thumb"], agg["title"], agg["thumb"]],
+                                ["thumbnail;title", "title", "thumbnail"], ""), index=agg.index)
+    if other_types:
+        extra = pd.DataFrame(other_types, columns=[*KEYS, "type"]).groupby(KEYS, sort=False)["type"].agg(set)
+        for key in extra.index.intersection(agg.index):
+            found = extra[key] | {t for t, flag in (("title", agg.at[key, "title"]),
+                                                   ("thumbnail", agg.at[key, "thumb"])) if flag}
+            types[key] = ";".join(sorted(found))
 
-    df = pd.DataFrame(rows)
+    chan_count = agg.index.get_level_values("channelID").nunique()
+    df = pd.DataFrame({
+        "channelID": agg.index.get_level_values("channelID"),
+        "videoID": videos.ids()[agg.index.get_level_values("video").to_numpy(dtype=np.int64)],
+        "Published": agg["Published"].to_numpy(),
+        "submission_types": types.to_numpy(),
+        "nb_title_max": agg["nb_title"].to_numpy(),
+        "nb_thumb_max": agg["nb_thumb"].to_numpy(),
+    }) if len(agg) else pd.DataFrame()
     df.to_csv(outfile, index=False)
     print(f"Wrote {len(df)} rows for {chan_count} channels to {outfile}")
 
 
+def _aggregate(frame: pd.DataFrame) -> pd.DataFrame:
+    """Per (channelID, video): first row, first non-null Published, submission types, max nb per type."""
+    return frame.groupby(KEYS, sort=False).agg(
+        first_row=("first_row", "min"),
+        Published=("Published", "first"),
+        title=("title", "any"),
+        thumb=("thumb", "any"),
+        nb_title=("nb_title", "max"),
+        nb_thumb=("nb_thumb", "max"),
+    )
+
+
 if __name__ == '__main__':
     main()
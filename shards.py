@@ -0,0 +1,84 @@
+"""
+Hash-partitioned ownership of videoIDs for multi-worker enrichment.
+Each videoID belongs to exactly one of N shards (CRC32 of the ID, stable
+across processes, machines and Python versions). A worker started with
+--shard K/N fetches only its own IDs and keeps its own journal segments,
+work queue, quota ledger and SQLite file for new stats cache entries and
+failure records (the shared stats cache is only read), so shards never
+contend for a write lock and any one of them can crash and resume on its
+own. A single merge pass then folds every shard's segments into the CSV and
+its database into the shared one.
+
+The daily API quota belongs to the key, not the process: each shard's
+ledger gets budget // N, so N shards on one key never spend more than
+--budget together. Shards on different keys can raise --budget accordingly.
+
+Usage (one line per process or host, then merge once all have finished):
+    python batch_update_with_api.py --shard 0/8
+    ...
+    python batch_update_with_api.py --shard 7/8
+    python batch_update_with_api.py --merge-journal
+"""
+
+import argparse
+import zlib
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+from results_journal import journal_dir_for
+
+Shard = Tuple[int, int]  # (index, count), index in 0..count-1
+
+
+def parse_shard(text: str) -> Shard:
+    """argparse type for 'K/N' (0-based shard K of N)."""
+    try:
+        index, count = (int(part) for part in text.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected K/N, got {text!r}")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard index must be in 0..{count - 1}, got {text!r}")
+    return index, count
+
+
+def shard_of(video_id: str, count: int) -> int:
+    """Shard owning a videoID."""
+    return zlib.crc32(video_id.encode('utf-8')) % count
+
+
+def in_shard(video_ids: Iterable[str], shard: Shard) -> List[str]:
+    """The subset of `video_ids` owned by `shard`, order preserved."""
+    index, count = shard
+    return [v for v in video_ids if shard_of(v, count) == index]
+
+
+def shard_name(shard: Shard) -> str:
+    index, count = shard
+    return f"shard-{index}-of-{count}"
+
+
+def shard_journal_dir(csv_path: Path, shard: Shard) -> Path:
+    """Per-shard journal directory inside the CSV's journal directory."""
+    return journal_dir_for(csv_path) / shard_name(shard)
+
+
+def shard_queue_path(csv_path: Path, shard: Shard) -> Path:
+    csv_path = Path(csv_path)
+    return csv_path.with_name(f"{csv_path.name}.{shard_name(shard)}.queue")
+
+
+def shard_db_path(csv_path: Path, shard: Shard) -> Path:
+    """Per-shard SQLite file (stats cache entries and failure table) next to the CSV."""
+    csv_path = Path(csv_path)
+    return csv_path.with_name(f"{csv_path.name}.{shard_name(shard)}.sqlite")
+
+
+def shard_db_paths(csv_path: Path) -> List[Path]:
+    """Every shard's SQLite file for a CSV."""
+    csv_path = Path(csv_path)
+    return sorted(csv_path.parent.glob(f"{csv_path.name}.shard-*-of-*.sqlite"))
+
+
+def shard_ledger_path(ledger_path: Path, shard: Shard) -> Path:
+    ledger_path = Path(ledger_path)
+    return ledger_path.with_name(f"{ledger_path.stem}.{shard_name(shard)}{ledger_path.suffix}")
@@ -0,0 +1,125 @@
+"""
+Persistent on-disk cache of YouTube video statistics, keyed by videoID.
+Shared by batch_update_with_api.py, batch_update_youtube_stats.py and
+batch_update_stealth.py so a video fetched once is never refetched when
+another All_data CSV is derived from the same videos.
+"""
+
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+STAT_COLS = ['channelID', 'Views', 'Published', 'likes', 'comments']
+DEFAULT_CACHE_PATH = Path(os.getenv(
+    "YOUTUBE_STATS_CACHE",
+    Path(__file__).resolve().parent / "All_data" / "video_stats_cache.sqlite",
+))
+SQL_BATCH = 900  # stay under SQLite's bound-parameter limit
+
+
+def connect_read_only(path: Path) -> sqlite3.Connection:
+    """Connection that can only read `path` (no write lock, nothing created)."""
+    return sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+
+
+class StatsCache:
+    """SQLite-backed videoID -> stats store with fetch time and source."""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, max_age_days: Optional[float] = None,
+                 read_only: bool = False):
+        """
+        Args:
+            path: SQLite file to open (created if missing)
+            max_age_days: Ignore entries older than this many days (None = never expire)
+            read_only: Open for lookups only, never taking the write lock
+                       (a missing file then behaves as an empty cache)
+        """
+        self.path = Path(path)
+        self.max_age = max_age_days * 86400 if max_age_days is not None else None
+        if read_only:
+            self.conn = connect_read_only(self.path) if self.path.exists() else None
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS video_stats (
+                videoID TEXT PRIMARY KEY,
+                fetched_at REAL NOT NULL,
+                source TEXT NOT NULL,
+                channelID TEXT,
+                Views INTEGER,
+                Published TEXT,
+                likes INTEGER,
+                comments INTEGER
+            )
+        """)
+        self.conn.commit()
+
+    def get_many(self, video_ids: Iterable[str]) -> Dict[str, Dict]:
+        """Return cached stats for every known videoID in `video_ids`."""
+        if self.conn is None:
+            return {}
+        ids = [str(v) for v in video_ids]
+        cutoff = time.time() - self.max_age if self.max_age is not None else 0.0
+        results = {}
+        for i in range(0, len(ids), SQL_BATCH):
+            chunk = ids[i:i+SQL_BATCH]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT videoID, {', '.join(STAT_COLS)} FROM video_stats "
+                f"WHERE fetched_at >= ? AND videoID IN ({placeholders})",
+                [cutoff, *chunk],
+            )
+            for row in rows:
+                results[row[0]] = dict(zip(STAT_COLS, row[1:]))
+        return results
+
+    def put_many(self, results: Dict[str, Dict], source: str):
+        """Store fetched stats; failure markers (Views == -1) are not cached."""
+        now = time.time()
+        rows = [
+            (vid, now, source, *(s[c] for c in STAT_COLS))
+            for vid, s in results.items()
+            if s and s.get('Views') != -1
+        ]
+        if not rows:
+            return
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO video_stats (videoID, fetched_at, source, {', '.join(STAT_COLS)}) "
+            f"VALUES ({','.join('?' * (3 + len(STAT_COLS)))})",
+            rows,
+        )
+        self.conn.commit()
+
+    def copy_from(self, path: Path) -> int:
+        """Copy every entry of another stats cache file into this one (theirs win); returns the count."""
+        src = connect_read_only(path)
+        try:
+            rows = src.execute("SELECT * FROM video_stats").fetchall()
+        except sqlite3.OperationalError:
+            rows = []  # that file has no stats table
+        finally:
+            src.close()
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO video_stats VALUES ({','.join('?' * (3 + len(STAT_COLS)))})", rows)
+        self.conn.commit()
+        return len(rows)
+
+    def __len__(self):
+        if self.conn is None:
+            return 0
+        return self.conn.execute("SELECT COUNT(*) FROM video_stats").fetchone()[0]
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
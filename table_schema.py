@@ -0,0 +1,253 @@
+"""
+One place for the column types of every table the project reads:
+All_data/*.csv (all_in_one and its subsets) and deArrow_data/*.csv.
+Without it each script let pandas guess, which gives object columns and
+mixed-type warnings for Views/likes/Published and float counters.
+
+Kinds:
+    string    free text and unique keys (videoID, title, UUID)
+    category  low-cardinality or highly repeated strings -> pandas categorical
+    count     integer counters -> nullable Int32 (empty cells and "12345.0" both read,
+              anything else becomes missing with a warning)
+    bigcount  counters that can pass 2**31 (Views) -> nullable Int64
+    flag      0/1/-1 markers -> nullable Int8
+    ms        Unix time in milliseconds (timeSubmitted) -> nullable Int64
+    float     genuinely fractional values (thumbnail timestamps, videoInfo.published)
+
+Columns not listed here are left to pandas. read_csv() is the drop-in for
+pd.read_csv; arrow_storage_type()/pandas_types_mapper() give parquet_store the
+same types. `python table_schema.py` prints how much memory the typed load saves.
+"""
+
+import argparse
+import warnings
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # only needed by parquet_store
+    pa = None
+
+ROOT = Path(__file__).resolve().parent
+DEFAULT_DIRS = [ROOT / 'All_data', ROOT / 'deArrow_data']
+
+STRING, CATEGORY, COUNT, BIG_COUNT, FLAG, MS, FLOAT = (
+    'string', 'category', 'count', 'bigcount', 'flag', 'ms', 'float')
+
+COLUMNS = {
+    # all_in_one.csv and its subsets (titles_only, thumbnail_only, casual_*)
+    'videoID': STRING,
+    'title': STRING,
+    'original_title': STRING,
+    'title/thumbnail': CATEGORY,
+    'category': CATEGORY,
+    'casual': CATEGORY,
+    'timeSubmitted': MS,
+    'nb_submissions': COUNT,
+    'channelID': CATEGORY,
+    'Views': BIG_COUNT,
+    'Published': STRING,  # YYYY-MM-DD from the enrichment, kept as text
+    'likes': COUNT,
+    'comments': COUNT,
+    # deArrow_data
+    'UUID': STRING,
+    'hashedVideoID': STRING,
+    'userID': CATEGORY,
+    'service': CATEGORY,
+    'userAgent': CATEGORY,
+    'original': FLAG,
+    'casualMode': FLAG,
+    'locked': FLAG,
+    'shadowHidden': FLAG,
+    'verification': FLAG,
+    'removed': FLAG,
+    'votes': COUNT,
+    'downvotes': COUNT,
+    'upvotes': COUNT,
+    'titleID': COUNT,
+    'id': COUNT,
+    'timestamp': FLOAT,  # seconds into the video (thumbnailTimestamps)
+    'published': FLOAT,  # Unix seconds (videoInfo)
+}
+
+# Known layouts, for reference (other files' columns are looked up in COLUMNS too)
+TABLES = {
+    'all_in_one.csv': ['videoID', 'title', 'title/thumbnail', 'original_title', 'category',
+                       'timeSubmitted', 'nb_submissions', 'channelID', 'Views', 'Published',
+                       'likes', 'comments'],
+    'titles.csv': ['videoID', 'title', 'original', 'userID', 'service', 'hashedVideoID',
+                   'timeSubmitted', 'UUID', 'casualMode', 'userAgent'],
+    'titleVotes.csv': ['UUID', 'votes', 'locked', 'shadowHidden', 'verification', 'downvotes', 'removed'],
+    'thumbnails.csv': ['videoID', 'original', 'userID', 'service', 'hashedVideoID',
+                       'timeSubmitted', 'UUID', 'casualMode', 'userAgent'],
+    'thumbnailVotes.csv': ['UUID', 'votes', 'locked', 'shadowHidden', 'downvotes', 'removed'],
+    'thumbnailTimestamps.csv': ['UUID', 'timestamp'],
+    'casualVotes.csv': ['UUID', 'videoID', 'hashedVideoID', 'category', 'upvotes', 'timeSubmitted', 'titleID'],
+    'casualVoteTitles.csv': ['videoID', 'id', 'hashedVideoID', 'title'],
+    'videoInfo.csv': ['videoID', 'channelID', 'title', 'published'],
+}
+
+PANDAS_DTYPES = {
+    STRING: str,
+    CATEGORY: 'category',
+    COUNT: 'Int32',
+    BIG_COUNT: 'Int64',
+    FLAG: 'Int8',
+    MS: 'Int64',
+    FLOAT: 'float64',
+}
+
+INTEGER_KINDS = (COUNT, BIG_COUNT, FLAG, MS)
+INTEGER_DTYPES = {PANDAS_DTYPES[kind] for kind in INTEGER_KINDS}
+
+
+def pandas_dtypes(columns: Iterable[str]) -> Dict[str, object]:
+    """dtype= mapping for pd.read_csv covering the known columns among `columns`."""
+    return {c: PANDAS_DTYPES[COLUMNS[c]] for c in columns if c in COLUMNS}
+
+
+def read_csv(path, usecols: Optional[List[str]] = None, **kwargs):
+    """
+    pd.read_csv with the registry's dtypes for every known column present.
+
+    Integer columns are parsed as float (much faster than pandas' nullable
+    int parser) and cast after. A cell that is not an integer ("abc", "N/A",
+    "1.5") does not fail the read: its column is re-parsed as text, the bad
+    cells become missing and a warning says how many there were. Chunked
+    reads always take that tolerant path, since a chunk cannot be re-read.
+
+    Args:
+        path: CSV file
+        usecols: Only these columns (None = all)
+        **kwargs: Passed through (chunksize, nrows, ...); an explicit dtype= wins per column
+
+    Returns:
+        DataFrame, or an iterator of DataFrames when chunksize is given
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    columns = [c for c in header if usecols is None or c in usecols]
+    dtype = {**pandas_dtypes(columns), **(kwargs.pop('dtype', None) or {})}
+    integers = {c: d for c, d in dtype.items() if d in INTEGER_DTYPES}
+    kwargs.setdefault('low_memory', False)
+    if kwargs.get('chunksize') is not None:
+        reader = pd.read_csv(path, usecols=usecols, dtype={**dtype, **dict.fromkeys(integers, str)}, **kwargs)
+        return (_cast_integers(chunk, integers, path) for chunk in reader)
+    try:
+        df = pd.read_csv(path, usecols=usecols, dtype={**dtype, **dict.fromkeys(integers, 'float64')}, **kwargs)
+    except ValueError:
+        df = pd.read_csv(path, usecols=usecols, dtype={**dtype, **dict.fromkeys(integers, str)}, **kwargs)
+    return _cast_integers(df, integers, path)
+
+
+def _cast_integers(df: pd.DataFrame, integers: Dict[str, str], path) -> pd.DataFrame:
+    """Cast float/text columns to their nullable int dtype; non-integer cells become missing (with a warning)."""
+    for column, dtype in integers.items():
+        if column not in df:
+            continue
+        values = df[column]
+        numbers = pd.to_numeric(values, errors='coerce')
+        info = np.iinfo(pd.api.types.pandas_dtype(dtype).numpy_dtype)
+        unparsed = numbers.isna() & values.notna()
+        bad = unparsed | (numbers.notna() & (numbers % 1 != 0)) | (numbers < info.min) | (numbers > info.max)
+        if bad.any():
+            warnings.warn(f"{Path(path).name}: {int(bad.sum()):,} non-integer value(s) in {column!r} "
+                          f"(e.g. {values[bad].iloc[0]!r}) read as missing", stacklevel=3)
+            numbers = numbers.mask(bad)
+        df[column] = numbers.astype(dtype)
+    return df
+
+
+def arrow_storage_type(column: str):
+    """Arrow type a column is stored as in Parquet (strings for unknown columns)."""
+    kind = COLUMNS.get(column, STRING)
+    if kind in (BIG_COUNT, MS):
+        return pa.int64()
+    if kind == COUNT:
+        return pa.int32()
+    if kind == FLAG:
+        return pa.int8()
+    if kind == FLOAT:
+        return pa.float64()
+    if kind == CATEGORY:
+        return pa.dictionary(pa.int32(), pa.string())
+    return pa.string()
+
+
+def arrow_read_type(column: str):
+    """Arrow type to parse a CSV column as before casting to arrow_storage_type."""
+    # Numbers are parsed as text too: enriched CSVs hold counters as "12345.0",
+    # and a stray non-numeric cell must become null, not fail the whole file
+    return pa.string()
+
+
+def pandas_types_mapper(arrow_type):
+    """types_mapper for Table.to_pandas: nullable ints, like read_csv()."""
+    if arrow_type == pa.int64():
+        return pd.Int64Dtype()
+    if arrow_type == pa.int32():
+        return pd.Int32Dtype()
+    if arrow_type == pa.int8():
+        return pd.Int8Dtype()
+    return None
+
+
+def memory_report(csv_path: Path, nrows: Optional[int] = None) -> pd.DataFrame:
+    """
+    Per-column memory of a CSV loaded with pandas' defaults vs with the registry.
+
+    Returns:
+        DataFrame indexed by column: default dtype/MB, typed dtype/MB, saving %
+    """
+    default = pd.read_csv(csv_path, nrows=nrows, low_memory=False)
+    typed = read_csv(csv_path, nrows=nrows)
+    before = default.memory_usage(deep=True, index=False)
+    after = typed.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        'default_dtype': default.dtypes.astype(str),
+        'default_mb': before / 1e6,
+        'typed_dtype': typed.dtypes.astype(str),
+        'typed_mb': after / 1e6,
+    })
+    report['saving_pct'] = (1 - report['typed_mb'] / report['default_mb'].where(report['default_mb'] > 0)) * 100
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Memory of each CSV with default vs registry dtypes')
+    parser.add_argument('paths', nargs='*', type=Path,
+                        help='CSV files or directories (default: All_data/ and deArrow_data/)')
+    parser.add_argument('--nrows', type=int, default=None, help='Only load the first N rows of each file')
+    parser.add_argument('--columns', action='store_true', help='Print the per-column breakdown')
+    args = parser.parse_args()
+
+    csv_files = []
+    for path in args.paths or DEFAULT_DIRS:
+        csv_files += sorted(path.glob('*.csv')) if path.is_dir() else [path]
+
+    print(f"{'file':<32} {'rows':>10} {'default MB':>11} {'typed MB':>9} {'saving':>7}")
+    total_before = total_after = 0.0
+    for csv_path in csv_files:
+        try:
+            report = memory_report(csv_path, args.nrows)
+            rows = len(pd.read_csv(csv_path, usecols=[0], nrows=args.nrows))
+        except (ValueError, TypeError, pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+            print(f"{csv_path.name:<32} ⚠️  skipped ({e})")
+            continue
+        before, after = report['default_mb'].sum(), report['typed_mb'].sum()
+        total_before += before
+        total_after += after
+        saving = (1 - after / before) * 100 if before else 0.0
+        print(f"{csv_path.name:<32} {rows:>10,} {before:>11.1f} {after:>9.1f} {saving:>6.0f}%")
+        if args.columns:
+            print(report.round(2).to_string(), end='\n\n')
+    if total_before:
+        print(f"{'TOTAL':<32} {'':>10} {total_before:>11.1f} {total_after:>9.1f} "
+              f"{(1 - total_after / total_before) * 100:>6.0f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+import csv
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import missing_scan  # noqa: E402
+from missing_scan import scan_missing_work  # noqa: E402
+
+
+def _write_csv(path: Path, rows: int):
+    """all_in_one-like CSV whose quoted titles contain newlines; every third video is filled, every fifth is -1."""
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.writer(fh, quoting=csv.QUOTE_ALL)
+        writer.writerow(['videoID', 'title', 'channelID', 'Views', 'Published', 'likes', 'comments'])
+        for i in range(rows):
+            title = f"Title {i}\nsecond line of a long title {'x' * 40}"
+            if i % 3 == 0:
+                stats = ['UCchannel', '12345.0', '2024-01-01', '10.0', '3.0']
+            elif i % 5 == 0:
+                stats = ['-1', '-1', '-1', '-1', '-1']
+            else:
+                stats = [''] * 5
+            writer.writerow([f'vid{i:08d}', title, *stats])
+
+
+def test_arrow_scan_handles_newlines_in_titles_across_blocks(tmp_path, monkeypatch):
+    pytest.importorskip('pyarrow')
+    monkeypatch.setattr(missing_scan, 'BLOCK_SIZE', 1 << 14)
+    csv_path = tmp_path / 'all_in_one.csv'
+    _write_csv(csv_path, 3000)
+    assert csv_path.stat().st_size > 4 * missing_scan.BLOCK_SIZE
+
+    arrow = scan_missing_work(csv_path, engine='pyarrow')
+    pandas = scan_missing_work(csv_path, engine='pandas')
+
+    assert arrow.total_rows == pandas.total_rows == 3000
+    assert arrow.missing.tolist() == pandas.missing.tolist()
+    assert arrow.failed.tolist() == pandas.failed.tolist()
+    assert len(arrow.missing) == sum(1 for i in range(3000) if i % 3 and i % 5)
+    assert len(arrow.failed) == sum(1 for i in range(3000) if i % 3 and not i % 5)
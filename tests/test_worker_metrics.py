@@ -0,0 +1,35 @@
+import multiprocessing
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+pytest.importorskip('yt_dlp')
+import batch_update_youtube_stats as updater  # noqa: E402
+from enrichment_metrics import METRICS  # noqa: E402
+
+
+class FakeYoutubeDL:
+    def extract_info(self, url, download=False):
+        return {'channel_id': 'UCfake', 'view_count': 10, 'upload_date': '20240101',
+                'like_count': 2, 'comment_count': 1}
+
+
+@pytest.mark.parametrize('adaptive', [False, True])
+def test_pool_workers_report_only_their_own_requests(monkeypatch, adaptive):
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        pytest.skip('needs fork: workers inherit the patched YoutubeDL and the parent metrics')
+    monkeypatch.setattr(multiprocessing, 'Pool', multiprocessing.get_context('fork').Pool)
+    monkeypatch.setattr(updater, '_get_ydl', FakeYoutubeDL)
+    METRICS.pop_state()
+    for _ in range(5):  # recorded by the parent before the pool forks
+        METRICS.observe_request('yt-dlp', 0.1, 'ok')
+
+    video_ids = [f'vid{i:08d}' for i in range(12)]
+    controller = updater.make_controller(2) if adaptive else None
+    results = list(updater.iter_video_stats(video_ids, workers=2, worker_sleep=0.0, controller=controller))
+
+    assert sorted(r[0] for r in results) == video_ids
+    assert METRICS.value('requests_total', source='yt-dlp', outcome='ok') == 5 + len(video_ids)
+    METRICS.pop_state()
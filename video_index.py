@@ -0,0 +1,259 @@
+"""
+Sidecar videoID index for an All_data CSV.
+Built once per CSV version (one quote-aware byte scan plus a videoID-only
+read) and saved next to it as `<name>.csv.vidx.npz`:
+
+    offsets   byte offset of every data row (plus end of file), so a row can
+              be read with one seek, or replaced without parsing the rest
+    ids       sorted unique videoIDs, with `starts`/`rows` mapping each one
+              to the rows that hold it (CSR layout, binary-searched)
+
+get_rows() reads just the rows of some videoIDs; patch_rows() rewrites just
+their cells and copies every other byte unchanged, then shifts the offsets
+instead of rescanning. Row numbers from rows_for() also index the columnar
+copies (parquet_store, arrow_cache), e.g. table.take(index.rows_for(ids)).
+The index records the CSV's size and mtime and is rebuilt by open() when the
+CSV was rewritten by anything else.
+
+Usage:
+    python video_index.py All_data/all_in_one.csv               # build/refresh
+    python video_index.py All_data/all_in_one.csv --get ID [ID ...]
+"""
+
+import argparse
+import csv
+import io
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+import table_schema
+
+SCAN_BLOCK = 16 << 20  # bytes per block while locating row boundaries
+COPY_BLOCK = 8 << 20  # bytes per read while copying unchanged ranges
+
+
+def index_path_for(csv_path: Path) -> Path:
+    csv_path = Path(csv_path)
+    return csv_path.with_name(csv_path.name + '.vidx.npz')
+
+
+def _row_offsets(csv_path: Path) -> np.ndarray:
+    """
+    Byte offsets of record starts: [header end, row 1 start, ..., end of file].
+    A newline ends a record only outside quotes; doubled quotes inside a
+    quoted field flip the parity twice, so counting quotes is enough.
+    """
+    ends = []
+    inside = 0  # quote parity carried across blocks
+    base = 0
+    with open(csv_path, 'rb') as fh:
+        while True:
+            block = fh.read(SCAN_BLOCK)
+            if not block:
+                break
+            buf = np.frombuffer(block, dtype=np.uint8)
+            parity = (np.cumsum(buf == ord('"'), dtype=np.int64) + inside) & 1
+            ends.append(np.flatnonzero((buf == ord('\n')) & (parity == 0)) + base + 1)
+            inside = int(parity[-1])
+            base += len(block)
+    offsets = np.concatenate(ends) if ends else np.array([], dtype=np.int64)
+    if not len(offsets) or offsets[-1] != base:
+        offsets = np.append(offsets, base)  # last record without a trailing newline
+    return offsets.astype(np.int64)
+
+
+def _encode_ids(video_ids) -> np.ndarray:
+    """videoIDs as fixed-width UTF-8 byte strings (numpy's 'S' cast only takes ASCII)."""
+    return np.array([v.encode('utf-8', 'surrogatepass') for v in video_ids], dtype='S')
+
+
+class VideoIndex:
+    """videoID -> rows and row -> byte range for one CSV."""
+
+    def __init__(self, csv_path: Path, columns: List[str], offsets: np.ndarray,
+                 ids: np.ndarray, starts: np.ndarray, rows: np.ndarray):
+        self.csv_path = Path(csv_path)
+        self.columns = columns
+        self.offsets = offsets  # len = rows + 1
+        self.ids = ids
+        self.starts = starts  # len = len(ids) + 1
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    # Building and persistence
+
+    @classmethod
+    def build(cls, csv_path: Path) -> 'VideoIndex':
+        csv_path = Path(csv_path)
+        offsets = _row_offsets(csv_path)
+        columns = list(pd.read_csv(csv_path, nrows=0).columns)
+        video_ids = pd.read_csv(csv_path, usecols=['videoID'], dtype=str, keep_default_na=False,
+                                skip_blank_lines=False)['videoID']
+        if len(video_ids) != len(offsets) - 1:
+            raise ValueError(f"{csv_path.name}: {len(video_ids):,} parsed rows but "
+                             f"{len(offsets) - 1:,} record boundaries; cannot index")
+        stripped = video_ids.str.strip().to_numpy(dtype=object)
+        try:
+            keys = stripped.astype('S')  # videoIDs are ASCII: 1 byte per char
+        except UnicodeEncodeError:
+            odd = sum(not v.isascii() for v in stripped)
+            print(f"  {csv_path.name}: {odd:,} non-ASCII videoIDs (malformed rows) indexed by their UTF-8 bytes")
+            keys = _encode_ids(stripped)
+        order = np.argsort(keys, kind='stable')
+        ids, first = np.unique(keys[order], return_index=True)
+        starts = np.append(first, len(order)).astype(np.int64)
+        return cls(csv_path, columns, offsets, ids, starts, order.astype(np.int64))
+
+    def save(self):
+        stat = self.csv_path.stat()
+        path = index_path_for(self.csv_path)
+        tmp = path.with_name(path.name + '.tmp.npz')
+        np.savez(tmp, offsets=self.offsets, ids=self.ids, starts=self.starts, rows=self.rows,
+                 columns=np.array(self.columns), csv_size=stat.st_size, csv_mtime_ns=stat.st_mtime_ns)
+        os.replace(tmp, path)
+
+    @classmethod
+    def open(cls, csv_path: Path) -> 'VideoIndex':
+        """Load the saved index, or build and save it if missing or stale."""
+        csv_path = Path(csv_path)
+        path = index_path_for(csv_path)
+        if path.exists():
+            stat = csv_path.stat()
+            with np.load(path) as data:
+                if int(data['csv_size']) == stat.st_size and int(data['csv_mtime_ns']) == stat.st_mtime_ns:
+                    return cls(csv_path, data['columns'].tolist(), data['offsets'], data['ids'],
+                               data['starts'], data['rows'])
+        start = time.time()
+        print(f"  Building videoID index for {csv_path.name}...")
+        index = cls.build(csv_path)
+        index.save()
+        print(f"  ✓ {len(index.ids):,} videoIDs over {len(index):,} rows ({time.time() - start:.1f}s)")
+        return index
+
+    # Lookups
+
+    def rows_for(self, video_ids: Iterable[str]) -> np.ndarray:
+        """Sorted row numbers (0-based, header excluded) holding any of `video_ids`."""
+        keys = _encode_ids([str(v).strip() for v in video_ids])
+        if not len(keys) or not len(self.ids):
+            return np.array([], dtype=np.int64)
+        pos = np.searchsorted(self.ids, keys)
+        pos = pos[(pos < len(self.ids)) & (self.ids[np.minimum(pos, len(self.ids) - 1)] == keys)]
+        if not len(pos):
+            return np.array([], dtype=np.int64)
+        return np.sort(np.concatenate([self.rows[self.starts[p]:self.starts[p + 1]] for p in pos]))
+
+    def _read_records(self, rows: np.ndarray) -> List[bytes]:
+        records = []
+        with open(self.csv_path, 'rb') as fh:
+            for row in rows:
+                fh.seek(self.offsets[row])
+                records.append(fh.read(self.offsets[row + 1] - self.offsets[row]))
+        return records
+
+    def get_rows(self, video_ids: Iterable[str]) -> pd.DataFrame:
+        """The CSV rows of `video_ids` (table_schema dtypes), indexed by row number."""
+        rows = self.rows_for(video_ids)
+        with open(self.csv_path, 'rb') as fh:
+            header = fh.read(self.offsets[0])
+        body = b''.join(record if record.endswith(b'\n') else record + b'\n'
+                        for record in self._read_records(rows))
+        df = pd.read_csv(io.BytesIO(header + body), dtype=table_schema.pandas_dtypes(self.columns))
+        df.index = rows
+        return df
+
+    # Point updates
+
+    def patch_rows(self, updates: Dict[str, Dict[str, object]]) -> int:
+        """
+        Set cells of every row of the given videoIDs, rewriting only those
+        records; all other bytes are copied unchanged. The index is updated
+        and saved, so it stays valid for the next call.
+
+        Args:
+            updates: videoID -> {column: value}; None/NaN writes an empty cell
+
+        Returns:
+            Number of rows rewritten
+        """
+        positions = {c: i for i, c in enumerate(self.columns)}
+        unknown = {c for values in updates.values() for c in values} - positions.keys()
+        if unknown:
+            raise KeyError(f"{self.csv_path.name} has no column(s) {sorted(unknown)}")
+
+        patched = {}  # row -> new record bytes
+        for video_id, values in updates.items():
+            rows = self.rows_for([video_id])
+            for row, record in zip(rows, self._read_records(rows)):
+                patched[int(row)] = _patch_record(record, {positions[c]: v for c, v in values.items()})
+        if not patched:
+            return 0
+
+        rows = sorted(patched)
+        tmp = self.csv_path.with_name(self.csv_path.name + '.patching')
+        deltas = np.zeros(len(self), dtype=np.int64)
+        with open(self.csv_path, 'rb') as src, open(tmp, 'wb') as dst:
+            pos = 0
+            for row in rows:
+                _copy_range(src, dst, pos, self.offsets[row])
+                dst.write(patched[row])
+                deltas[row] = len(patched[row]) - (self.offsets[row + 1] - self.offsets[row])
+                pos = self.offsets[row + 1]
+            _copy_range(src, dst, pos, self.offsets[-1])
+        os.replace(tmp, self.csv_path)
+
+        self.offsets = self.offsets + np.concatenate([[0], np.cumsum(deltas)])
+        self.save()
+        return len(rows)
+
+
+def _copy_range(src, dst, start: int, end: int):
+    src.seek(start)
+    remaining = int(end - start)
+    while remaining > 0:
+        block = src.read(min(COPY_BLOCK, remaining))
+        dst.write(block)
+        remaining -= len(block)
+
+
+def _cell(value) -> str:
+    return '' if value is None or pd.isna(value) else str(value)
+
+
+def _patch_record(record: bytes, values: Dict[int, object]) -> bytes:
+    """Re-serialize one CSV record with some fields replaced, keeping its quoting style and line ending."""
+    text = record.decode('utf-8')
+    body = text.rstrip('\r\n')
+    ending = text[len(body):]
+    fields = next(csv.reader(io.StringIO(body, newline='')))
+    for pos, value in values.items():
+        fields[pos] = _cell(value)
+    out = io.StringIO()
+    quoting = csv.QUOTE_ALL if body.startswith('"') else csv.QUOTE_MINIMAL  # merged CSVs are QUOTE_ALL
+    csv.writer(out, quoting=quoting, lineterminator=ending).writerow(fields)
+    return out.getvalue().encode('utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build a videoID index for a CSV or look rows up with it')
+    parser.add_argument('csv', type=Path, help='CSV file (e.g. All_data/all_in_one.csv)')
+    parser.add_argument('--get', nargs='+', metavar='VIDEO_ID', help='Print the rows of these videoIDs')
+    args = parser.parse_args()
+
+    index = VideoIndex.open(args.csv)
+    if args.get:
+        with pd.option_context('display.max_columns', None, 'display.width', 200):
+            print(index.get_rows(args.get))
+    else:
+        print(f"  ✓ {index_path_for(args.csv).name}: {len(index.ids):,} videoIDs, {len(index):,} rows")
+
+
+if __name__ == '__main__':
+    main()